@@ -4,15 +4,36 @@ DataCamp Exercise Generator
 An intelligent system for automatically generating DataCamp exercises from video content.
 """
 
-from .core import LearningDesigner, load_video_content
-from .generators import get_exercise_generator
-from .models import ExerciseType
+from importlib import import_module
 
 __version__ = "0.1.0"
 
+# Public names and the submodules they live in; each submodule is only imported when one of its
+# names is first used (e.g. the CLI can print --help without loading openai)
+_LAZY_IMPORTS = {
+    "LearningDesigner": ".core",
+    "load_video_content": ".core",
+    "get_exercise_generator": ".generators",
+    "ExerciseType": ".models"
+}
+
 __all__ = [
     "LearningDesigner",
     "get_exercise_generator", 
     "load_video_content",
     "ExerciseType"
 ]
+
+
+def __getattr__(name: str):
+    """Import public names on first access, so importing the package stays cheap."""
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -0,0 +1,7 @@
+"""
+Entry point for ``python -m datacamp_exercise_generator``.
+"""
+
+from .main import main
+
+main()
@@ -4,15 +4,65 @@ DataCamp Exercise Generator - Core Package
 This package contains core functionality including the learning designer.
 """
 
-from .designer import LearningDesigner
-from .utils import load_video_content, load_video_content_raw, load_video_content_extracted
-from .content_extractor import VideoContentExtractor, extract_video_content
+from importlib import import_module
+
+# Public name -> defining submodule; the designer and pipeline pull in openai, so load on first use
+_LAZY_IMPORTS = {
+    "LearningDesigner": ".designer",
+    "load_video_content": ".utils",
+    "load_video_content_raw": ".utils",
+    "load_video_content_extracted": ".utils",
+    "load_video_sections": ".utils",
+    "VideoContentExtractor": ".content_extractor",
+    "extract_video_content": ".content_extractor",
+    "extract_video_sections": ".content_extractor",
+    "SectionTable": ".section_table",
+    "Deadline": ".deadline",
+    "DeadlineExceeded": ".deadline",
+    "VideoPipeline": ".pipeline",
+    "VideoResult": ".pipeline",
+    "ExerciseBank": ".exercise_bank",
+    "ExerciseIndex": ".exercise_index",
+    "Cassette": ".cassette",
+    "enable_tracing": ".tracing",
+    "span": ".tracing",
+    "enable_profiling": ".profiling",
+    "ExerciseTypeSpec": ".exercise_types"
+}
 
 __all__ = [
     "LearningDesigner",
     "load_video_content",
     "load_video_content_raw", 
     "load_video_content_extracted",
+    "load_video_sections",
     "VideoContentExtractor",
-    "extract_video_content"
+    "extract_video_content",
+    "extract_video_sections",
+    "SectionTable",
+    "Deadline",
+    "DeadlineExceeded",
+    "VideoPipeline",
+    "VideoResult",
+    "ExerciseBank",
+    "ExerciseIndex",
+    "Cassette",
+    "enable_tracing",
+    "span",
+    "enable_profiling",
+    "ExerciseTypeSpec"
 ]
+
+
+def __getattr__(name: str):
+    """Import public names on first access, so importing the package stays cheap."""
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -0,0 +1,42 @@
+"""
+Helpers for running the async-native API from synchronous code.
+"""
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+# Set while a coroutine runs on behalf of a synchronous caller; the router then sends requests
+# through the blocking client in worker threads instead of the async client
+_SYNC_CALLER: contextvars.ContextVar[bool] = contextvars.ContextVar("sync_caller", default=False)
+
+
+def in_sync_call() -> bool:
+    """Whether the current coroutine was started by run_sync."""
+    return _SYNC_CALLER.get()
+
+
+def _run(coroutine: Coroutine[Any, Any, T]) -> T:
+    token = _SYNC_CALLER.set(True)
+    try:
+        return asyncio.run(coroutine)
+    finally:
+        _SYNC_CALLER.reset(token)
+
+
+def run_sync(coroutine: Coroutine[Any, Any, T]) -> T:
+    """Run ``coroutine`` to completion and return its result, blocking the calling thread.
+
+    Each call gets its own short-lived event loop. If the calling thread is already running
+    an event loop (a sync method called from async code), the coroutine runs on a helper
+    thread instead, which still blocks the caller but doesn't fail.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return _run(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(_run, coroutine).result()
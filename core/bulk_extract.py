@@ -0,0 +1,130 @@
+"""
+Bulk content extraction for large transcript archives, spread over a process pool.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+from pydantic import BaseModel, Field
+from .content_extractor import VideoContentExtractor
+
+
+class ExtractionStats(BaseModel):
+    """Totals and throughput for a bulk extraction run."""
+    files: int = 0
+    failed: int = 0
+    input_bytes: int = 0
+    output_bytes: int = 0
+    seconds: float = 0.0
+    errors: dict[str, str] = Field(default_factory=dict, description="Error message per failed input path")
+    
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.seconds if self.seconds else 0.0
+    
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.input_bytes / 1_000_000 / self.seconds if self.seconds else 0.0
+    
+    def summary(self) -> str:
+        reduction = (1 - self.output_bytes / self.input_bytes) * 100 if self.input_bytes else 0.0
+        return (
+            f"Extracted {self.files - self.failed}/{self.files} files in {self.seconds:.2f}s "
+            f"({self.files_per_second:.1f} files/s, {self.megabytes_per_second:.2f} MB/s); "
+            f"{self.input_bytes} -> {self.output_bytes} bytes ({reduction:.1f}% smaller)"
+        )
+
+
+# One extractor per worker process, so its compiled patterns are built once and reused
+_worker_extractor: Optional[VideoContentExtractor] = None
+
+
+def _init_worker() -> None:
+    global _worker_extractor
+    _worker_extractor = VideoContentExtractor()
+
+
+def _extract_file(task: tuple[str, str]) -> tuple[str, int, int, Optional[str]]:
+    """Extract one file and write the result straight to disk.
+
+    Returns (input path, input bytes, output bytes, error) so only small stats travel back
+    to the parent process, never the transcript text itself.
+    """
+    in_path, out_path = task
+    extractor = _worker_extractor or VideoContentExtractor()
+    try:
+        with open(in_path, 'r', encoding='utf-8') as file:
+            raw_content = file.read()
+        extracted = extractor.extract_meaningful_content(raw_content)
+        os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+        with open(out_path, 'w', encoding='utf-8') as file:
+            file.write(extracted)
+        return in_path, len(raw_content.encode('utf-8')), len(extracted.encode('utf-8')), None
+    except (OSError, UnicodeDecodeError) as e:
+        return in_path, 0, 0, str(e)
+
+
+def extract_directory(in_dir: str, out_dir: str, jobs: Optional[int] = None, pattern: str = "**/*.md",
+                      chunksize: Optional[int] = None) -> ExtractionStats:
+    """Extract every transcript under ``in_dir`` into the same relative path under ``out_dir``.
+
+    Files are spread over ``jobs`` worker processes (default: CPU count) in chunks, so the
+    regex-heavy extraction uses every core instead of one. No LLM calls are made.
+
+    Args:
+        in_dir: Directory of raw video transcript files
+        out_dir: Directory for the extracted content (created if needed)
+        jobs: Worker processes; 1 runs everything in this process
+        pattern: Glob (relative to in_dir) selecting the files to extract
+        chunksize: Files handed to a worker at a time (default: spread into ~8 chunks per worker)
+
+    Returns:
+        Totals, failures and throughput for the run
+
+    Raises:
+        FileNotFoundError: If ``in_dir`` doesn't exist
+        ValueError: If ``jobs`` or ``chunksize`` is less than 1
+    """
+    if jobs is not None and jobs < 1:
+        raise ValueError(f"jobs must be at least 1, got {jobs}")
+    if chunksize is not None and chunksize < 1:
+        raise ValueError(f"chunksize must be at least 1, got {chunksize}")
+    in_root, out_root = Path(in_dir), Path(out_dir)
+    if not in_root.is_dir():
+        raise FileNotFoundError(f"Input directory '{in_dir}' not found")
+    
+    tasks = [
+        (str(path), str(out_root / path.relative_to(in_root)))
+        for path in sorted(in_root.glob(pattern)) if path.is_file()
+    ]
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(tasks) // (jobs * 8))
+    
+    stats = ExtractionStats()
+    started = time.perf_counter()
+    
+    if jobs == 1:
+        _init_worker()
+        results = map(_extract_file, tasks)
+        stats = _collect(results, stats)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor:
+            stats = _collect(executor.map(_extract_file, tasks, chunksize=chunksize), stats)
+    
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def _collect(results, stats: ExtractionStats) -> ExtractionStats:
+    for in_path, input_bytes, output_bytes, error in results:
+        stats.files += 1
+        stats.input_bytes += input_bytes
+        stats.output_bytes += output_bytes
+        if error is not None:
+            stats.failed += 1
+            stats.errors[in_path] = error
+    return stats
@@ -0,0 +1,211 @@
+"""
+Record/replay cassettes of LLM requests and responses, for reproducing and benchmarking runs offline.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import IO, Any, Optional
+from openai import APITimeoutError, RateLimitError
+from openai.types.chat import ChatCompletion
+
+
+CASSETTE_VERSION = 1
+
+# Request fields that differ between otherwise identical requests and don't change the response
+_UNKEYED_FIELDS = ("timeout",)
+
+# Endpoint of the placeholder request attached to errors rebuilt during replay
+_REPLAY_URL = "https://api.openai.com/v1/chat/completions"
+
+
+class CassetteError(Exception):
+    """A replayed run made a request the cassette has no (more) responses for, or replayed a recorded error."""
+    pass
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class Cassette:
+    """Every chat completion request of a run, with its response (or error) and timing.
+
+    The file is JSON Lines, optionally gzipped (a ``.gz`` path). Message texts are stored once
+    each and referenced by hash, so the video content that every prompt repeats is kept once
+    rather than per request. Recording appends and flushes each interaction as it completes,
+    so a run that crashes still leaves a cassette of everything up to the failure.
+
+    Replay matches requests by model, messages and parameters, not by order, so concurrent
+    generation calls can finish in any order. Identical requests get their recorded responses
+    in the order they were recorded. Timeouts and rate limits are replayed as the same errors,
+    so model fallbacks happen exactly as they did.
+
+    Example:
+        router = ModelRouter(cassette=Cassette.record("run.cassette.jsonl.gz"))
+        ...
+        router = ModelRouter(cassette=Cassette.replay("run.cassette.jsonl.gz", latency=0))
+    """
+    
+    def __init__(self, path: str, mode: str = "record", latency: float = 1.0):
+        """
+        Args:
+            path: Cassette file (gzipped if it ends in ".gz")
+            mode: "record" (overwrites ``path``) or "replay"
+            latency: In replay, fraction of each recorded response time to wait before returning
+                     it: 1 reproduces the original timing, 0 returns immediately
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode '{mode}'; expected 'record' or 'replay'")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.interactions = 0
+        self.model_seconds = 0.0
+        self._lock = threading.Lock()
+        self._blobs: set[str] = set()
+        self._file: Optional[IO[str]] = None
+        self._responses: dict[str, deque] = {}
+        self._start = time.perf_counter()
+        
+        if mode == "record":
+            self._file = _open(path, "w")
+            self._write({"cassette": CASSETTE_VERSION, "recorded_at": datetime.now(timezone.utc).isoformat()})
+        else:
+            self._load()
+    
+    @classmethod
+    def record(cls, path: str) -> "Cassette":
+        return cls(path, "record")
+    
+    @classmethod
+    def replay(cls, path: str, latency: float = 1.0) -> "Cassette":
+        return cls(path, "replay", latency)
+    
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+    
+    def _write(self, record: dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+    
+    def _load(self) -> None:
+        with _open(self.path, "r") as file:
+            header = json.loads(file.readline())
+            if header.get("cassette") != CASSETTE_VERSION:
+                raise ValueError(f"'{self.path}' is not a version {CASSETTE_VERSION} cassette")
+            for line in file:
+                record = json.loads(line)
+                # Message texts are only needed to read a cassette, not to replay it
+                if "blob" not in record:
+                    self._responses.setdefault(record["key"], deque()).append(record)
+    
+    def _request_key(self, request: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+        """Key identifying ``request`` and its compact form, with message texts replaced by their hashes."""
+        compact = {name: value for name, value in request.items() if name not in _UNKEYED_FIELDS}
+        compact["messages"] = [
+            {**message, "content": _text_hash(message["content"])} for message in request["messages"]
+        ]
+        key = hashlib.sha1(json.dumps(compact, sort_keys=True).encode("utf-8")).hexdigest()
+        return key, compact
+    
+    def record_interaction(self, stage: str, request: dict[str, Any], started: float, elapsed: float,
+                           response: Any = None, error: Optional[BaseException] = None) -> None:
+        """Append one request with its response or error.
+
+        Args:
+            stage: Routing stage that made the request
+            request: Keyword arguments sent to ``chat.completions.create``
+            started: perf_counter() when the request was sent
+            elapsed: Seconds until the response (or error) arrived
+            response: The ChatCompletion, if the request succeeded
+            error: The exception, if it failed
+        """
+        key, compact = self._request_key(request)
+        record: dict[str, Any] = {
+            "key": key, "stage": stage, "request": compact,
+            "started": round(started - self._start, 3), "elapsed": round(elapsed, 3)
+        }
+        if error is not None:
+            record["error"] = {"type": type(error).__name__, "message": str(error)}
+        else:
+            record["response"] = response.model_dump(mode="json", exclude_none=True)
+        with self._lock:
+            for message in request["messages"]:
+                digest = _text_hash(message["content"])
+                if digest not in self._blobs:
+                    self._blobs.add(digest)
+                    self._write({"blob": digest, "text": message["content"]})
+            self._write(record)
+            self._file.flush()
+            self.interactions += 1
+            self.model_seconds += elapsed
+    
+    async def play(self, request: dict[str, Any]) -> ChatCompletion:
+        """The recorded response to ``request``, after the (scaled) recorded latency.
+
+        Raises:
+            APITimeoutError, RateLimitError: If that is what the request got when recorded
+            CassetteError: If the request wasn't recorded (or its recordings are used up),
+                           or it failed with any other error when recorded
+        """
+        key, compact = self._request_key(request)
+        with self._lock:
+            recordings = self._responses.get(key)
+            record = recordings.popleft() if recordings else None
+            if record is not None:
+                self.interactions += 1
+                self.model_seconds += record["elapsed"]
+        if record is None:
+            raise CassetteError(
+                f"No recorded response for a {compact.get('model')} request in '{self.path}'; "
+                "the prompt or parameters differ from the recorded run"
+            )
+        if self.latency > 0:
+            await asyncio.sleep(record["elapsed"] * self.latency)
+        
+        if "response" in record:
+            return ChatCompletion.model_validate(record["response"])
+        error = record["error"]
+        if error["type"] in (APITimeoutError.__name__, RateLimitError.__name__):
+            import httpx
+            request = httpx.Request("POST", _REPLAY_URL)
+            if error["type"] == APITimeoutError.__name__:
+                raise APITimeoutError(request=request)
+            raise RateLimitError(error["message"], response=httpx.Response(429, request=request), body=None)
+        raise CassetteError(f"Recorded {error['type']}: {error['message']}")
+    
+    def unused(self) -> int:
+        """Recorded responses a replay hasn't served."""
+        with self._lock:
+            return sum(len(recordings) for recordings in self._responses.values())
+    
+    def summary(self) -> str:
+        if self.replaying:
+            unused = self.unused()
+            suffix = f"; {unused} recorded response(s) not requested" if unused else ""
+            return f"Replayed {self.interactions} response(s) from {self.path} ({self.model_seconds:.1f}s of recorded model time){suffix}"
+        return f"Recorded {self.interactions} request(s) to {self.path} ({self.model_seconds:.1f}s of model time)"
+    
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+    
+    def __enter__(self) -> "Cassette":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
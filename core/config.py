@@ -12,12 +12,47 @@ class Config:
     # OpenAI Settings
     OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
     DEFAULT_MODEL: str = "gpt-4o"
+    # Model fallback chains per stage ("planning" or an exercise type); unrouted stages use the default model
+    MODEL_ROUTES: dict[str, list[str]] = {}
     DEFAULT_TEMPERATURE: float = 0.0
     PLANNING_TEMPERATURE: float = 0.3
     
     # Exercise Generation Settings
     MIN_EXERCISES: int = 2
     MAX_EXERCISES: int = 4
+    # Estimated prompt size limit; video content is pruned before sending rather than failing on context length
+    MAX_PROMPT_TOKENS: Optional[int] = 100_000
+    # Approximate token budget for few-shot examples in each generation prompt; None includes all of them
+    EXAMPLE_TOKEN_BUDGET: Optional[int] = 350
+    
+    # Completions sampled per generation request; the best valid one is kept (1 disables sampling)
+    CANDIDATES: int = 1
+    CANDIDATE_TEMPERATURE: float = 0.7  # Minimum temperature when sampling several candidates
+    
+    # Near-duplicate detection against previously generated exercises (None disables the bank)
+    EXERCISE_BANK_PATH: Optional[str] = None
+    DUPLICATE_THRESHOLD: float = 0.8  # Estimated shingle similarity that counts as a near-duplicate
+    DUPLICATE_REGENERATIONS: int = 1  # Targeted regeneration rounds before near-duplicates are dropped
+    
+    # SQLite full-text index every run adds its exercises to (None disables it)
+    EXERCISE_INDEX_PATH: Optional[str] = None
+    
+    # Latency Settings
+    EXECUTION_STRATEGY: str = "auto"  # "grouped", "per_exercise" or "auto"
+    MAX_CONCURRENCY: int = 4  # Generation calls in flight at once
+    CALL_OVERHEAD_RATIO: float = 0.5  # Fixed per-call latency relative to generating one exercise
+    
+    # Multi-video pipeline: worker threads per stage and items allowed to wait between stages
+    PIPELINE_WORKERS: dict[str, int] = {"extract": 1, "plan": 2, "generate": 2, "write": 1}
+    PIPELINE_QUEUE_SIZE: int = 2
+    # Batch runs process identical videos once and keep repeated slides out of planning prompts
+    BATCH_DEDUP: bool = True
+    RUN_TIMEOUT: Optional[float] = None  # Seconds for a whole run; None means unbounded
+    
+    # Cache of exercise type plugins found through entry points; None rescans on every start
+    PLUGIN_INDEX_PATH: Optional[str] = os.path.join(
+        os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "datacamp_exercise_generator", "plugins.json"
+    )
     
     @classmethod
     def validate(cls) -> None:
@@ -77,26 +77,34 @@ class VideoContentExtractor:
         Returns:
             Cleaned content appropriate for exercise generation
         """
-        if not self.has_video_structure(video_content):
-            # Plain text file - return with minimal cleaning
-            return self._clean_plain_text(video_content)
-        
-        # Structured video file - apply full extraction
-        sections = self._split_into_sections(video_content)
-        meaningful_content = []
-        
-        for section in sections:
-            extracted = self._extract_section_content(section)
-            if extracted.strip():  # Only add non-empty content
-                meaningful_content.append(extracted)
-        
-        result = "\n\n".join(meaningful_content)
+        return "\n\n".join(self.extract_sections(video_content))
+    
+    def extract_sections(self, video_content: str) -> list[str]:
+        """
+        Extract meaningful content as a list of sections: one per slide for structured video
+        files, one per paragraph for plain text. Joining them with blank lines gives
+        extract_meaningful_content.
         
-        # Fallback: if structured extraction found nothing, treat as plain text
-        if not result.strip():
-            return self._clean_plain_text(video_content)
+        Args:
+            video_content: Raw file content (structured video transcript or plain text)
+            
+        Returns:
+            Cleaned content sections, in file order
+        """
+        if self.has_video_structure(video_content):
+            # Structured video file - apply full extraction
+            meaningful_content = []
+            for section in self._split_into_sections(video_content):
+                extracted = self._extract_section_content(section)
+                if extracted.strip():  # Only add non-empty content
+                    meaningful_content.append(extracted)
+            
+            if meaningful_content:
+                return meaningful_content
+            # Fallback: if structured extraction found nothing, treat as plain text
         
-        return result
+        # Plain text file - minimal cleaning, split on blank lines
+        return self._clean_plain_text(video_content).split("\n\n")
     
     def _split_into_sections(self, content: str) -> list[str]:
         """Split video content into individual slide sections."""
@@ -185,7 +193,22 @@ class VideoContentExtractor:
         }
 
 
+# Shared extractor for the convenience function, so patterns are compiled once per process
+_default_extractor = None
+
+
+def _get_default_extractor() -> VideoContentExtractor:
+    global _default_extractor
+    if _default_extractor is None:
+        _default_extractor = VideoContentExtractor()
+    return _default_extractor
+
+
 def extract_video_content(video_content: str) -> str:
     """Convenience function to extract meaningful content from video transcript."""
-    extractor = VideoContentExtractor()
-    return extractor.extract_meaningful_content(video_content)
+    return _get_default_extractor().extract_meaningful_content(video_content)
+
+
+def extract_video_sections(video_content: str) -> list[str]:
+    """Convenience function to extract meaningful content from video transcript as sections."""
+    return _get_default_extractor().extract_sections(video_content)
@@ -0,0 +1,80 @@
+"""
+Deadline tracking for bounding the latency of a generation run.
+"""
+
+import time
+from typing import Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a stage cannot start or finish before the run deadline."""
+
+
+class Deadline:
+    """A fixed point in time by which a run (or part of a run) must finish.
+
+    A deadline created with ``timeout=None`` never expires, so callers can always
+    pass a deadline around without special-casing the unbounded case.
+    """
+    
+    def __init__(self, timeout: Optional[float] = None, expires_at: Optional[float] = None):
+        if timeout is not None and expires_at is not None:
+            raise ValueError("Pass either timeout or expires_at, not both")
+        if timeout is not None:
+            if timeout <= 0:
+                raise ValueError(f"Deadline timeout must be positive, got {timeout}")
+            expires_at = time.monotonic() + timeout
+        self.expires_at = expires_at
+    
+    @classmethod
+    def from_timeout(cls, timeout: Optional[float]) -> "Deadline":
+        """Create a deadline ``timeout`` seconds from now (unbounded if None)."""
+        return cls(timeout=timeout)
+    
+    @property
+    def is_bounded(self) -> bool:
+        return self.expires_at is not None
+    
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline, or None when unbounded."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+    
+    def check(self, stage: str) -> None:
+        """Raise DeadlineExceeded if the deadline has passed before ``stage`` starts."""
+        if self.expired():
+            raise DeadlineExceeded(f"Run deadline exceeded before {stage}")
+    
+    def share(self, parts: int) -> "Deadline":
+        """Return a sub-deadline that gets a fair ``1/parts`` share of the remaining time.
+
+        Used to split the budget across work items that run one after another, so an
+        early slow item cannot starve every later one.
+        """
+        if self.expires_at is None or parts <= 1:
+            return self
+        return Deadline(expires_at=time.monotonic() + self.remaining() / parts)
+    
+    def request_timeout(self, default: Optional[float] = None) -> Optional[float]:
+        """Timeout to pass to a single API call: whatever is left, capped by ``default``."""
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        if default is None:
+            return remaining
+        return min(remaining, default)
+    
+    def allows(self, seconds: float) -> bool:
+        """Whether ``seconds`` more can be spent (e.g. sleeping) and still leave time to work."""
+        remaining = self.remaining()
+        return remaining is None or remaining > seconds
+    
+    def __repr__(self) -> str:
+        remaining = self.remaining()
+        if remaining is None:
+            return "Deadline(unbounded)"
+        return f"Deadline(remaining={remaining:.1f}s)"
@@ -0,0 +1,117 @@
+"""
+Cross-video deduplication for batch runs: identical transcripts and repeated slides.
+"""
+
+import hashlib
+import re
+import threading
+from typing import Optional
+from pydantic import BaseModel, Field
+from .profiling import profiled
+from .tokens import TokenEstimator, get_token_estimator
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def content_hash(text: str) -> str:
+    """Hash of ``text`` that ignores case and whitespace differences."""
+    normalized = _WHITESPACE.sub(" ", text).strip().lower()
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+class DedupReport(BaseModel):
+    """What deduplication saved in a batch run."""
+    duplicate_videos: dict[str, str] = Field(default_factory=dict, description="Duplicate video file -> video it reuses")
+    stripped_sections: int = Field(default=0, description="Repeated sections left out of planning prompts")
+    calls_saved: int = Field(default=0, description="Planning and generation calls not made for duplicate videos")
+    tokens_saved: int = Field(default=0, description="Estimated prompt tokens not sent")
+    
+    def summary(self) -> str:
+        lines = [
+            f"Deduplication: {len(self.duplicate_videos)} duplicate video(s), {self.stripped_sections} repeated section(s) "
+            f"stripped from planning; saved {self.calls_saved} call(s) and ~{self.tokens_saved} prompt tokens"
+        ]
+        for video_file, original in self.duplicate_videos.items():
+            lines.append(f"  {video_file} reuses {original}")
+        return "\n".join(lines)
+
+
+class BatchDeduplicator:
+    """Finds repeated content across the videos of a batch as the pipeline extracts them.
+
+    The pipeline's extract stage hands each video's sections to add(), which hashes them and
+    keeps only the digests, so the batch is never held in memory. A video whose extracted
+    content is identical (after normalizing whitespace and case) to one added earlier is
+    processed once and that video's result is reused. A section that an earlier video already
+    contained (a repeated slide, or intro/outro boilerplate) is left out of the planning
+    prompt, since that video plans it. Generation still sees each video's full content.
+
+    Safe to use from several extract workers; "earlier" then means extracted first.
+    """
+    
+    def __init__(self, video_files: list[str], estimator: Optional[TokenEstimator] = None):
+        """
+        Args:
+            video_files: Paths to the batch's video transcripts, in input order
+            estimator: Token estimator for the planning model, used for the report (gpt-4o's by default)
+        """
+        self.video_files = video_files
+        self.estimator = estimator or get_token_estimator()
+        # Duplicate video -> the video it reuses, by position in video_files
+        self.canonical: dict[int, int] = {}
+        self._videos: dict[str, int] = {}
+        self._sections: set[str] = set()
+        # What was left out, for the report: per duplicate its content tokens,
+        # per video with stripped sections their count and tokens
+        self._duplicate_tokens: dict[int, int] = {}
+        self._stripped: dict[int, tuple[int, int]] = {}
+        self._lock = threading.Lock()
+    
+    def add(self, index: int, sections: list[str]) -> Optional[str]:
+        """Record the extracted sections of video ``index``.
+
+        Returns:
+            The content for its planning prompt (repeated sections removed), or None if the video
+            duplicates an earlier one (see canonical)
+        """
+        with profiled("extract"):
+            digest = content_hash("\n\n".join(sections))
+            hashes = [content_hash(section) for section in sections]
+        with self._lock:
+            original = self._videos.setdefault(digest, index)
+            if original != index:
+                self.canonical[index] = original
+            else:
+                stripped = [position for position, section in enumerate(hashes) if section in self._sections]
+                self._sections.update(hashes)
+        
+        if original != index:
+            self._duplicate_tokens[index] = self.estimator.count("\n\n".join(sections))
+            return None
+        # Never strip a video down to nothing; it still needs a plan
+        if not stripped or len(stripped) == len(sections):
+            return "\n\n".join(sections)
+        self._stripped[index] = (len(stripped), sum(self.estimator.count(sections[position]) for position in stripped))
+        removed = set(stripped)
+        return "\n\n".join(section for position, section in enumerate(sections) if position not in removed)
+    
+    def is_duplicate(self, index: int) -> bool:
+        return index in self.canonical
+    
+    def report(self, calls_per_video: dict[int, int]) -> DedupReport:
+        """Summarize the savings.
+
+        Args:
+            calls_per_video: API calls each processed video needed, used to credit its duplicates
+        """
+        report = DedupReport()
+        for index, original in sorted(self.canonical.items()):
+            report.duplicate_videos[self.video_files[index]] = self.video_files[original]
+            calls = calls_per_video.get(original, 0)
+            report.calls_saved += calls
+            report.tokens_saved += calls * self._duplicate_tokens[index]
+        for sections, tokens in self._stripped.values():
+            report.stripped_sections += sections
+            report.tokens_saved += tokens
+        return report
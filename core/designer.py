@@ -2,36 +2,126 @@
 Learning designer for intelligent exercise planning.
 """
 
-import os
-import json
-from openai import OpenAI
-from ..models.planning import LearningPlan
-from ..generators.factory import get_exercise_generator
+import asyncio
+import math
+from collections import Counter
+from openai import APITimeoutError
+from ..models.planning import ExecutionResult, ExercisePlan, GeneratedExercise, LearningPlan
+from ..generators.factory import get_exercise_generator, get_formatter_class
+from .aio import run_sync
+from .deadline import Deadline, DeadlineExceeded
+from .dedup import content_hash
+from .exercise_bank import ExerciseBank
+from .exercise_types import exercise_type_keys, planning_type_guide
+from .json_response import response_adapter, validate_json_response
+from .routing import ModelRouter, PLANNING_STAGE, resolve_temperature
+from .tokens import PromptTokenReport, fit_content_to_budget, get_token_estimator
+from .profiling import profiled
+from .tracing import current_span, span, traced
+from .config import Config
+
+
+# How execute_learning_plan turns planned exercises into generation calls
+EXECUTION_STRATEGIES = ("auto", "grouped", "per_exercise")
+
+PLANNING_ROLE = """You are an expert learning designer and curriculum architect for DataCamp.
+
+Determine which exercise types are most appropriate for each learning objective and the optimal order and difficulty progression.
+
+AVAILABLE EXERCISE TYPES:"""
+
+PLANNING_PRINCIPLES = """LEARNING DESIGN PRINCIPLES:
+- Start with foundational concepts (single MCQ for definitions/basic understanding)
+- Progress to application and synthesis (multiple MCQ for identifying multiple approaches/benefits)
+- Use drag-drop classification for categorization and grouping concepts
+- Use drag-drop ordering for sequential processes, workflows, and procedures
+- Each exercise should target one specific, measurable learning objective
+- Vary exercise types to maintain engagement
+- Consider cognitive load and difficulty progression
+- Create 2-3 exercises total"""
+
+
+def get_planning_instructions() -> str:
+    """Planning role, the registered exercise types and design principles (the static prompt prefix)."""
+    return f"{PLANNING_ROLE}\n\n{planning_type_guide()}\n\n{PLANNING_PRINCIPLES}"
+
+
+PLANNING_SCHEMA = """Respond with ONLY valid JSON in this exact format:
+{
+  "video_title": "Descriptive title for the video content",
+  "video_summary": "Brief summary of what the video covers",
+  "exercise_plans": [
+    {
+      "exercise_type": "single_mcq",
+      "learning_objective": "Specific learning objective this exercise targets",
+      "rationale": "Why this exercise type is appropriate for this objective",
+      "difficulty_level": "Beginner"
+    },
+    {
+      "exercise_type": "drag_drop_order",
+      "learning_objective": "Sequential process learning objective",
+      "rationale": "Why drag-drop ordering is appropriate for this objective",
+      "difficulty_level": "Intermediate"
+    }
+  ]
+}"""
 
 
 class LearningDesigner:
-    """Analyzes video content and creates learning plans like a curriculum designer would."""
+    """Analyzes video content and creates learning plans like a curriculum designer would.
     
-    def __init__(self, model="gpt-4o", temperature=0.3):
-        """Initialize with slightly higher temperature for more creative planning."""
-        self.client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
-        self.model = model
-        
-        # GPT-5 models only support temperature=1
-        if model.startswith("gpt-5"):
-            self.temperature = 1.0
-            if temperature != 0.3:  # Only warn if user explicitly set a different temperature
-                print(f"Warning: {model} only supports temperature=1. Adjusting from {temperature} to 1.0")
-        else:
-            self.temperature = temperature
+    Planning and execution are async-native (``acreate_learning_plan``, ``aexecute_learning_plan``,
+    ``aexecute_plan``), so one event loop can serve many videos at once; the synchronous methods
+    are blocking wrappers around them.
+    """
+    
+    def __init__(self, model="gpt-4o", temperature=0.3, router: ModelRouter = None, max_prompt_tokens: int = Config.MAX_PROMPT_TOKENS,
+                 candidates: int = Config.CANDIDATES, execution_strategy: str = Config.EXECUTION_STRATEGY,
+                 max_concurrency: int = Config.MAX_CONCURRENCY, exercise_bank: ExerciseBank = None):
+        """Initialize with slightly higher temperature for more creative planning.
+        
+        Args:
+            model: Default model for planning and generation when no router is given
+            temperature: Planning temperature (adjusted per model by the router where required)
+            router: Optional ModelRouter choosing models per stage and exercise type
+            max_prompt_tokens: Estimated prompt size limit; video content is pruned to stay under it
+            candidates: Completions sampled per generation request, keeping the best valid one
+            execution_strategy: "grouped", "per_exercise" or "auto" (see choose_execution_strategy)
+            max_concurrency: Maximum generation calls in flight at once
+            exercise_bank: Optional bank of earlier exercises; near-duplicates of them are regenerated
+        """
+        if execution_strategy not in EXECUTION_STRATEGIES:
+            raise ValueError(f"Unknown execution strategy: {execution_strategy}. Valid strategies: {list(EXECUTION_STRATEGIES)}")
+        
+        self.router = router or ModelRouter(default_model=model)
+        self.model = self.router.primary_model(PLANNING_STAGE)
+        
+        # Warn about unsupported temperatures up front; the router adapts each call per model
+        resolve_temperature(self.model, temperature, default=0.3)
+        self.temperature = temperature
+        self.max_prompt_tokens = max_prompt_tokens
+        self.candidates = candidates
+        self.execution_strategy = execution_strategy
+        self.max_concurrency = max_concurrency
+        self.exercise_bank = exercise_bank
+        
+        # Planned exercises that could not be generated before the deadline on the last run
+        self.missing_plans: list[ExercisePlan] = []
+    
+    def create_learning_plan(self, video_content: str, provided_objectives: list[str] = None, exercise_types: list[str] = None, deadline: Deadline = None) -> LearningPlan:
+        """Blocking version of acreate_learning_plan."""
+        return run_sync(self.acreate_learning_plan(video_content, provided_objectives, exercise_types, deadline))
     
-    def create_learning_plan(self, video_content: str, provided_objectives: list[str] = None, exercise_types: list[str] = None) -> LearningPlan:
+    @traced("create_learning_plan")
+    async def acreate_learning_plan(self, video_content: str, provided_objectives: list[str] = None, exercise_types: list[str] = None, deadline: Deadline = None) -> LearningPlan:
         """Analyze video content and create a comprehensive learning plan."""
+        deadline = deadline or Deadline()
+        deadline.check("planning")
         
         # Handle user-specified exercise types
         if exercise_types:
             # Validate provided exercise types
-            valid_types = ["single_mcq", "multiple_mcq", "drag_drop_classify", "drag_drop_order"]
+            valid_types = exercise_type_keys()
             invalid_types = [t for t in exercise_types if t not in valid_types]
             if invalid_types:
                 raise ValueError(f"Invalid exercise types: {invalid_types}. Valid types: {valid_types}")
@@ -44,31 +134,6 @@ Distribute exercises across these types based on which is most appropriate for e
         else:
             exercise_types_instruction = ""
         
-        # Available exercise types and their characteristics
-        exercise_type_guide = """
-AVAILABLE EXERCISE TYPES:
-
-1. **single_mcq** (Single-Answer Multiple Choice):
-   - Best for: Testing specific factual knowledge, definitions, concepts
-   - Use when: There's one clear correct answer
-   - Example: "What is the primary benefit of X?" 
-
-2. **multiple_mcq** (Multiple-Answer Multiple Choice):
-   - Best for: Testing understanding of multiple related concepts, identifying several correct approaches
-   - Use when: Multiple correct answers exist or learners need to identify all applicable items
-   - Example: "Which of the following statements about Y are correct?"
-
-3. **drag_drop_classify** (Drag-and-Drop Classification):
-   - Best for: Testing ability to categorize, classify, or sort concepts into groups
-   - Use when: Learners need to demonstrate understanding of how items relate to categories
-   - Example: "Classify these algorithms as supervised or unsupervised learning"
-
-4. **drag_drop_order** (Drag-and-Drop Ordering):
-   - Best for: Testing understanding of sequential processes, workflows, or procedures
-   - Use when: Learners need to demonstrate knowledge of step-by-step processes
-   - Example: "Order the steps in the machine learning pipeline from data collection to deployment"
-"""
-
         # Handle provided objectives vs. auto-generated objectives
         if provided_objectives:
             objectives_count = len(provided_objectives)
@@ -93,96 +158,213 @@ IMPORTANT: You have {objectives_count} learning objectives, but create only 2-3
         else:
             objectives_section = ""
             task_instruction = "Analyze the video content and create 2-3 exercises covering the key concepts."
-
-        planning_prompt = f"""You are an expert learning designer and curriculum architect for DataCamp. {task_instruction}
-
-Determine which exercise types are most appropriate for each learning objective and the optimal order and difficulty progression.
-
-{exercise_type_guide}
-{exercise_types_instruction}
-
-LEARNING DESIGN PRINCIPLES:
-- Start with foundational concepts (single MCQ for definitions/basic understanding)
-- Progress to application and synthesis (multiple MCQ for identifying multiple approaches/benefits)
-- Use drag-drop classification for categorization and grouping concepts
-- Use drag-drop ordering for sequential processes, workflows, and procedures
-- Each exercise should target one specific, measurable learning objective
-- Vary exercise types to maintain engagement
-- Consider cognitive load and difficulty progression
-- Create 2-3 exercises total
-{objectives_section}
-
-Video Content:
-{video_content}
-
-Respond with ONLY valid JSON in this exact format:
-{{
-  "video_title": "Descriptive title for the video content",
-  "video_summary": "Brief summary of what the video covers",
-  "exercise_plans": [
-    {{
-      "exercise_type": "single_mcq",
-      "learning_objective": "Specific learning objective this exercise targets",
-      "rationale": "Why this exercise type is appropriate for this objective",
-      "difficulty_level": "Beginner"
-    }},
-    {{
-      "exercise_type": "drag_drop_order",
-      "learning_objective": "Sequential process learning objective",
-      "rationale": "Why drag-drop ordering is appropriate for this objective",
-      "difficulty_level": "Intermediate"
-    }}
-  ]
-}}"""
-
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": planning_prompt}],
-            temperature=self.temperature
-        )
         
-        # Clean and parse response
-        content = response.choices[0].message.content.strip()
-        if content.startswith("```json"):
-            content = content[7:]
-        if content.endswith("```"):
-            content = content[:-3]
-        content = content.strip()
+        objectives_text = "\n".join(part for part in (exercise_types_instruction, objectives_section, task_instruction) if part).strip()
+        
+        # Static instructions and schema first, then the video, then the per-call constraints,
+        # so calls for different videos share a cacheable prompt prefix
+        def build_sections(content: str) -> list[tuple[str, str]]:
+            return [
+                ("instructions", get_planning_instructions()),
+                ("schema", PLANNING_SCHEMA),
+                ("video_content", f"Video Content:\n{content}"),
+                ("objectives", objectives_text + "\n\nRespond with ONLY valid JSON in the format described above."),
+            ]
+        
+        estimator = get_token_estimator(self.model)
+        sections, counts, pruned = fit_content_to_budget(build_sections, video_content, self.max_prompt_tokens, estimator)
+        if pruned:
+            print(f"Warning: video content pruned to fit the {self.max_prompt_tokens}-token prompt budget for planning")
+        self.router.record_prompt_report(PromptTokenReport(stage=PLANNING_STAGE, method=estimator.method, sections=counts, pruned=pruned))
+        
+        messages = [
+            {"role": "system", "content": "\n\n".join(text for name, text in sections[:2])},
+            {"role": "user", "content": "\n\n".join(text for name, text in sections[2:])},
+        ]
+        
+        try:
+            response = await self.router.acreate_completion(
+                PLANNING_STAGE,
+                messages=messages,
+                temperature=self.temperature,
+                deadline=deadline
+            )
+        except APITimeoutError as e:
+            if deadline.is_bounded:
+                raise DeadlineExceeded("Run deadline exceeded while creating the learning plan") from e
+            raise
+        
+        if not response.choices:
+            raise ValueError("completion returned no choices")
+        message = response.choices[0].message
+        if message.content is None:
+            raise ValueError(f"The model returned no learning plan: {message.refusal or 'empty or cut-off response'}")
         
-        parsed = json.loads(content)
-        return LearningPlan(**parsed)
+        # Decode and validate the plan in one call, ignoring code fences and prose around it
+        with profiled("validate"):
+            learning_plan = validate_json_response(message.content, response_adapter(LearningPlan))
+        current_span().set(video_title=learning_plan.video_title, exercises=len(learning_plan.exercise_plans))
+        return learning_plan
     
-    def execute_learning_plan(self, video_content: str, learning_plan: LearningPlan, use_plan_objectives: bool = True) -> list[str]:
+    def choose_execution_strategy(self, learning_plan: LearningPlan) -> str:
+        """Pick "grouped" or "per_exercise" to minimise estimated wall-clock time.
+        
+        Output tokens dominate generation latency, so a call producing k exercises takes roughly
+        k units plus a fixed per-call overhead. With ``max_concurrency`` calls in flight, the run
+        takes as many waves as the calls need; the cheaper of the two layouts wins, preferring the
+        grouped layout (fewer calls and prompt tokens) on ties.
+        """
+        group_sizes = list(Counter(plan.exercise_type for plan in learning_plan.exercise_plans).values())
+        if not group_sizes or max(group_sizes) == 1:
+            return "grouped"  # Both layouts make the same calls
+        
+        overhead = Config.CALL_OVERHEAD_RATIO
+        concurrency = max(1, self.max_concurrency)
+        
+        # Largest groups first; each wave lasts as long as its largest call
+        ordered = sorted(group_sizes, reverse=True)
+        grouped_time = sum(wave[0] + overhead for wave in (ordered[i:i + concurrency] for i in range(0, len(ordered), concurrency)))
+        per_exercise_time = math.ceil(sum(group_sizes) / concurrency) * (1 + overhead)
+        
+        return "per_exercise" if per_exercise_time < grouped_time else "grouped"
+    
+    def plan_generation_calls(self, learning_plan: LearningPlan, use_plan_objectives: bool = True, strategy: str = None) -> list[list[ExercisePlan]]:
+        """Split a learning plan into generation calls, each a list of plans of one exercise type."""
+        strategy = strategy or self.execution_strategy
+        if strategy not in EXECUTION_STRATEGIES:
+            raise ValueError(f"Unknown execution strategy: {strategy}. Valid strategies: {list(EXECUTION_STRATEGIES)}")
+        
+        if not use_plan_objectives:
+            # One objective-free call per planned exercise (let generators decide content)
+            return [[plan] for plan in learning_plan.exercise_plans]
+        
+        if strategy == "auto":
+            strategy = self.choose_execution_strategy(learning_plan)
+        
+        if strategy == "per_exercise":
+            return [[plan] for plan in learning_plan.exercise_plans]
+        
+        # Group plans by exercise type for efficient generation (1:1 with objectives)
+        plans_by_type = {}
+        for plan in learning_plan.exercise_plans:
+            if plan.exercise_type not in plans_by_type:
+                plans_by_type[plan.exercise_type] = []
+            plans_by_type[plan.exercise_type].append(plan)
+        return list(plans_by_type.values())
+    
+    def execute_learning_plan(self, video_content: str, learning_plan: LearningPlan, use_plan_objectives: bool = True, deadline: Deadline = None, strategy: str = None) -> list[str]:
+        """Blocking version of aexecute_learning_plan."""
+        return run_sync(self.aexecute_learning_plan(video_content, learning_plan, use_plan_objectives, deadline, strategy))
+    
+    async def aexecute_learning_plan(self, video_content: str, learning_plan: LearningPlan, use_plan_objectives: bool = True, deadline: Deadline = None, strategy: str = None) -> list[str]:
         """Execute a learning plan by generating the planned exercises.
         
+        Planned exercises that missed the deadline are recorded in ``self.missing_plans``.
+        See aexecute_plan for the arguments; use it directly when one designer serves several
+        videos concurrently.
+        """
+        result = await self.aexecute_plan(video_content, learning_plan, use_plan_objectives, deadline, strategy)
+        self.missing_plans = result.missing_plans
+        return result.exercises
+    
+    def execute_plan(self, video_content: str, learning_plan: LearningPlan, use_plan_objectives: bool = True, deadline: Deadline = None, strategy: str = None) -> ExecutionResult:
+        """Blocking version of aexecute_plan."""
+        return run_sync(self.aexecute_plan(video_content, learning_plan, use_plan_objectives, deadline, strategy))
+    
+    async def aexecute_plan(self, video_content: str, learning_plan: LearningPlan, use_plan_objectives: bool = True, deadline: Deadline = None, strategy: str = None) -> ExecutionResult:
+        """Generate the planned exercises, reporting any that missed the deadline.
+        
         Args:
             video_content: The video transcript content
             learning_plan: The generated learning plan
             use_plan_objectives: If True, uses objectives from the plan. If False, lets generators create exercises freely.
+            deadline: Optional run deadline. Once it runs out the exercises generated so far are returned and
+                      the rest are reported in ``missing_plans`` instead of being raised as an error.
+            strategy: "grouped" (one call per exercise type), "per_exercise" (one call per planned exercise)
+                      or "auto"; defaults to the designer's execution_strategy.
+        
+        Generation calls run concurrently, up to ``max_concurrency`` at a time. Exercises are returned in
+        plan order regardless of which call finishes first, both formatted (``exercises``) and as typed
+        objects carrying their plan metadata (``items``).
         """
-        all_exercises = []
-        
-        if use_plan_objectives:
-            # Group plans by exercise type for efficient generation (1:1 with objectives)
-            plans_by_type = {}
-            for plan in learning_plan.exercise_plans:
-                if plan.exercise_type not in plans_by_type:
-                    plans_by_type[plan.exercise_type] = []
-                plans_by_type[plan.exercise_type].append(plan.learning_objective)
-            
-            # Generate exercises for each type using specific objectives
-            for exercise_type, objectives in plans_by_type.items():
-                generator = get_exercise_generator(exercise_type.value, model=self.model)
-                exercises = generator.generate_markdown_exercises(video_content, objectives)
-                all_exercises.extend(exercises)
-        else:
-            # Generate exercises by type without specific objectives (let generators decide content)
-            exercise_types = [plan.exercise_type for plan in learning_plan.exercise_plans]
-            for exercise_type in exercise_types:
-                generator = get_exercise_generator(exercise_type.value, model=self.model)
-                # Generate 1 exercise of this type without specific objective
-                exercises = generator.generate_markdown_exercises(video_content, learning_objectives=None)
-                # Take only the first exercise to match the plan count
-                all_exercises.append(exercises[0])
-        
-        return all_exercises
+        deadline = deadline or Deadline()
+        missing_plans: list[ExercisePlan] = []
+        source_hash = content_hash(video_content)
+        calls = self.plan_generation_calls(learning_plan, use_plan_objectives, strategy)
+        concurrency = max(1, min(self.max_concurrency, len(calls)))
+        slots = asyncio.Semaphore(concurrency)
+        
+        # Calls still waiting to start; each call's share of the deadline depends on how many waves remain
+        pending = len(calls)
+        
+        async def run_call(plans: list[ExercisePlan]) -> list[GeneratedExercise]:
+            nonlocal pending
+            async with slots:
+                exercise_type = plans[0].exercise_type
+                waves_left = math.ceil(pending / concurrency)
+                pending -= 1
+                deadline.check(f"{exercise_type.value} generation")
+                call_deadline = deadline.share(waves_left)
+                generator = get_exercise_generator(
+                    exercise_type.value, router=self.router, max_prompt_tokens=self.max_prompt_tokens, candidates=self.candidates,
+                    exercise_bank=self.exercise_bank
+                )
+                with span("generate", exercise_type=exercise_type.value, planned=len(plans)) as active:
+                    if use_plan_objectives:
+                        objectives = [plan.learning_objective for plan in plans]
+                        exercises = await generator.agenerate_exercises(video_content, objectives, deadline=call_deadline)
+                    else:
+                        # Generate 1 exercise of this type without specific objective
+                        exercises = await generator.agenerate_exercises(video_content, learning_objectives=None, deadline=call_deadline)
+                        # Take only the first exercise to match the plan count
+                        exercises = exercises[:1]
+                    active.set(exercises=len(exercises), model=generator.last_model or generator.model)
+            # Exercises line up with the call's plans; any extras keep the type but no plan metadata
+            return [
+                GeneratedExercise(
+                    exercise_type=exercise_type, exercise=exercise,
+                    learning_objective=plans[position].learning_objective if position < len(plans) else None,
+                    difficulty_level=plans[position].difficulty_level if position < len(plans) else None,
+                    video_title=learning_plan.video_title,
+                    source_hash=source_hash,
+                    model=generator.last_model or generator.model
+                )
+                for position, exercise in enumerate(exercises)
+            ]
+        
+        results: list[list[GeneratedExercise]] = [[] for _ in calls]
+        tasks = {asyncio.ensure_future(run_call(plans)): index for index, plans in enumerate(calls)}
+        unfinished = set(tasks)
+        try:
+            while unfinished:
+                done, unfinished = await asyncio.wait(unfinished, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index = tasks[task]
+                    try:
+                        results[index] = task.result()
+                    except DeadlineExceeded as e:
+                        print(f"Warning: {e}")
+                        missing_plans.extend(calls[index])
+        except BaseException:
+            # Don't start queued calls after a hard failure (or when the caller is cancelled)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        
+        if missing_plans:
+            order = {id(plan): i for i, plan in enumerate(learning_plan.exercise_plans)}
+            missing_plans.sort(key=lambda plan: order.get(id(plan), 0))
+            missing = ", ".join(f"{plan.exercise_type.value} ({plan.learning_objective})" for plan in missing_plans)
+            print(f"Warning: deadline reached; {len(missing_plans)} planned exercise(s) were not generated: {missing}")
+        
+        items = [item for call_items in results for item in call_items]
+        exercises = []
+        for item in items:
+            with span("format_to_markdown", exercise_type=item.exercise_type.value), profiled("format"):
+                exercises.append(get_formatter_class(item.exercise_type)().format_to_markdown(item.exercise))
+        return ExecutionResult(
+            exercises=exercises,
+            items=items,
+            missing_plans=missing_plans
+        )
@@ -0,0 +1,135 @@
+"""
+On-disk bank of previously generated exercises for near-duplicate detection (MinHash + LSH).
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+from typing import Optional
+from pydantic import BaseModel, Field
+from ..models.exercises import Exercise
+from .config import Config
+
+
+# MinHash parameters: NUM_PERM hashes split into BANDS bands of NUM_PERM // BANDS rows.
+# Two exercises become LSH candidates once a whole band matches, which for 16 x 4 happens
+# with high probability above ~0.5 similarity; candidates are then checked against the threshold.
+NUM_PERM = 64
+BANDS = 16
+SHINGLE_SIZE = 3
+
+# Each "permutation" XORs the (uniformly distributed) 64-bit shingle hashes with a random mask.
+# That is a bijection, so it estimates Jaccard like a full permutation family while costing a
+# single XOR per shingle instead of a modular multiply, keeping a signature well under a millisecond.
+# The seed is fixed so signatures stay comparable across runs and machines.
+_rng = random.Random(0x5EED)
+_MASKS = [_rng.getrandbits(64) for _ in range(NUM_PERM)]
+_WORD = re.compile(r"\w+")
+
+
+def _hash64(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set[int]:
+    """Hashes of the word ``size``-grams of ``text`` (case-insensitive, punctuation ignored)."""
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return {_hash64(" ".join(words))}
+    return {_hash64(" ".join(words[i:i + size])) for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(text: str) -> list[int]:
+    """MinHash signature whose per-position agreement estimates the Jaccard similarity of shingle sets."""
+    hashes = shingles(text)
+    return [min([h ^ mask for h in hashes]) for mask in _MASKS]
+
+
+class BankMatch(BaseModel):
+    """An existing exercise that a new one nearly duplicates."""
+    title: str = Field(description="Title of the existing exercise")
+    similarity: float = Field(description="Estimated Jaccard similarity of the two exercises' shingles")
+
+
+class ExerciseBank:
+    """Index of previously generated exercises, persisted as JSON.
+
+    Each exercise is stored as its MinHash signature (plus type and title for reporting),
+    bucketed by LSH band. Checking a new exercise hashes it once and only compares it to
+    exercises sharing a band, so lookups stay fast as the bank grows.
+    """
+    
+    def __init__(self, path: Optional[str] = None, threshold: float = Config.DUPLICATE_THRESHOLD):
+        """
+        Args:
+            path: JSON file to load from and save to; None keeps the bank in memory only
+            threshold: Estimated similarity at or above which an exercise counts as a near-duplicate
+        """
+        self.path = path
+        self.threshold = threshold
+        self._entries: list[dict] = []
+        self._buckets: dict[tuple, list[int]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            if data.get("num_perm") != NUM_PERM or data.get("shingle_size") != SHINGLE_SIZE:
+                raise ValueError(f"Exercise bank '{path}' was built with different MinHash parameters")
+            for entry in data["entries"]:
+                self._index(entry)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @staticmethod
+    def _band_keys(signature: list[int]) -> list[tuple]:
+        rows = NUM_PERM // BANDS
+        return [(band, *signature[band * rows:(band + 1) * rows]) for band in range(BANDS)]
+    
+    def _index(self, entry: dict) -> None:
+        position = len(self._entries)
+        self._entries.append(entry)
+        for key in self._band_keys(entry["signature"]):
+            self._buckets.setdefault(key, []).append(position)
+    
+    def find_duplicate(self, exercise: Exercise, exercise_type: str, signature: Optional[list[int]] = None) -> Optional[BankMatch]:
+        """Return the most similar banked exercise of the same type at or above the threshold, if any."""
+        signature = signature or minhash_signature(exercise.fingerprint_text())
+        best: Optional[BankMatch] = None
+        with self._lock:
+            candidates = {position for key in self._band_keys(signature) for position in self._buckets.get(key, ())}
+            for position in candidates:
+                entry = self._entries[position]
+                if entry["type"] != exercise_type:
+                    continue
+                similarity = sum(x == y for x, y in zip(signature, entry["signature"])) / NUM_PERM
+                if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                    best = BankMatch(title=entry["title"], similarity=similarity)
+        return best
+    
+    def add(self, exercise: Exercise, exercise_type: str, signature: Optional[list[int]] = None) -> None:
+        """Add an accepted exercise so later ones are checked against it."""
+        signature = signature or minhash_signature(exercise.fingerprint_text())
+        with self._lock:
+            self._index({"type": exercise_type, "title": exercise.title, "signature": signature})
+            self._dirty = True
+    
+    def save(self) -> None:
+        """Write the bank to ``path`` if it changed, replacing the file atomically."""
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            data = {"num_perm": NUM_PERM, "shingle_size": SHINGLE_SIZE, "entries": self._entries}
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump(data, file)
+            os.replace(temp_path, self.path)
+            self._dirty = False
@@ -0,0 +1,207 @@
+"""
+Full-text search index of generated exercises (SQLite FTS5).
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Iterable, Optional
+from pydantic import BaseModel, Field
+from ..models.planning import GeneratedExercise
+
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS exercises (
+    id INTEGER PRIMARY KEY,
+    fingerprint TEXT NOT NULL UNIQUE,
+    exercise_type TEXT NOT NULL,
+    title TEXT NOT NULL,
+    context TEXT NOT NULL,
+    question TEXT NOT NULL,
+    answers TEXT NOT NULL,
+    objective TEXT NOT NULL,
+    model TEXT,
+    source_video TEXT,
+    source_hash TEXT,
+    added_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS exercises_source_hash ON exercises(source_hash);
+CREATE VIRTUAL TABLE IF NOT EXISTS exercises_fts USING fts5(
+    title, context, question, answers, objective,
+    content='exercises', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS exercises_fts_insert AFTER INSERT ON exercises BEGIN
+    INSERT INTO exercises_fts(rowid, title, context, question, answers, objective)
+    VALUES (new.id, new.title, new.context, new.question, new.answers, new.objective);
+END;
+CREATE TRIGGER IF NOT EXISTS exercises_fts_delete AFTER DELETE ON exercises BEGIN
+    INSERT INTO exercises_fts(exercises_fts, rowid, title, context, question, answers, objective)
+    VALUES ('delete', old.id, old.title, old.context, old.question, old.answers, old.objective);
+END;
+"""
+
+# Column weights for ranking: title and question matches count most
+_BM25_WEIGHTS = (10.0, 2.0, 5.0, 3.0, 4.0)
+
+
+def match_expression(query: str) -> str:
+    """FTS5 query matching exercises that contain every word of ``query``, in any column.
+
+    Words are quoted, so punctuation in free text ("what's a p-value?") can't be read as
+    FTS5 syntax. A trailing ``*`` on a word keeps it as a prefix search.
+    """
+    terms = []
+    for match in re.finditer(r"\w+\*?", query):
+        term = match.group()
+        prefix = term.endswith("*")
+        terms.append(f'"{term.rstrip("*")}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+class IndexHit(BaseModel):
+    """An indexed exercise matching a search."""
+    title: str = Field(description="Title of the exercise")
+    exercise_type: str = Field(description="Type of the exercise")
+    learning_objective: str = Field(description="Objective it was generated for (empty if unknown)")
+    source_video: Optional[str] = Field(default=None, description="Video transcript it was generated from")
+    model: Optional[str] = Field(default=None, description="Model that generated it")
+    snippet: str = Field(description="Best-matching passage, with matches in [brackets]")
+    score: float = Field(description="BM25 relevance; higher is more relevant")
+    id: int = Field(description="Row id, for ExerciseIndex.get")
+
+
+class ExerciseIndex:
+    """Searchable SQLite database of generated exercises.
+
+    Each exercise is stored with its full GeneratedExercise JSON, and its title, context,
+    question, answers and objective are indexed with FTS5 (Porter-stemmed, so "classify"
+    matches "classification"). Adding is idempotent: an exercise already in the index, by
+    type and fingerprint text, is skipped, so re-running a course only adds what is new.
+
+    Example:
+        index = ExerciseIndex("exercises.db")
+        index.add_all(result.items)
+        for hit in index.search("gradient descent"):
+            print(hit.title, hit.source_video)
+    """
+    
+    def __init__(self, path: str = ":memory:"):
+        """
+        Args:
+            path: SQLite database file, created if missing
+        """
+        self.path = path
+        # The pipeline's write stage adds from its own thread; the lock serialises access
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, SCHEMA_VERSION):
+                raise ValueError(f"Exercise index '{path}' has schema version {version}, expected {SCHEMA_VERSION}")
+            self._connection.executescript(_SCHEMA)
+            self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM exercises").fetchone()[0]
+    
+    @staticmethod
+    def _row(item: GeneratedExercise) -> tuple:
+        exercise = item.exercise
+        exercise_type = item.exercise_type.value
+        fingerprint = hashlib.sha1(f"{exercise_type}\n{exercise.fingerprint_text()}".encode("utf-8")).hexdigest()
+        return (
+            fingerprint, exercise_type, exercise.title, exercise.context, exercise.question_text(),
+            "\n".join(exercise.answer_texts()), item.learning_objective or "", item.model,
+            item.source_video, item.source_hash, time.time(), item.model_dump_json()
+        )
+    
+    def add_all(self, items: Iterable[GeneratedExercise]) -> int:
+        """Index ``items`` in one transaction, skipping any already indexed.
+
+        Returns:
+            How many were added
+        """
+        rows = [self._row(item) for item in items]
+        if not rows:
+            return 0
+        with self._lock, self._connection:
+            cursor = self._connection.executemany(
+                "INSERT INTO exercises (fingerprint, exercise_type, title, context, question, answers, objective,"
+                " model, source_video, source_hash, added_at, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(fingerprint) DO NOTHING",
+                rows
+            )
+            return cursor.rowcount
+    
+    def search(self, query: str, exercise_type: Optional[str] = None, limit: int = 20, raw: bool = False) -> list[IndexHit]:
+        """Exercises matching ``query``, most relevant first.
+
+        Args:
+            query: Words that must all appear (see match_expression), or an FTS5 query if ``raw``
+            exercise_type: Only return exercises of this type
+            limit: Maximum hits
+            raw: Pass ``query`` to FTS5 as-is, for phrase ("..."), OR, NOT and column:term syntax
+        """
+        expression = query if raw else match_expression(query)
+        if not expression:
+            return []
+        sql = (
+            "SELECT e.id, e.title, e.exercise_type, e.objective, e.source_video, e.model,"
+            " snippet(exercises_fts, -1, '[', ']', '...', 12) AS snippet,"
+            f" bm25(exercises_fts, {', '.join(map(str, _BM25_WEIGHTS))}) AS rank"
+            " FROM exercises_fts JOIN exercises e ON e.id = exercises_fts.rowid"
+            " WHERE exercises_fts MATCH ?"
+        )
+        params: list = [expression]
+        if exercise_type:
+            sql += " AND e.exercise_type = ?"
+            params.append(exercise_type)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            try:
+                rows = self._connection.execute(sql, params).fetchall()
+            except sqlite3.OperationalError as e:
+                raise ValueError(f"Invalid search query {query!r}: {e}") from e
+        return [
+            IndexHit(
+                id=row["id"], title=row["title"], exercise_type=row["exercise_type"],
+                learning_objective=row["objective"], source_video=row["source_video"], model=row["model"],
+                # bm25() is lower-is-better; flip it so scores read naturally
+                snippet=row["snippet"], score=-row["rank"]
+            )
+            for row in rows
+        ]
+    
+    def get(self, id: int) -> dict[str, Any]:
+        """The indexed exercise with row id ``id``, as the GeneratedExercise JSON object JsonlWriter writes."""
+        with self._lock:
+            row = self._connection.execute("SELECT data FROM exercises WHERE id = ?", (id,)).fetchone()
+        if row is None:
+            raise KeyError(f"No exercise with id {id} in {self.path}")
+        return json.loads(row["data"])
+    
+    def has_source(self, source_hash: str) -> bool:
+        """Whether exercises generated from video content with this hash are indexed."""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT 1 FROM exercises WHERE source_hash = ? LIMIT 1", (source_hash,)
+            ).fetchone() is not None
+    
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+    
+    def __enter__(self) -> "ExerciseIndex":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
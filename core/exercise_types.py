@@ -0,0 +1,195 @@
+"""
+Exercise type registry: the built-in types plus plugins discovered through package entry points.
+"""
+
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from importlib import import_module
+from typing import Any
+from .config import Config
+
+
+# Entry point group plugins register their ExerciseTypeSpec under, e.g. in pyproject.toml:
+#   [project.entry-points."datacamp_exercise_generator.exercise_types"]
+#   fill_blanks = "my_plugin.spec:FILL_BLANKS"
+ENTRY_POINT_GROUP = "datacamp_exercise_generator.exercise_types"
+
+# Root package, for resolving "module:Class" paths that start with "."
+_ROOT_PACKAGE = __package__.rpartition(".")[0]
+
+
+@dataclass(frozen=True)
+class ExerciseTypeSpec:
+    """Everything needed to plan, generate and format one exercise type.
+
+    ``generator`` and ``formatter`` are "module:Class" paths (relative ones resolve against this
+    package) and are only imported the first time the type is used. Plugins should define their
+    spec in a small module that doesn't import the generator, since it is loaded when the plugin
+    index is built.
+    """
+    key: str
+    label: str
+    generator: str
+    formatter: str
+    best_for: str
+    use_when: str
+    example: str
+    
+    def planning_guide(self, number: int) -> str:
+        """This type's entry in the planning prompt's list of available exercise types."""
+        return f"""{number}. **{self.key}** ({self.label}):
+   - Best for: {self.best_for}
+   - Use when: {self.use_when}
+   - Example: "{self.example}\""""
+
+
+BUILTIN_TYPES: tuple[ExerciseTypeSpec, ...] = (
+    ExerciseTypeSpec(
+        key="single_mcq", label="Single-Answer Multiple Choice",
+        generator=".generators.single_mcq:SingleAnswerMCQGenerator", formatter=".formatters.single_mcq:SingleAnswerMCQFormatter",
+        best_for="Testing specific factual knowledge, definitions, concepts",
+        use_when="There's one clear correct answer",
+        example="What is the primary benefit of X?",
+    ),
+    ExerciseTypeSpec(
+        key="multiple_mcq", label="Multiple-Answer Multiple Choice",
+        generator=".generators.multiple_mcq:MultipleAnswerMCQGenerator", formatter=".formatters.multiple_mcq:MultipleAnswerMCQFormatter",
+        best_for="Testing understanding of multiple related concepts, identifying several correct approaches",
+        use_when="Multiple correct answers exist or learners need to identify all applicable items",
+        example="Which of the following statements about Y are correct?",
+    ),
+    ExerciseTypeSpec(
+        key="drag_drop_classify", label="Drag-and-Drop Classification",
+        generator=".generators.drag_drop_classify:DragDropClassifyGenerator", formatter=".formatters.drag_drop_classify:DragDropClassifyFormatter",
+        best_for="Testing ability to categorize, classify, or sort concepts into groups",
+        use_when="Learners need to demonstrate understanding of how items relate to categories",
+        example="Classify these algorithms as supervised or unsupervised learning",
+    ),
+    ExerciseTypeSpec(
+        key="drag_drop_order", label="Drag-and-Drop Ordering",
+        generator=".generators.drag_drop_order:DragDropOrderGenerator", formatter=".formatters.drag_drop_order:DragDropOrderFormatter",
+        best_for="Testing understanding of sequential processes, workflows, or procedures",
+        use_when="Learners need to demonstrate knowledge of step-by-step processes",
+        example="Order the steps in the machine learning pipeline from data collection to deployment",
+    ),
+)
+
+
+def _entry_points() -> list[Any]:
+    from importlib.metadata import entry_points
+    eps = entry_points()
+    if hasattr(eps, "select"):
+        return list(eps.select(group=ENTRY_POINT_GROUP))
+    return list(eps.get(ENTRY_POINT_GROUP, []))  # Python 3.9
+
+
+def _environment_fingerprint() -> list[list]:
+    """Modification times of the site-packages directories on the import path.
+
+    Installing or removing a distribution adds or removes its metadata directory in
+    site-packages, which changes the directory's mtime, so the plugin index is rebuilt exactly
+    when it could have changed. Other path entries (such as the working directory) are left
+    out because they change for unrelated reasons.
+    """
+    fingerprint = []
+    for path in sys.path:
+        if os.path.basename(os.path.normpath(path)) not in ("site-packages", "dist-packages"):
+            continue
+        try:
+            fingerprint.append([path, os.stat(path).st_mtime_ns])
+        except OSError:
+            continue
+    return fingerprint
+
+
+def _scan_plugins() -> list[ExerciseTypeSpec]:
+    """Load every registered entry point (importing the plugins' spec modules)."""
+    specs = []
+    for entry_point in _entry_points():
+        try:
+            spec = entry_point.load()
+        except Exception as e:
+            print(f"Warning: could not load exercise type plugin '{entry_point.name}': {e}")
+            continue
+        if not isinstance(spec, ExerciseTypeSpec):
+            print(f"Warning: exercise type plugin '{entry_point.name}' is not an ExerciseTypeSpec; skipping it")
+            continue
+        specs.append(spec)
+    return specs
+
+
+@lru_cache(maxsize=None)
+def _plugin_specs() -> tuple[ExerciseTypeSpec, ...]:
+    """Plugin specs from the on-disk index, rescanning entry points only if the environment changed."""
+    index_path = Config.PLUGIN_INDEX_PATH
+    fingerprint = _environment_fingerprint()
+    if index_path:
+        try:
+            with open(index_path, 'r', encoding='utf-8') as file:
+                index = json.load(file)
+            if index.get("fingerprint") == fingerprint:
+                return tuple(ExerciseTypeSpec(**spec) for spec in index["plugins"])
+        except (OSError, ValueError, TypeError, KeyError):
+            pass  # Missing or stale index; rebuild it below
+    
+    specs = tuple(_scan_plugins())
+    if index_path:
+        try:
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+            temp_path = f"{index_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump({"fingerprint": fingerprint, "plugins": [asdict(spec) for spec in specs]}, file)
+            os.replace(temp_path, index_path)
+        except OSError:
+            pass  # A read-only cache only costs a rescan next time
+    return specs
+
+
+@lru_cache(maxsize=None)
+def get_exercise_types() -> dict[str, ExerciseTypeSpec]:
+    """All available exercise types by key: built-ins first, then plugins."""
+    types = {spec.key: spec for spec in BUILTIN_TYPES}
+    for spec in _plugin_specs():
+        if spec.key in types:
+            print(f"Warning: exercise type plugin '{spec.key}' clashes with an existing type; ignoring it")
+            continue
+        types[spec.key] = spec
+    return types
+
+
+def exercise_type_keys() -> list[str]:
+    return list(get_exercise_types())
+
+
+def get_exercise_type_spec(exercise_type: str) -> ExerciseTypeSpec:
+    """Spec for one exercise type (accepts ExerciseType members or their string values)."""
+    types = get_exercise_types()
+    key = getattr(exercise_type, "value", exercise_type)
+    if key not in types:
+        raise ValueError(f"Unknown exercise type: {key}. Available types: {list(types)}")
+    return types[key]
+
+
+def refresh_plugin_index() -> None:
+    """Forget cached plugin discovery, e.g. after installing a plugin in a running process."""
+    if Config.PLUGIN_INDEX_PATH and os.path.exists(Config.PLUGIN_INDEX_PATH):
+        os.remove(Config.PLUGIN_INDEX_PATH)
+    _plugin_specs.cache_clear()
+    get_exercise_types.cache_clear()
+    load_class.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def load_class(path: str) -> type:
+    """Import and return the class named by a "module:Class" path."""
+    module_name, _, class_name = path.partition(":")
+    package = _ROOT_PACKAGE if module_name.startswith(".") else None
+    return getattr(import_module(module_name, package), class_name)
+
+
+def planning_type_guide() -> str:
+    """The numbered list of available exercise types used in planning prompts."""
+    return "\n\n".join(spec.planning_guide(number) for number, spec in enumerate(get_exercise_types().values(), 1))
@@ -0,0 +1,197 @@
+"""
+Locating and decoding the JSON object in a model response.
+"""
+
+import json
+import re
+import time
+from functools import lru_cache
+from typing import Any
+from pydantic import TypeAdapter, ValidationError
+
+try:
+    import orjson
+except ImportError:  # Optional: the standard library decoder is used instead
+    orjson = None
+
+_DECODER = json.JSONDecoder()
+
+# A markdown code block opened at the very start of the response
+_OPENING_FENCE = re.compile(r"```(?:json)?\s*")
+
+# Introductions models put before the JSON despite being asked not to
+_PREFIXES = ("Here's the JSON:", "The JSON response is:", "Response:", "JSON:")
+
+
+def strip_response_wrapping(content: str) -> str:
+    """``content`` without a code block wrapping the whole of it or a leading "JSON:"-style introduction."""
+    content = content.strip()
+    fence = _OPENING_FENCE.match(content)
+    if fence:
+        content = content[fence.end():]
+    if content.endswith("```"):
+        content = content[:-3]
+    content = content.strip()
+    for prefix in _PREFIXES:
+        if content.startswith(prefix):
+            content = content[len(prefix):].lstrip()
+            break
+    return content
+
+
+def locate_json_object(content: str) -> tuple[Any, int, int]:
+    """Decode the first complete JSON object in ``content``, ignoring any text around it.
+
+    Decoding starts at the first ``{``, so prose after the object is never read. If that
+    brace doesn't start valid JSON and the error comes before the next ``{`` (a brace in
+    leading prose), decoding moves on to the next one. An error past the next brace means
+    that brace is nested in a broken or truncated object, which is reported rather than
+    returning a fragment of it.
+
+    Returns:
+        The decoded value and the start and end offsets of its text
+
+    Raises:
+        json.JSONDecodeError: If there is no complete JSON object
+    """
+    start = content.find("{")
+    if start == -1:
+        raise json.JSONDecodeError("No JSON object in response", content, 0)
+    while True:
+        try:
+            value, end = _DECODER.raw_decode(content, start)
+            return value, start, end
+        except json.JSONDecodeError as e:
+            next_start = content.find("{", start + 1)
+            if next_start == -1 or e.pos > next_start:
+                raise
+            start = next_start
+
+
+def decode_json_response(content: str) -> Any:
+    """The JSON object in a model response, tolerating code fences and prose around it.
+
+    With ``orjson`` installed, the usual response (the object, perhaps fenced or with prose
+    around it that has no braces) is decoded by orjson in one pass over the span from the
+    first ``{`` to the last ``}``; anything else falls back to locate_json_object.
+
+    Raises:
+        json.JSONDecodeError: If the response contains no complete JSON object
+    """
+    if orjson is not None:
+        start = content.find("{")
+        end = content.rfind("}")
+        if start != -1 and end > start:
+            try:
+                return orjson.loads(content[start:end + 1])
+            except orjson.JSONDecodeError:
+                pass
+    return locate_json_object(strip_response_wrapping(content))[0]
+
+
+@lru_cache(maxsize=None)
+def response_adapter(response_type: Any) -> TypeAdapter:
+    """The TypeAdapter for ``response_type``, built once (building one compiles its validator)."""
+    return TypeAdapter(response_type)
+
+
+def validate_json_response(content: str, adapter: TypeAdapter) -> Any:
+    """Validate the JSON object in a model response with ``adapter``, straight from its text.
+
+    pydantic-core parses the span from the first ``{`` to the last ``}`` (code fences and
+    prose without braces lie outside it) and validates it in one call, building the models
+    without intermediate dicts. Responses that need locate_json_object (braces in the
+    surrounding prose) are decoded first, then validated.
+
+    Raises:
+        pydantic.ValidationError: If the object doesn't match the adapter's type
+        json.JSONDecodeError: If the response contains no complete JSON object
+    """
+    start = content.find("{")
+    end = content.rfind("}")
+    if start != -1 and end > start:
+        try:
+            return adapter.validate_json(content[start:end + 1])
+        except ValidationError as e:
+            if e.errors()[0]["type"] != "json_invalid":
+                raise
+    return adapter.validate_python(locate_json_object(strip_response_wrapping(content))[0])
+
+
+def extract_json_text(content: str) -> str:
+    """The text of the JSON object in a model response, or the cleaned response if it has none."""
+    content = strip_response_wrapping(content)
+    try:
+        _, start, end = locate_json_object(content)
+    except json.JSONDecodeError:
+        # Unbalanced or invalid: keep everything from the first brace so the caller's error shows it
+        start = content.find("{")
+        return content[start:] if start != -1 else content
+    return content[start:end]
+
+
+def _scan_balanced_braces(content: str) -> str:
+    """The brace-counting character loop decode_json_response replaced, kept as the benchmark baseline."""
+    start = content.find('{')
+    if start == -1:
+        return content
+    depth = 0
+    in_string = False
+    escape_next = False
+    for i, char in enumerate(content[start:], start):
+        if escape_next:
+            escape_next = False
+            continue
+        if char == '\\':
+            escape_next = True
+            continue
+        if char == '"':
+            in_string = not in_string
+            continue
+        if not in_string:
+            if char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+                if depth == 0:
+                    return content[start:i + 1]
+    return content[start:]
+
+
+def benchmark(sizes_kb: tuple[int, ...] = (10, 25, 50), repeat: int = 50) -> str:
+    """Time locating and decoding responses of each size with the character loop and with decode_json_response.
+
+    Each response is a fenced JSON object of exercises (with escaped quotes and backslashes in
+    its strings) followed by a sentence of prose, like a chatty model response.
+
+    Returns:
+        One line per size with both timings and the speedup
+    """
+    exercise = {
+        "title": "Choosing a \"robust\" loss",
+        "context": "Outliers pull the C:\\data\\sales.csv fit {badly}; " * 4,
+        "question": "Which loss is least affected by outliers?",
+        "hints": ["Think about how each loss grows with the residual."],
+        "incorrect_answers": {"Squared loss": "It grows quadratically.", "Exponential loss": "It grows even faster."},
+        "correct_answer": "Huber loss",
+        "correct_feedback": "Right: it is linear for large residuals."
+    }
+    lines = [f"JSON decoding ({'orjson' if orjson is not None else 'json'}), {repeat} runs per size:"]
+    for size in sizes_kb:
+        exercises = []
+        while len(json.dumps({"exercises": exercises}, indent=2)) < size * 1000:
+            exercises.append(exercise)
+        text = "```json\n" + json.dumps({"exercises": exercises}, indent=2) + "\n```\nLet me know if you need more!"
+
+        started = time.perf_counter()
+        for _ in range(repeat):
+            json.loads(_scan_balanced_braces(strip_response_wrapping(text)))
+        loop = (time.perf_counter() - started) / repeat
+
+        started = time.perf_counter()
+        for _ in range(repeat):
+            decode_json_response(text)
+        fast = (time.perf_counter() - started) / repeat
+
+        lines.append(f"  {len(text) / 1000:.0f} KB: character loop {loop * 1000:.2f} ms, decode_json_response {fast * 1000:.2f} ms ({loop / fast:.1f}x faster)")
+    return "\n".join(lines)
@@ -0,0 +1,186 @@
+"""
+Staged pipeline for processing many videos with overlapping extraction, planning and generation.
+"""
+
+import queue
+import threading
+import time
+from typing import Callable, Optional
+from pydantic import BaseModel, Field
+from ..models.planning import ExercisePlan, GeneratedExercise, LearningPlan
+from .config import Config
+from .deadline import Deadline, DeadlineExceeded
+from .dedup import BatchDeduplicator
+from .tracing import span
+from .designer import LearningDesigner
+from .utils import load_video_content, load_video_sections
+
+
+class VideoResult(BaseModel):
+    """Outcome of processing one video through the pipeline."""
+    video_file: str = Field(description="Path of the source video transcript")
+    index: int = Field(description="Position of the video in the input list")
+    exercises: list[str] = Field(default_factory=list, description="Formatted exercises, in plan order")
+    items: list[GeneratedExercise] = Field(default_factory=list, description="The same exercises as typed objects with plan metadata")
+    learning_plan: Optional[LearningPlan] = Field(default=None, description="Plan the exercises were generated from")
+    missing_plans: list[ExercisePlan] = Field(default_factory=list, description="Planned exercises not generated before the deadline")
+    error: Optional[str] = Field(default=None, description="Why the video failed, if it did")
+    duplicate_of: Optional[str] = Field(default=None, description="Earlier video with identical content whose exercises were reused")
+    timings: dict[str, float] = Field(default_factory=dict, description="Seconds spent in each stage")
+
+
+# Sentinel telling a stage worker that no more items are coming
+_DONE = object()
+
+
+class VideoPipeline:
+    """Runs extraction, planning, generation and writing as separate stages connected by bounded queues.
+
+    Each stage has its own worker threads, so while video N is generating, video N+1 can be planned
+    and video N+2 extracted. Queues hold at most ``queue_size`` items; a stage that falls behind
+    blocks the stages feeding it instead of letting work pile up in memory.
+
+    A video that fails in any stage is passed through with its error set, so the other videos
+    still complete and every input reaches the write stage exactly once.
+    
+    With a BatchDeduplicator, the extract stage hashes each video as it goes: videos identical to
+    an earlier one skip planning and generation and reuse its result once the run is done, and
+    planning prompts leave out sections repeated from earlier videos.
+    """
+    
+    STAGES = ("extract", "plan", "generate", "write")
+    
+    def __init__(self, designer: LearningDesigner, write: Callable[[VideoResult], None],
+                 objectives: list[str] = None, exercise_types: list[str] = None,
+                 workers: Optional[dict[str, int]] = None, queue_size: int = Config.PIPELINE_QUEUE_SIZE,
+                 deadline: Deadline = None, dedup: Optional[BatchDeduplicator] = None):
+        """
+        Args:
+            designer: Designer used for planning and generation (shared across videos)
+            write: Called once per video with its result, from the write stage
+            objectives: Optional learning objectives applied to every video
+            exercise_types: Optional exercise types applied to every video
+            workers: Worker threads per stage, overriding Config.PIPELINE_WORKERS
+            queue_size: Maximum items waiting between two stages
+            deadline: Optional deadline for the whole batch
+            dedup: Optional deduplicator for the same list of video files
+        """
+        self.designer = designer
+        self.write = write
+        self.objectives = objectives
+        self.exercise_types = exercise_types
+        self.workers = {**Config.PIPELINE_WORKERS, **(workers or {})}
+        for stage in self.STAGES:
+            if self.workers.get(stage, 0) < 1:
+                raise ValueError(f"Pipeline stage '{stage}' needs at least one worker")
+        if queue_size < 1:
+            raise ValueError(f"queue_size must be at least 1, got {queue_size}")
+        self.queue_size = queue_size
+        self.deadline = deadline or Deadline()
+        self.dedup = dedup
+    
+    def _extract(self, result: VideoResult) -> tuple[VideoResult, str, str]:
+        self.deadline.check(f"extracting {result.video_file}")
+        if self.dedup is None:
+            video_content = load_video_content(result.video_file)
+            return result, video_content, video_content
+        sections = load_video_sections(result.video_file)
+        planning_content = self.dedup.add(result.index, sections)
+        if planning_content is None:
+            result.duplicate_of = self.dedup.video_files[self.dedup.canonical[result.index]]
+            return result
+        return result, "\n\n".join(sections), planning_content
+    
+    def _plan(self, item: tuple[VideoResult, str, str]) -> tuple[VideoResult, str, str]:
+        result, video_content, planning_content = item
+        result.learning_plan = self.designer.create_learning_plan(
+            planning_content, self.objectives, self.exercise_types, deadline=self.deadline
+        )
+        return item
+    
+    def _generate(self, item: tuple[VideoResult, str, str]) -> VideoResult:
+        result, video_content, _ = item
+        execution = self.designer.execute_plan(video_content, result.learning_plan, deadline=self.deadline)
+        result.exercises = execution.exercises
+        result.items = [item.model_copy(update={"source_video": result.video_file}) for item in execution.items]
+        result.missing_plans = execution.missing_plans
+        return result
+    
+    def _run_stage(self, name: str, work: Callable, inbox: queue.Queue, outbox: Optional[queue.Queue], finished: list[int], lock: threading.Lock) -> None:
+        """Worker loop: take items from ``inbox``, process them and pass them on to ``outbox``."""
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                break
+            
+            result = item if isinstance(item, VideoResult) else item[0]
+            # Failed videos skip the remaining work but are still written, so they get reported
+            if result.error is None or outbox is None:
+                started = time.perf_counter()
+                try:
+                    with span(name, video=result.video_file):
+                        item = work(item)
+                except Exception as e:
+                    if isinstance(e, DeadlineExceeded):
+                        print(f"Warning: {e}")
+                    result.error = f"{name} failed: {e}"
+                    item = result
+                result.timings[name] = round(time.perf_counter() - started, 3)
+            
+            # Duplicates found while extracting are filled in and written once the pipeline is done
+            if outbox is not None and result.duplicate_of is None:
+                outbox.put(item)
+        
+        # The last worker of this stage to finish tells every downstream worker to stop
+        with lock:
+            finished[0] += 1
+            last = finished[0] == self.workers[name]
+        if last and outbox is not None:
+            for _ in range(self.workers[self.STAGES[self.STAGES.index(name) + 1]]):
+                outbox.put(_DONE)
+    
+    def run(self, video_files: list[str]) -> list[VideoResult]:
+        """Process all videos and return their results in input order."""
+        results = [VideoResult(video_file=video_file, index=index) for index, video_file in enumerate(video_files)]
+        
+        queues = {stage: queue.Queue(maxsize=self.queue_size) for stage in self.STAGES}
+        
+        def write(result):
+            self.write(result if isinstance(result, VideoResult) else result[0])
+            return result
+        
+        work = {"extract": self._extract, "plan": self._plan, "generate": self._generate, "write": write}
+        threads = []
+        for position, stage in enumerate(self.STAGES):
+            outbox = queues[self.STAGES[position + 1]] if position + 1 < len(self.STAGES) else None
+            finished, lock = [0], threading.Lock()
+            for worker in range(self.workers[stage]):
+                thread = threading.Thread(
+                    target=self._run_stage, args=(stage, work[stage], queues[stage], outbox, finished, lock),
+                    name=f"pipeline-{stage}-{worker}", daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+        
+        # Feeding blocks once the extract queue is full, which is the backpressure on the whole pipeline
+        for result in results:
+            queues["extract"].put(result)
+        for _ in range(self.workers["extract"]):
+            queues["extract"].put(_DONE)
+        
+        for thread in threads:
+            thread.join()
+        
+        for result in results:
+            if result.duplicate_of is None:
+                continue
+            original = results[self.dedup.canonical[result.index]]
+            result.exercises = list(original.exercises)
+            result.items = [item.model_copy(update={"source_video": result.video_file}) for item in original.items]
+            result.learning_plan = original.learning_plan
+            result.missing_plans = list(original.missing_plans)
+            result.error = original.error
+            result.duplicate_of = original.video_file
+            self.write(result)
+        
+        return results
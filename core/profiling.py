@@ -0,0 +1,203 @@
+"""
+Opt-in cProfile hooks around the CPU-bound stages, aggregated across threads and runs.
+"""
+
+import cProfile
+import glob
+import io
+import itertools
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Iterator, Optional
+
+# CPU-bound work between network waits: transcript regex extraction, JSON cleanup and decoding,
+# pydantic validation, and markdown formatting
+STAGES = ("extract", "decode", "validate", "format")
+
+# Reports list this many functions, ordered by time spent in the function itself
+REPORT_LIMIT = 40
+
+# Tells apart runs saved by the same process within one second
+_run_numbers = itertools.count(1)
+
+# From Python 3.12 cProfile uses the process-wide sys.monitoring profiler slot: enabling a
+# second profile (in any thread) raises ValueError, and an enabled one sees every thread
+_SHARED_SLOT = sys.version_info >= (3, 12)
+_slot_lock = threading.Lock()
+
+
+class StageProfiler:
+    """Profiles each CPU-bound stage separately, whichever thread it runs in.
+
+    Each thread keeps one profile per stage, switched on just for the stage's blocks; the
+    profiles of every thread are merged when reporting. Stage blocks never await, so a profile
+    can't pick up another asyncio task's work. A stage inside another one (in the same thread)
+    counts towards the outer one.
+    
+    Up to Python 3.11 a profile only sees the thread that enabled it, and blocks in different
+    threads are profiled at the same time. From 3.12 only one profile can be enabled per
+    process, so blocks take turns (a thread entering a stage waits for another thread's block
+    to end), and a profile also records what other threads run meanwhile. The CPU and wall
+    times in summary() are per thread either way. If another profiling tool is active, blocks
+    are timed but not profiled.
+
+    Times measured here include cProfile's own overhead, which is large for code making many
+    small calls (a per-character loop): read them as relative, not absolute, costs.
+    """
+    
+    def __init__(self, stages: tuple[str, ...] = STAGES):
+        self.stages = stages
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._profiles: dict[str, list[cProfile.Profile]] = {stage: [] for stage in stages}
+        # Per stage: blocks, thread CPU seconds, wall seconds
+        self._totals: dict[str, list[float]] = {stage: [0, 0.0, 0.0] for stage in stages}
+    
+    def _profile(self, stage: str) -> cProfile.Profile:
+        profiles = getattr(self._local, "profiles", None)
+        if profiles is None:
+            profiles = self._local.profiles = {}
+        profile = profiles.get(stage)
+        if profile is None:
+            profile = profiles[stage] = cProfile.Profile()
+            with self._lock:
+                self._profiles[stage].append(profile)
+        return profile
+    
+    @contextmanager
+    def profile(self, stage: str) -> Iterator[None]:
+        if stage not in self._profiles or getattr(self._local, "active", False):
+            yield
+            return
+        profile = self._profile(stage)
+        self._local.active = True
+        try:
+            with _slot_lock if _SHARED_SLOT else nullcontext():
+                cpu = time.thread_time()
+                wall = time.perf_counter()
+                try:
+                    profile.enable()
+                except ValueError:
+                    # Another profiling tool holds the slot
+                    profile = None
+                try:
+                    yield
+                finally:
+                    if profile is not None:
+                        profile.disable()
+                    cpu = time.thread_time() - cpu
+                    wall = time.perf_counter() - wall
+                    with self._lock:
+                        totals = self._totals[stage]
+                        totals[0] += 1
+                        totals[1] += cpu
+                        totals[2] += wall
+        finally:
+            self._local.active = False
+    
+    def stats(self, stage: str) -> Optional[pstats.Stats]:
+        """The stage's profiles from every thread, merged; None if it never ran."""
+        with self._lock:
+            profiles = list(self._profiles.get(stage, ()))
+        stats = None
+        for profile in profiles:
+            if stats is None:
+                stats = pstats.Stats(profile, stream=io.StringIO())
+            else:
+                stats.add(profile)
+        return stats
+    
+    def dump(self, directory: str) -> list[str]:
+        """Save each stage's stats as ``<stage>.<run>.prof`` in ``directory`` (pstats format, for snakeviz and the like)."""
+        os.makedirs(directory, exist_ok=True)
+        run = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_run_numbers)}"
+        paths = []
+        for stage in self.stages:
+            stats = self.stats(stage)
+            if stats is not None:
+                path = os.path.join(directory, f"{stage}.{run}.prof")
+                stats.dump_stats(path)
+                paths.append(path)
+        return paths
+    
+    def summary(self) -> str:
+        """Blocks, CPU and wall time per stage, with CPU time as a share of the run so far.
+
+        Stages running in parallel threads still share one GIL: a total CPU share close to
+        100% means CPU-side work, not the network, is what limits throughput.
+        """
+        elapsed = time.perf_counter() - self.started
+        lines = [f"CPU-bound stages ({elapsed:.2f}s run, profiler overhead included):"]
+        with self._lock:
+            totals = {stage: list(values) for stage, values in self._totals.items()}
+        total_cpu = 0.0
+        for stage, (blocks, cpu, wall) in totals.items():
+            if not blocks:
+                continue
+            total_cpu += cpu
+            share = cpu / elapsed * 100 if elapsed else 0.0
+            lines.append(f"  {stage}: {int(blocks)} x, {cpu:.3f}s CPU, {wall:.3f}s wall ({share:.1f}% of the run)")
+        share = total_cpu / elapsed * 100 if elapsed else 0.0
+        lines.append(f"  total: {total_cpu:.3f}s CPU ({share:.1f}% of the run)")
+        return "\n".join(lines)
+
+
+def write_reports(directory: str, limit: int = REPORT_LIMIT) -> list[str]:
+    """Merge every run's ``<stage>.*.prof`` in ``directory`` into a hot-spot report ``<stage>.txt`` per stage.
+
+    Each report lists the functions where the stage spent most of its own time, then the same
+    functions by cumulative time (including what they call).
+
+    Returns:
+        Paths of the reports written
+    """
+    reports = []
+    for stage in STAGES:
+        paths = sorted(glob.glob(os.path.join(directory, f"{stage}.*.prof")))
+        if not paths:
+            continue
+        report = io.StringIO()
+        stats = pstats.Stats(*paths, stream=report)
+        report.write(f"Stage '{stage}', merged from {len(paths)} run(s)\n")
+        stats.strip_dirs().sort_stats(pstats.SortKey.TIME).print_stats(limit)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+        path = os.path.join(directory, f"{stage}.txt")
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(report.getvalue())
+        reports.append(path)
+    return reports
+
+
+_profiler: Optional[StageProfiler] = None
+
+
+def enable_profiling(stages: tuple[str, ...] = STAGES) -> StageProfiler:
+    """Start profiling ``stages``, returning the profiler that collects them."""
+    global _profiler
+    _profiler = StageProfiler(stages)
+    return _profiler
+
+
+def disable_profiling() -> None:
+    global _profiler
+    _profiler = None
+
+
+def get_profiler() -> Optional[StageProfiler]:
+    return _profiler
+
+
+@contextmanager
+def profiled(stage: str) -> Iterator[None]:
+    """Profile the enclosed block as part of ``stage``. Does nothing unless profiling is enabled."""
+    profiler = _profiler
+    if profiler is None:
+        yield
+        return
+    with profiler.profile(stage):
+        yield
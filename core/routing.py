@@ -0,0 +1,276 @@
+"""
+Model routing: per-stage model selection, fallback chains and model capabilities.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Optional
+from openai import AsyncOpenAI, OpenAI, APITimeoutError, RateLimitError
+from pydantic import BaseModel, Field
+from .aio import in_sync_call, run_sync
+from .deadline import Deadline
+from .tokens import PromptTokenReport
+from .tracing import span
+from .exercise_types import exercise_type_keys
+
+# Cassettes are only used with --record/--replay, so the module is imported by whoever creates one
+if TYPE_CHECKING:
+    from .cassette import Cassette
+
+
+class ModelCapabilities(BaseModel):
+    """What a family of models does and doesn't support."""
+    fixed_temperature: Optional[float] = Field(default=None, description="Only temperature the model accepts, if it is fixed")
+    supports_n: bool = Field(default=True, description="Whether the model accepts n > 1 completions per request")
+
+
+class UsageStats(BaseModel):
+    """Token usage reported by the API, accumulated per stage."""
+    calls: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = Field(default=0, description="Prompt tokens served from the provider's prompt prefix cache")
+    completion_tokens: int = 0
+    
+    @property
+    def cache_hit_rate(self) -> float:
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+
+# Capabilities keyed by model name prefix; the longest matching prefix wins
+MODEL_CAPABILITIES: dict[str, ModelCapabilities] = {
+    "": ModelCapabilities(),
+    "gpt-5": ModelCapabilities(fixed_temperature=1.0),
+    "o1": ModelCapabilities(fixed_temperature=1.0),
+    "o3": ModelCapabilities(fixed_temperature=1.0),
+    "o4": ModelCapabilities(fixed_temperature=1.0),
+}
+
+# Stage name used for learning plan creation; generation stages use the exercise type (e.g. "single_mcq")
+PLANNING_STAGE = "planning"
+
+
+def get_model_capabilities(model: str) -> ModelCapabilities:
+    """Look up the capabilities of a model by its longest registered name prefix."""
+    prefix = max((p for p in MODEL_CAPABILITIES if model.startswith(p)), key=len)
+    return MODEL_CAPABILITIES[prefix]
+
+
+def resolve_temperature(model: str, temperature: float, default: Optional[float] = None) -> float:
+    """Return the temperature to use for ``model``, warning if a requested value must be overridden.
+
+    The warning is only printed when ``temperature`` differs from ``default``, i.e. when the
+    caller explicitly asked for something the model can't do.
+    """
+    fixed = get_model_capabilities(model).fixed_temperature
+    if fixed is None:
+        return temperature
+    if temperature != fixed and temperature != default:
+        print(f"Warning: {model} only supports temperature={fixed:g}. Adjusting from {temperature} to {fixed}")
+    return fixed
+
+
+def parse_routes(specs: list[str]) -> dict[str, list[str]]:
+    """Parse CLI route specs of the form ``stage=model[,fallback...]``."""
+    routes: dict[str, list[str]] = {}
+    for spec in specs:
+        stage, sep, models = spec.partition("=")
+        chain = [m.strip() for m in models.split(",") if m.strip()]
+        if not sep or not stage.strip() or not chain:
+            raise ValueError(f"Invalid route '{spec}'. Expected STAGE=MODEL[,FALLBACK...], e.g. planning=gpt-4o-mini,gpt-4o")
+        routes[stage.strip()] = chain
+    return routes
+
+
+class ModelRouter:
+    """Chooses which model(s) serve each stage and fails over along the chain.
+
+    Routes map a stage (``"planning"`` or an exercise type such as ``"drag_drop_classify"``)
+    to an ordered list of models. The first model is tried first; a timeout or rate limit
+    moves on to the next one. Stages without a route use ``default_model``.
+    
+    Async callers send requests through ``async_client`` (an AsyncOpenAI client created on first
+    use unless one is given; use the router from a single event loop). Synchronous callers, and
+    async callers when only a blocking ``client`` was injected, use ``client`` from worker threads.
+    
+    With a ``cassette`` in record mode every request is saved with its response and timing; in
+    replay mode responses come from the cassette and no API client (or key) is needed.
+    
+    Clients send each request once (``max_retries=0``): the SDK would otherwise retry a timed-out
+    request with the same timeout, overrunning the deadline. Retrying is left to the callers'
+    attempt loops and to failover along the chain.
+    """
+    
+    # Errors that indicate the model is slow or saturated rather than the request being bad
+    FAILOVER_ERRORS = (APITimeoutError, RateLimitError)
+    
+    # Rate limit retries of the last model in a chain, with exponential backoff from RATE_LIMIT_BACKOFF seconds
+    RATE_LIMIT_RETRIES = 2
+    RATE_LIMIT_BACKOFF = 1.0
+    
+    def __init__(self, default_model: str = "gpt-4o", routes: Optional[dict[str, list[str]]] = None, client: Optional[OpenAI] = None,
+                 async_client: Optional[AsyncOpenAI] = None, cassette: Optional["Cassette"] = None):
+        self.default_model = default_model
+        self.routes = {stage: list(chain) for stage, chain in (routes or {}).items()}
+        valid_stages = [PLANNING_STAGE] + exercise_type_keys()
+        for stage, chain in self.routes.items():
+            if stage not in valid_stages:
+                raise ValueError(f"Unknown routing stage: {stage}. Valid stages: {valid_stages}")
+            if not chain:
+                raise ValueError(f"Route for stage '{stage}' must list at least one model")
+        self.cassette = cassette
+        self._owns_client = client is None
+        # Replays never reach the API, so they don't need a client (or a key)
+        replaying = cassette is not None and cassette.replaying
+        if client is not None:
+            client = client.with_options(max_retries=0)
+        elif not replaying:
+            client = OpenAI(api_key=os.environ["OPENAI_API_KEY"], max_retries=0)
+        self.client = client
+        self.async_client = async_client.with_options(max_retries=0) if async_client is not None else None
+        self.usage: dict[str, UsageStats] = {}
+        self.prompt_reports: list[PromptTokenReport] = []
+        self._usage_lock = threading.Lock()
+    
+    def models_for(self, stage: str) -> list[str]:
+        """Ordered fallback chain of models for a stage."""
+        return self.routes.get(stage) or [self.default_model]
+    
+    def primary_model(self, stage: str) -> str:
+        return self.models_for(stage)[0]
+    
+    def create_completion(self, stage: str, messages: list[dict[str, str]], temperature: float, deadline: Optional[Deadline] = None, **kwargs: Any) -> Any:
+        """Blocking version of acreate_completion."""
+        return run_sync(self.acreate_completion(stage, messages, temperature, deadline, **kwargs))
+    
+    async def _send(self, stage: str, **request: Any) -> Any:
+        if self.cassette is None:
+            return await self._send_live(**request)
+        if self.cassette.replaying:
+            return await self.cassette.play(request)
+        started = time.perf_counter()
+        try:
+            response = await self._send_live(**request)
+        except Exception as e:
+            self.cassette.record_interaction(stage, request, started, time.perf_counter() - started, error=e)
+            raise
+        self.cassette.record_interaction(stage, request, started, time.perf_counter() - started, response=response)
+        return response
+    
+    async def _send_live(self, **request: Any) -> Any:
+        if self.async_client is None and self._owns_client and not in_sync_call():
+            self.async_client = AsyncOpenAI(api_key=self.client.api_key, max_retries=0)
+        if self.async_client is not None and not in_sync_call():
+            return await self.async_client.chat.completions.create(**request)
+        return await asyncio.to_thread(self.client.chat.completions.create, **request)
+    
+    async def acreate_completion(self, stage: str, messages: list[dict[str, str]], temperature: float, deadline: Optional[Deadline] = None, **kwargs: Any) -> Any:
+        """Create a chat completion for ``stage``, failing over to the next model on timeout or rate limit.
+
+        The temperature is adjusted per model according to its capabilities. Models other than
+        the last in the chain are capped at half of the remaining deadline so a fallback still
+        has time to run. The first timeout or rate limit moves on to the next model; the last
+        model, having nothing to fall back to, waits out a rate limit up to RATE_LIMIT_RETRIES
+        times if the deadline allows.
+        """
+        deadline = deadline or Deadline()
+        chain = self.models_for(stage)
+        index = 0
+        rate_limited = 0
+        
+        while True:
+            model = chain[index]
+            is_last = index == len(chain) - 1
+            call_deadline = deadline if is_last else deadline.share(2)
+            request_kwargs = dict(kwargs)
+            if request_kwargs.get("n", 1) > 1 and not get_model_capabilities(model).supports_n:
+                # Fall back to a single sample rather than failing the request
+                request_kwargs.pop("n")
+            timeout = call_deadline.request_timeout()
+            if timeout is not None:
+                request_kwargs["timeout"] = timeout
+            
+            try:
+                with span("completion", stage=stage, model=model, n=request_kwargs.get("n", 1)) as active:
+                    response = await self._send(
+                        stage,
+                        model=model,
+                        messages=messages,
+                        temperature=resolve_temperature(model, temperature, default=temperature),
+                        **request_kwargs
+                    )
+                    usage = getattr(response, "usage", None)
+                    if usage is not None:
+                        active.set(prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens)
+                self.record_usage(stage, response)
+                return response
+            except self.FAILOVER_ERRORS as e:
+                if deadline.expired():
+                    raise
+                if not is_last:
+                    print(f"Warning: {model} failed for {stage} ({type(e).__name__}); falling back to {chain[index + 1]}")
+                    index += 1
+                    continue
+                backoff = self.RATE_LIMIT_BACKOFF * 2 ** rate_limited
+                if not isinstance(e, RateLimitError) or rate_limited >= self.RATE_LIMIT_RETRIES or not deadline.allows(backoff):
+                    raise
+                rate_limited += 1
+                print(f"Warning: {model} rate limited for {stage}; retrying in {backoff:g}s")
+                if self.cassette is None or not self.cassette.replaying:
+                    await asyncio.sleep(backoff)
+    
+    def record_usage(self, stage: str, response: Any) -> None:
+        """Add the token counts from ``response.usage`` to the stage's totals."""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = (getattr(details, "cached_tokens", None) or 0) if details is not None else 0
+        with self._usage_lock:
+            stats = self.usage.setdefault(stage, UsageStats())
+            stats.calls += 1
+            stats.prompt_tokens += usage.prompt_tokens or 0
+            stats.cached_tokens += cached
+            stats.completion_tokens += usage.completion_tokens or 0
+    
+    def record_prompt_report(self, report: PromptTokenReport) -> None:
+        """Keep the locally estimated size of a prompt about to be sent."""
+        with self._usage_lock:
+            self.prompt_reports.append(report)
+    
+    def usage_summary(self) -> str:
+        """Human-readable token usage per stage, including prompt-cache hits."""
+        lines = ["Token usage:"]
+        total = UsageStats()
+        for stage, stats in self.usage.items():
+            lines.append(
+                f"  {stage}: {stats.calls} call(s), {stats.prompt_tokens} prompt "
+                f"({stats.cached_tokens} cached, {stats.cache_hit_rate:.0%}), {stats.completion_tokens} completion"
+            )
+            total.calls += stats.calls
+            total.prompt_tokens += stats.prompt_tokens
+            total.cached_tokens += stats.cached_tokens
+            total.completion_tokens += stats.completion_tokens
+        lines.append(
+            f"  total: {total.calls} call(s), {total.prompt_tokens} prompt "
+            f"({total.cached_tokens} cached, {total.cache_hit_rate:.0%}), {total.completion_tokens} completion"
+        )
+        if self.prompt_reports:
+            lines.append(f"Estimated prompt tokens per request ({self.prompt_reports[0].method}, mean by stage):")
+            by_stage: dict[str, list[PromptTokenReport]] = {}
+            for report in self.prompt_reports:
+                by_stage.setdefault(report.stage, []).append(report)
+            for stage, reports in by_stage.items():
+                sections: dict[str, int] = {}
+                for report in reports:
+                    for name, tokens in report.sections.items():
+                        sections[name] = sections.get(name, 0) + tokens
+                mean = PromptTokenReport(
+                    stage=stage, method=reports[0].method,
+                    sections={name: round(tokens / len(reports)) for name, tokens in sections.items()}
+                )
+                pruned = sum(report.pruned for report in reports)
+                suffix = f", {pruned} pruned" if pruned else ""
+                lines.append(f"  {mean.summary()} x{len(reports)}{suffix}")
+        return "\n".join(lines)
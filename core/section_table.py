@@ -0,0 +1,95 @@
+"""
+Compact storage for the extracted sections of many transcripts: one shared text buffer addressed by offsets.
+"""
+
+from array import array
+from typing import Iterable, Iterator
+
+# Largest offset a 4-byte ("I") offset array can hold; bigger buffers switch to 8-byte offsets
+_MAX_UINT32 = 2 ** 32 - 1
+
+
+class SectionTable:
+    """Extracted sections of many documents, stored back to back in one UTF-8 buffer.
+
+    A list of section strings costs about 57 bytes per section on top of the text (a string
+    object plus its list slot), and a single non-ASCII character makes CPython store a whole
+    string at 2 or 4 bytes per character. Here each section costs one 4-byte offset (8 bytes
+    once the buffer passes 4 GB) and the text is UTF-8. Sections are only decoded into
+    strings when asked for; section_bytes() gives a zero-copy memoryview of one instead.
+
+    Sections are numbered across the whole table, in the order documents were added.
+
+    Example:
+        table = SectionTable()
+        extractor = VideoContentExtractor()
+        for path in paths:
+            table.add(path, extractor.extract_sections(read(path)))
+        for index in table.document_sections(0):
+            print(table.section(index))
+    """
+    
+    __slots__ = ("names", "_buffer", "_offsets", "_documents")
+    
+    def __init__(self):
+        # Document names (e.g. file paths), by document number
+        self.names: list[str] = []
+        self._buffer = bytearray()
+        # Start of every section plus the end of the last: section i is _offsets[i]:_offsets[i + 1]
+        self._offsets = array("I", [0])
+        # First section of every document plus one past the last section
+        self._documents = array("I", [0])
+    
+    def add(self, name: str, sections: Iterable[str]) -> int:
+        """Append a document's sections, returning its document number."""
+        for section in sections:
+            self._buffer += section.encode("utf-8")
+            end = len(self._buffer)
+            if end > _MAX_UINT32 and self._offsets.typecode == "I":
+                self._offsets = array("Q", self._offsets)
+            self._offsets.append(end)
+        self._documents.append(len(self._offsets) - 1)
+        self.names.append(name)
+        return len(self.names) - 1
+    
+    def __len__(self) -> int:
+        """Number of sections, over all documents."""
+        return len(self._offsets) - 1
+    
+    @property
+    def document_count(self) -> int:
+        return len(self.names)
+    
+    def section_bytes(self, index: int) -> memoryview:
+        """Section ``index`` as UTF-8, without copying it out of the buffer.
+
+        The view keeps the buffer from growing while it exists, so release it (or use it in a
+        ``with`` block) before adding more documents.
+        """
+        return memoryview(self._buffer)[self._offsets[index]:self._offsets[index + 1]]
+    
+    def section(self, index: int) -> str:
+        return self._buffer[self._offsets[index]:self._offsets[index + 1]].decode("utf-8")
+    
+    def __getitem__(self, index: int) -> str:
+        return self.section(index if index >= 0 else len(self) + index)
+    
+    def __iter__(self) -> Iterator[str]:
+        return (self.section(index) for index in range(len(self)))
+    
+    def document_sections(self, document: int) -> range:
+        """Section numbers of ``document``, for section() and section_bytes()."""
+        return range(self._documents[document], self._documents[document + 1])
+    
+    def document_text(self, document: int, separator: str = "\n\n") -> str:
+        """A document's sections joined by ``separator``: what extract_meaningful_content returns for it."""
+        return separator.join(self.section(index) for index in self.document_sections(document))
+    
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the text buffer and the offset arrays (not counting ``names``)."""
+        return (
+            len(self._buffer)
+            + self._offsets.itemsize * len(self._offsets)
+            + self._documents.itemsize * len(self._documents)
+        )
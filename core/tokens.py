@@ -0,0 +1,184 @@
+"""
+Local prompt token estimation, per-component accounting and budget enforcement.
+"""
+
+import math
+import re
+from functools import lru_cache
+from typing import Optional
+from pydantic import BaseModel, Field
+
+try:
+    import tiktoken
+except ImportError:  # Optional: falls back to the calibrated heuristic below
+    tiktoken = None
+
+
+# Average characters per token for English prose with the OpenAI tokenizers
+CHARS_PER_TOKEN = 4.0
+
+# Heuristic calibration: BPE vocabularies hold most common English words (with their leading
+# space) as one token; longer or rarer words split roughly every LONG_WORD_CHARS characters,
+# digits are grouped in threes, and most punctuation and non-ASCII characters cost one each.
+LONG_WORD_CHARS = 7
+_PIECE_PATTERN = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+
+class PromptBudgetExceeded(Exception):
+    """Raised when a prompt can't be brought under the token budget by pruning content."""
+
+
+# Marker appended when video content is cut to fit the prompt budget
+TRUNCATION_MARKER = "[... remaining video content omitted to fit the prompt token budget ...]"
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str):
+    """The tiktoken encoding for a model, or None if tiktoken or its BPE files are unavailable."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        try:
+            return tiktoken.get_encoding("o200k_base")
+        except Exception:
+            return None
+    except Exception:
+        # e.g. the BPE file isn't cached locally and can't be downloaded
+        return None
+
+
+def heuristic_token_count(text: str) -> int:
+    """Estimate BPE token count without a tokenizer."""
+    count = 0
+    for piece in _PIECE_PATTERN.findall(text):
+        if piece[0].isdigit():
+            count += math.ceil(len(piece) / 3)
+        elif piece[0].isalpha():
+            count += 1 + (len(piece) - 1) // LONG_WORD_CHARS
+        else:
+            count += 1
+    return count
+
+
+class TokenEstimator:
+    """Counts prompt tokens with the model's BPE tokenizer when available, else a calibrated heuristic."""
+    
+    def __init__(self, model: str = "gpt-4o"):
+        self.model = model
+        self._encoding = _get_encoding(model)
+    
+    @property
+    def method(self) -> str:
+        return "tiktoken" if self._encoding is not None else "heuristic"
+    
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return heuristic_token_count(text)
+
+
+@lru_cache(maxsize=None)
+def get_token_estimator(model: str = "gpt-4o") -> TokenEstimator:
+    """Shared estimator per model."""
+    return TokenEstimator(model)
+
+
+def estimate_tokens(text: str, model: str = "gpt-4o") -> int:
+    """Estimate how many tokens ``text`` will use in a prompt."""
+    return get_token_estimator(model).count(text)
+
+
+class PromptTokenReport(BaseModel):
+    """Estimated prompt size for one request, broken down by prompt component."""
+    stage: str = Field(description="Planning or the exercise type the prompt was built for")
+    method: str = Field(description="How tokens were counted: 'tiktoken' or 'heuristic'")
+    sections: dict[str, int] = Field(description="Estimated tokens per component, e.g. instructions, examples, schema")
+    pruned: bool = Field(default=False, description="Whether video content was cut to fit the budget")
+    
+    @property
+    def total(self) -> int:
+        return sum(self.sections.values())
+    
+    def summary(self) -> str:
+        breakdown = ", ".join(f"{name} {tokens}" for name, tokens in self.sections.items())
+        pruned = " (video content pruned)" if self.pruned else ""
+        return f"{self.stage}: ~{self.total} tokens [{breakdown}]{pruned}"
+
+
+def count_sections(sections: list[tuple[str, str]], estimator: TokenEstimator) -> dict[str, int]:
+    """Estimated tokens per named prompt section."""
+    return {name: estimator.count(text) for name, text in sections}
+
+
+def prune_content(content: str, max_tokens: int, estimator: TokenEstimator) -> str:
+    """Cut ``content`` at paragraph boundaries so that it fits in ``max_tokens``.
+
+    Paragraphs are kept in order from the start; a paragraph that doesn't fit is dropped
+    along with everything after it, and a marker notes that content was omitted. If not even
+    the first paragraph fits, it is cut by characters.
+    """
+    if estimator.count(content) <= max_tokens:
+        return content
+    
+    budget = max_tokens - estimator.count(TRUNCATION_MARKER)
+    kept: list[str] = []
+    used = 0
+    for paragraph in content.split("\n\n"):
+        # +1 for the paragraph separator
+        tokens = estimator.count(paragraph) + 1
+        if used + tokens > budget:
+            break
+        kept.append(paragraph)
+        used += tokens
+    
+    if not kept:
+        # Even the first paragraph is too long: cut it by characters instead
+        first = content.split("\n\n", 1)[0]
+        cut = int(budget * CHARS_PER_TOKEN)
+        while cut > 0 and estimator.count(first[:cut]) > budget:
+            cut = int(cut * 0.9)
+        if cut <= 0:
+            raise PromptBudgetExceeded(f"Prompt token budget leaves no room for video content ({max_tokens} tokens available)")
+        kept.append(first[:cut])
+    
+    return "\n\n".join(kept + [TRUNCATION_MARKER])
+
+
+def fit_content_to_budget(build_sections, content: str, max_tokens: Optional[int], estimator: TokenEstimator) -> tuple[list[tuple[str, str]], dict[str, int], bool]:
+    """Build prompt sections, pruning ``content`` first if the prompt would exceed ``max_tokens``.
+    
+    Args:
+        build_sections: Callable taking the (possibly pruned) content and returning (name, text) sections
+        content: The video content to place in the prompt
+        max_tokens: Maximum estimated prompt tokens, or None for no limit
+        estimator: Token estimator for the target model
+    
+    Returns:
+        The sections to send, their estimated tokens per section, and whether content was pruned
+    """
+    sections = build_sections(content)
+    counts = count_sections(sections, estimator)
+    if max_tokens is None or sum(counts.values()) <= max_tokens:
+        return sections, counts, False
+    
+    content_budget = estimator.count(content)
+    # Other sections can shift slightly with the content (e.g. example selection), so re-check
+    for _ in range(3):
+        content_budget -= sum(counts.values()) - max_tokens
+        if content_budget <= 0:
+            break
+        pruned = prune_content(content, content_budget, estimator)
+        sections = build_sections(pruned)
+        counts = count_sections(sections, estimator)
+        if sum(counts.values()) <= max_tokens:
+            return sections, counts, True
+    
+    fixed_tokens = sum(tokens for name, tokens in counts.items() if name != "video_content")
+    raise PromptBudgetExceeded(
+        f"Prompt sections other than the video content need ~{fixed_tokens} tokens, leaving no room for content "
+        f"within the {max_tokens}-token limit. Raise MAX_PROMPT_TOKENS or reduce the example budget."
+    )
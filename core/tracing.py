@@ -0,0 +1,242 @@
+"""
+Hierarchical tracing spans for the extract, plan, generate and format stages, exported as Chrome trace JSON.
+"""
+
+import asyncio
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # Optional: spans are still exported as Chrome trace JSON
+    otel_trace = None
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Span:
+    """One timed operation, with the span that was active when it started as its parent."""
+    
+    __slots__ = ("name", "span_id", "parent", "start", "end", "attributes", "track", "_otel")
+    
+    def __init__(self, name: str, span_id: int, parent: Optional["Span"], track: tuple[str, Optional[int]], attributes: dict[str, Any]):
+        self.name = name
+        self.span_id = span_id
+        self.parent = parent
+        self.track = track
+        self.attributes = attributes
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self._otel = None
+    
+    @property
+    def duration(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+    
+    def set(self, **attributes: Any) -> None:
+        """Add attributes known only once the operation is under way (model, tokens, results)."""
+        self.attributes.update(attributes)
+
+
+class _NoopSpan:
+    """Stands in for a span while tracing is off, so instrumented code needs no checks."""
+    
+    __slots__ = ()
+    
+    def set(self, **attributes: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+# Innermost open span of the current thread or asyncio task
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+
+# Sequence number per asyncio task; id() could be reused by a later task once one is collected
+_task_numbers: "weakref.WeakKeyDictionary[asyncio.Task, int]" = weakref.WeakKeyDictionary()
+_task_counter = itertools.count(1)
+
+
+def _track() -> tuple[str, Optional[int]]:
+    """Where a span runs: its thread, and its asyncio task when there is one.
+
+    Concurrent generation calls are tasks on one event loop thread; giving each task its own
+    track is what lets a trace viewer show them overlapping instead of wrongly nested.
+    """
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    if task is None:
+        return threading.current_thread().name, None
+    number = _task_numbers.get(task)
+    if number is None:
+        number = _task_numbers.setdefault(task, next(_task_counter))
+    return threading.current_thread().name, number
+
+
+def _otel_value(value: Any) -> Any:
+    return value if isinstance(value, (str, bool, int, float)) else str(value)
+
+
+class Tracer:
+    """Collects finished spans for export.
+
+    Spans nest through a context variable, so a span opened inside another (in the same thread
+    or asyncio task, or in a task created while it was open) becomes its child. With
+    ``opentelemetry`` every span is also sent to the globally configured OpenTelemetry tracer
+    provider, with the same parent/child structure.
+    """
+    
+    def __init__(self, opentelemetry: bool = False):
+        if opentelemetry and otel_trace is None:
+            raise ImportError("OpenTelemetry export needs the opentelemetry-api package (pip install opentelemetry-sdk)")
+        self.spans: list[Span] = []
+        self.origin = time.perf_counter()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._otel = otel_trace.get_tracer(__name__) if opentelemetry else None
+    
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        parent = _current_span.get()
+        span = Span(name, next(self._ids), parent, _track(), attributes)
+        if self._otel is not None:
+            context = otel_trace.set_span_in_context(parent._otel) if parent is not None and parent._otel is not None else None
+            span._otel = self._otel.start_span(name, context=context)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set(error=type(e).__name__)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end = time.perf_counter()
+            if span._otel is not None:
+                span._otel.set_attributes({key: _otel_value(value) for key, value in span.attributes.items() if value is not None})
+                span._otel.end()
+            with self._lock:
+                self.spans.append(span)
+    
+    def chrome_trace(self) -> dict[str, Any]:
+        """The spans as Chrome trace-event JSON (for chrome://tracing, Perfetto or speedscope).
+
+        Each span is a complete ("X") event on its thread/task track, with its attributes,
+        id and parent id as args. A child that runs on a different track from its parent (a
+        concurrent task, a worker thread) is linked to it by a flow arrow.
+        """
+        pid = os.getpid()
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start)
+        tracks: dict[tuple[str, Optional[int]], int] = {}
+        events: list[dict[str, Any]] = []
+        
+        def tid(track: tuple[str, Optional[int]]) -> int:
+            if track not in tracks:
+                tracks[track] = len(tracks) + 1
+                thread, task = track
+                label = thread if task is None else f"{thread} task {task}"
+                events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tracks[track], "args": {"name": label}})
+            return tracks[track]
+        
+        def micros(seconds: float) -> float:
+            return round((seconds - self.origin) * 1_000_000, 1)
+        
+        for span in spans:
+            args = {key: value if isinstance(value, (str, bool, int, float)) or value is None else str(value) for key, value in span.attributes.items()}
+            args["span_id"] = span.span_id
+            if span.parent is not None:
+                args["parent_id"] = span.parent.span_id
+            events.append({
+                "name": span.name, "cat": "exercise_generator", "ph": "X", "pid": pid, "tid": tid(span.track),
+                "ts": micros(span.start), "dur": round(span.duration * 1_000_000, 1), "args": args
+            })
+            if span.parent is not None and span.parent.track != span.track:
+                flow = {"name": "spawn", "cat": "exercise_generator", "id": span.span_id, "pid": pid, "ts": micros(span.start)}
+                events.append({**flow, "ph": "s", "tid": tid(span.parent.track)})
+                events.append({**flow, "ph": "f", "bp": "e", "tid": tid(span.track)})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+    
+    def write_chrome_trace(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.chrome_trace(), file)
+    
+    def summary(self) -> str:
+        """Count, total and longest duration per span name, in order of first appearance."""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start)
+        stats: dict[str, list[float]] = {}
+        for span in spans:
+            stats.setdefault(span.name, []).append(span.duration)
+        lines = ["Trace spans:"]
+        for name, durations in stats.items():
+            lines.append(f"  {name}: {len(durations)} x, {sum(durations):.2f}s total, {max(durations):.2f}s max")
+        return "\n".join(lines)
+
+
+_tracer: Optional[Tracer] = None
+
+
+def enable_tracing(opentelemetry: bool = False) -> Tracer:
+    """Start recording spans, returning the tracer that collects them."""
+    global _tracer
+    _tracer = Tracer(opentelemetry)
+    return _tracer
+
+
+def disable_tracing() -> None:
+    global _tracer
+    _tracer = None
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """Time the enclosed block as a child of the current span. Does nothing unless tracing is enabled."""
+    tracer = _tracer
+    if tracer is None:
+        yield _NOOP_SPAN
+        return
+    with tracer.span(name, **attributes) as active:
+        yield active
+
+
+def current_span() -> Any:
+    """The innermost open span, for adding attributes to it (a no-op span when there is none)."""
+    if _tracer is None:
+        return _NOOP_SPAN
+    return _current_span.get() or _NOOP_SPAN
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorator running each call of a function or coroutine function in a span called ``name``."""
+    def decorate(function: F) -> F:
+        if asyncio.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(name):
+                    return await function(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -2,7 +2,9 @@
 Utility functions for the exercise generator.
 """
 
-from .content_extractor import extract_video_content
+from .content_extractor import extract_video_content, extract_video_sections
+from .profiling import profiled
+from .tracing import span
 
 
 def load_video_content(filepath: str, extract_content: bool = True) -> str:
@@ -17,13 +19,32 @@ def load_video_content(filepath: str, extract_content: bool = True) -> str:
     Returns:
         Video content (extracted or raw based on extract_content parameter)
     """
-    with open(filepath, 'r', encoding='utf-8') as file:
-        raw_content = file.read()
-    
-    if extract_content:
-        return extract_video_content(raw_content)
-    else:
-        return raw_content
+    with span("load_video_content", video=filepath, extract=extract_content) as active:
+        with open(filepath, 'r', encoding='utf-8') as file:
+            raw_content = file.read()
+        
+        if extract_content:
+            with profiled("extract"):
+                content = extract_video_content(raw_content)
+        else:
+            content = raw_content
+        active.set(raw_chars=len(raw_content), chars=len(content))
+        return content
+
+
+def load_video_sections(filepath: str) -> list[str]:
+    """
+    Load a video transcript and extract its meaningful content as sections (see
+    VideoContentExtractor.extract_sections); joined with blank lines they give load_video_content.
+    """
+    with span("load_video_content", video=filepath, extract=True) as active:
+        with open(filepath, 'r', encoding='utf-8') as file:
+            raw_content = file.read()
+        
+        with profiled("extract"):
+            sections = extract_video_sections(raw_content)
+        active.set(raw_chars=len(raw_content), sections=len(sections))
+        return sections
 
 
 def load_video_content_raw(filepath: str) -> str:
@@ -4,16 +4,53 @@ DataCamp Exercise Generator - Formatters Package
 This package contains formatters that convert exercise objects to markdown/YAML format.
 """
 
-from .base import ExerciseFormatter
-from .single_mcq import SingleAnswerMCQFormatter
-from .multiple_mcq import MultipleAnswerMCQFormatter
-from .drag_drop_classify import DragDropClassifyFormatter
-from .drag_drop_order import DragDropOrderFormatter
+from importlib import import_module
+
+# Public name -> defining submodule, imported on first access
+_LAZY_IMPORTS = {
+    "ExerciseFormatter": ".base",
+    "TemplateFormatter": ".base",
+    "Template": ".templates",
+    "SingleAnswerMCQFormatter": ".single_mcq",
+    "MultipleAnswerMCQFormatter": ".multiple_mcq",
+    "DragDropClassifyFormatter": ".drag_drop_classify",
+    "DragDropOrderFormatter": ".drag_drop_order",
+    "JsonlWriter": ".jsonl",
+    "OutputSink": ".sinks",
+    "StreamSink": ".sinks",
+    "FileSink": ".sinks",
+    "ShardedSink": ".sinks",
+    "open_output_sink": ".sinks",
+    "read_indexed": ".sinks"
+}
 
 __all__ = [
     "ExerciseFormatter",
+    "TemplateFormatter",
+    "Template",
     "SingleAnswerMCQFormatter",
     "MultipleAnswerMCQFormatter",
     "DragDropClassifyFormatter",
-    "DragDropOrderFormatter"
+    "DragDropOrderFormatter",
+    "JsonlWriter",
+    "OutputSink",
+    "StreamSink",
+    "FileSink",
+    "ShardedSink",
+    "open_output_sink",
+    "read_indexed"
 ]
+
+
+def __getattr__(name: str):
+    """Import public names on first access, so importing the package stays cheap."""
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -3,7 +3,10 @@ Base formatter abstract class.
 """
 
 from abc import ABC, abstractmethod
+from io import StringIO
+from typing import Any, Iterable, TextIO
 from ..models.exercises import Exercise
+from .templates import Template
 
 
 class ExerciseFormatter(ABC):
@@ -11,3 +14,37 @@ class ExerciseFormatter(ABC):
     def format_to_markdown(self, exercise: Exercise) -> str:
         """Convert an exercise object to markdown/YAML format."""
         pass
+    
+    def write_markdown(self, exercise: Exercise, out: TextIO) -> None:
+        """Write one exercise's markdown to ``out``."""
+        out.write(self.format_to_markdown(exercise))
+    
+    def format_batch(self, exercises: Iterable[Exercise], separator: str = "\n---\n") -> str:
+        """Format several exercises into one document, rendered into a single buffer."""
+        out = StringIO()
+        for index, exercise in enumerate(exercises):
+            if index:
+                out.write(separator)
+            self.write_markdown(exercise, out)
+        return out.getvalue()
+
+
+class TemplateFormatter(ExerciseFormatter):
+    """Formatter whose output is a compiled Template filled from ``template_values``.
+    
+    Subclasses set ``template`` as a class attribute, so it is compiled once per exercise type.
+    """
+    template: Template
+    
+    @abstractmethod
+    def template_values(self, exercise: Exercise) -> dict[str, Any]:
+        """Values for the template's slots."""
+        pass
+    
+    def write_markdown(self, exercise: Exercise, out: TextIO) -> None:
+        self.template.render_into(out, self.template_values(exercise))
+    
+    def format_to_markdown(self, exercise: Exercise) -> str:
+        out = StringIO()
+        self.write_markdown(exercise, out)
+        return out.getvalue()
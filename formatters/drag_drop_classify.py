@@ -2,51 +2,14 @@
 Formatter for drag-and-drop classify exercises.
 """
 
-from .base import ExerciseFormatter
+from typing import Any
+from .base import TemplateFormatter
+from .templates import Template
 from ..models.exercises import DragDropClassifyExercise
 
 
-class DragDropClassifyFormatter(ExerciseFormatter):
-    def format_to_markdown(self, exercise: DragDropClassifyExercise) -> str:
-        """Convert a DragDropClassifyExercise object to the final markdown format."""
-        
-        # Format hints
-        hints_formatted = "\n    ".join(exercise.hints)
-        
-        # Generate correctness conditions and solution structure
-        correctness_checks: list[str] = []
-        solution_dropzones: list[str] = []
-        
-        for dropzone in exercise.drop_zones:
-            dropzone_items: list[str] = []
-            
-            for item in dropzone.draggable_items:
-                # Create correctness condition
-                correctness_checks.append(f"""        - condition: check_target({item.id}) == {dropzone.id}
-          message: >-
-            {item.incorrect_message}
-          shouldBe: true""")
-                
-                # Add item to solution dropzone
-                dropzone_items.append(f"""          - content: {item.content}
-            id: {item.id}
-            incorrectMessage: >-
-              {item.incorrect_message}""")
-            
-            # Build solution dropzone
-            solution_dropzones.append(f"""      - draggableItems:
-{chr(10).join(dropzone_items)}
-        id: {dropzone.id}
-        title: {dropzone.title}""")
-        
-        # Combine correctness conditions
-        correctness_checks_formatted = "\n".join(correctness_checks)
-        
-        # Combine solution dropzones
-        solution_dropzones_formatted = "\n".join(solution_dropzones)
-        
-        # Construct the full exercise markdown
-        return f"""## {exercise.title}
+class DragDropClassifyFormatter(TemplateFormatter):
+    template = Template("""## {title}
 
 ```yaml
 type: DragAndDropExercise
@@ -54,22 +17,58 @@ key:
 xp: 100
 version: v2
 data:
-  assignment: >-
-    {exercise.context}
-  hint: >-
-    - {hints_formatted}
-  instructions: >-
-    - {exercise.instructions}
+  assignment: {context:block}
+  hint: {hint:block}
+  instructions: {instructions:block}
   question:
     correctnessConditions:
-      checks:
-{correctness_checks_formatted}
+      checks:{checks:each}
       isOrdered: false
-      successMessage: >-
-        {exercise.success_message}
+      successMessage: {success_message:block}
     flavor: Classify
     solution:
       - id: options
-        title: Options
-{solution_dropzones_formatted}
-```"""
+        title: Options{drop_zones:each}
+```""",
+        checks=Template("""
+        - condition: {condition:scalar}
+          message: {message:block}
+          shouldBe: true"""),
+        drop_zones=Template("""
+      - draggableItems:{items:each}
+        id: {id:scalar}
+        title: {title:scalar}""",
+            items=Template("""
+          - content: {content:scalar}
+            id: {id:scalar}
+            incorrectMessage: {incorrect_message:block}"""),
+        ),
+    )
+    
+    def template_values(self, exercise: DragDropClassifyExercise) -> dict[str, Any]:
+        # Each item must be dropped in the zone it is listed under
+        checks = [
+            {"condition": f"check_target({item.id}) == {dropzone.id}", "message": item.incorrect_message}
+            for dropzone in exercise.drop_zones for item in dropzone.draggable_items
+        ]
+        drop_zones = [
+            {
+                "id": dropzone.id,
+                "title": dropzone.title,
+                "items": [
+                    {"content": item.content, "id": item.id, "incorrect_message": item.incorrect_message}
+                    for item in dropzone.draggable_items
+                ],
+            }
+            for dropzone in exercise.drop_zones
+        ]
+        return {
+            "title": exercise.title,
+            "context": exercise.context,
+            # Hints share one bullet, as one folded paragraph
+            "hint": f"- {' '.join(exercise.hints)}" if exercise.hints else "",
+            "instructions": f"- {exercise.instructions}",
+            "checks": checks,
+            "success_message": exercise.success_message,
+            "drop_zones": drop_zones,
+        }
@@ -2,44 +2,14 @@
 Formatter for drag-and-drop order exercises.
 """
 
-from uuid import uuid4
-from .base import ExerciseFormatter
-from ..models.exercises import DragDropOrderExercise
+from typing import Any
+from .base import TemplateFormatter
+from .templates import Template
+from ..models.exercises import DragDropOrderExercise, _derived_id
 
 
-class DragDropOrderFormatter(ExerciseFormatter):
-    def format_to_markdown(self, exercise: DragDropOrderExercise) -> str:
-        """Convert a DragDropOrderExercise object to the final markdown format."""
-        
-        # Format hints
-        hints_formatted = "\n    ".join(exercise.hints)
-        
-        # Generate correctness conditions for each item in order
-        correctness_checks: list[str] = []
-        draggable_items: list[str] = []
-        
-        for item in exercise.ordered_items:
-            # Create correctness condition - each item must be in correct index position
-            correctness_checks.append(f"""        - condition: check_index({item.id}) == solution
-          message: {item.incorrect_message}
-          shouldBe: true""")
-            
-            # Add item to draggable items list
-            draggable_items.append(f"""          - content: {item.content}
-            id: {item.id}
-            incorrectMessage: {item.incorrect_message}""")
-        
-        # Combine correctness conditions
-        correctness_checks_formatted = "\n".join(correctness_checks)
-        
-        # Combine draggable items
-        draggable_items_formatted = "\n".join(draggable_items)
-        
-        # Generate unique ID for the solution container
-        solution_id = f"solution_{uuid4().hex[:8]}"
-        
-        # Construct the full exercise markdown
-        return f"""## {exercise.title}
+class DragDropOrderFormatter(TemplateFormatter):
+    template = Template("""## {title}
 
 ```yaml
 type: DragAndDropExercise
@@ -47,24 +17,50 @@ key:
 xp: 100
 version: v2
 data:
-  assignment: >-
-    {exercise.context}
-  hint: >-
-    - {hints_formatted}
-  instructions: >-
-    - {exercise.instructions}
+  assignment: {context:block}
+  hint: {hint:block}
+  instructions: {instructions:block}
   question:
     correctnessConditions:
-      checks:
-{correctness_checks_formatted}
-      failureMessage: {exercise.failure_message}
+      checks:{checks:each}
+      failureMessage: {failure_message:scalar}
       isOrdered: true
-      successMessage: >-
-        {exercise.success_message}
+      successMessage: {success_message:block}
     flavor: Order
     solution:
-      - draggableItems:
-{draggable_items_formatted}
-        id: {solution_id}
-        title: {exercise.sequence_title}
-```"""
+      - draggableItems:{items:each}
+        id: {solution_id:scalar}
+        title: {sequence_title:scalar}
+```""",
+        checks=Template("""
+        - condition: {condition:scalar}
+          message: {message:scalar}
+          shouldBe: true"""),
+        items=Template("""
+          - content: {content:scalar}
+            id: {id:scalar}
+            incorrectMessage: {incorrect_message:scalar}"""),
+    )
+    
+    def template_values(self, exercise: DragDropOrderExercise) -> dict[str, Any]:
+        return {
+            "title": exercise.title,
+            "context": exercise.context,
+            # Hints share one bullet, as one folded paragraph
+            "hint": f"- {' '.join(exercise.hints)}" if exercise.hints else "",
+            "instructions": f"- {exercise.instructions}",
+            # Each item must be in its correct index position
+            "checks": [
+                {"condition": f"check_index({item.id}) == solution", "message": item.incorrect_message}
+                for item in exercise.ordered_items
+            ],
+            "failure_message": exercise.failure_message,
+            "success_message": exercise.success_message,
+            "items": [
+                {"content": item.content, "id": item.id, "incorrect_message": item.incorrect_message}
+                for item in exercise.ordered_items
+            ],
+            # ID for the solution container, derived like the item ids so output is reproducible
+            "solution_id": _derived_id("solution", exercise.title, *(item.id for item in exercise.ordered_items)),
+            "sequence_title": exercise.sequence_title,
+        }
@@ -0,0 +1,60 @@
+"""
+Streaming JSON Lines writer for generated exercises.
+"""
+
+import sys
+import threading
+from typing import IO, Iterable, Optional
+from ..models.planning import GeneratedExercise
+
+
+class JsonlWriter:
+    """Writes one JSON object per exercise, per line, as results become available.
+
+    Each line is a GeneratedExercise: the exercise fields under ``"exercise"`` plus its type,
+    objective, difficulty and source video, so downstream tools can ingest the output
+    without parsing any markdown. Lines are flushed after every batch of writes, so a
+    consumer tailing the file sees each video's exercises as soon as they are written.
+
+    Example:
+        with JsonlWriter("exercises.jsonl") as writer:
+            writer.write_all(result.items)
+    """
+    
+    def __init__(self, path: Optional[str] = None, append: bool = False, stream: Optional[IO[str]] = None):
+        """
+        Args:
+            path: File to write; "-" or None writes to ``stream`` (stdout by default)
+            append: Add to an existing file instead of replacing it
+            stream: Text stream to use when no path is given
+        """
+        self.path = path if path != "-" else None
+        if self.path:
+            self._file = open(self.path, 'a' if append else 'w', encoding='utf-8')
+        else:
+            self._file = stream or sys.stdout
+        self._lock = threading.Lock()
+        self.count = 0
+    
+    def write(self, item: GeneratedExercise) -> None:
+        self.write_all([item])
+    
+    def write_all(self, items: Iterable[GeneratedExercise]) -> None:
+        """Write ``items`` as consecutive lines and flush them."""
+        lines = [item.model_dump_json() for item in items]
+        if not lines:
+            return
+        with self._lock:
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+            self.count += len(lines)
+    
+    def close(self) -> None:
+        if self.path:
+            self._file.close()
+    
+    def __enter__(self) -> "JsonlWriter":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
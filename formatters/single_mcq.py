@@ -3,25 +3,15 @@ Formatter for single-answer multiple choice exercises.
 """
 
 import random
-from .base import ExerciseFormatter
+from typing import Any
+from .base import TemplateFormatter
+from .templates import Template
 from ..models.exercises import SingleAnswerMCQExercise
 
 
-class SingleAnswerMCQFormatter(ExerciseFormatter):
-    def format_to_markdown(self, exercise: SingleAnswerMCQExercise) -> str:
-        """Convert a SingleAnswerMCQExercise object to the final markdown format."""
-        # Format hints
-        hints_formatted = "\n".join(f"- {hint}" for hint in exercise.hints)
-        
-        # Format answer and feedback blocks
-        answer_feedback_block = self._format_answer_feedback_blocks(
-            exercise.incorrect_answers, 
-            exercise.correct_answer, 
-            exercise.correct_feedback
-        )
-        
-        # Construct the full exercise markdown
-        return f"""## {exercise.title}
+class SingleAnswerMCQFormatter(TemplateFormatter):
+    # Markdown rather than YAML around the header, so the slots are inserted as-is
+    template = Template("""## {title}
 
 ```yaml
 type: PureMultipleChoiceExercise
@@ -30,40 +20,43 @@ kind: PureMultipleChoice
 xp: 50
 ```
 
-{exercise.context}
+{context}
+
+**{question}**
 
-**{exercise.question}**
+`@hint`{hints:each}
 
-`@hint`
-{hints_formatted}
+`@possible_answers`{answers:each}
 
-{answer_feedback_block}"""
+`@feedback`{feedbacks:each}""",
+        hints=Template("\n- {text}"),
+        answers=Template("\n- {text}"),
+        feedbacks=Template("\n- {text}"),
+    )
     
-    def _format_answer_feedback_blocks(self, incorrect_answers: dict[str, str], correct_answer: str, correct_feedback: str) -> str:
-        """Format the possible answers and feedback blocks for the exercise output."""
+    def template_values(self, exercise: SingleAnswerMCQExercise) -> dict[str, Any]:
+        """Fill the template, placing the correct answer at a random position among the incorrect ones."""
+        all_items = self._shuffle_answers(exercise.incorrect_answers, exercise.correct_answer, exercise.correct_feedback)
+        return {
+            "title": exercise.title,
+            "context": exercise.context,
+            "question": exercise.question,
+            "hints": [{"text": hint} for hint in exercise.hints],
+            # Brackets mark the correct answer
+            "answers": [{"text": f"[{answer}]" if answer == exercise.correct_answer else answer} for answer, _ in all_items],
+            "feedbacks": [{"text": feedback} for _, feedback in all_items],
+        }
+    
+    def _shuffle_answers(self, incorrect_answers: dict[str, str], correct_answer: str, correct_feedback: str) -> list[tuple[str, str]]:
+        """(answer, feedback) pairs with the correct answer inserted at a random index."""
         # Convert incorrect answers to list of tuples
         incorrect_items = list(incorrect_answers.items())
         
         # Pick a random index to insert the correct answer
         insert_index = random.randint(0, len(incorrect_items))
         
-        # Insert correct answer into the combined list
-        all_items = (
+        return (
             incorrect_items[:insert_index] +
             [(correct_answer, correct_feedback)] +
             incorrect_items[insert_index:]
         )
-        
-        # Format possible answers (with brackets around correct answer)
-        possible_answers = []
-        for answer, _ in all_items:
-            if answer == correct_answer:
-                possible_answers.append(f"- [{answer}]")
-            else:
-                possible_answers.append(f"- {answer}")
-        
-        # Format feedback messages
-        feedback_messages = [f"- {feedback}" for _, feedback in all_items]
-        
-        # Combine into final formatted string
-        return f"`@possible_answers`\n" + "\n".join(possible_answers) + f"\n\n`@feedback`\n" + "\n".join(feedback_messages)
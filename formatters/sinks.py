@@ -0,0 +1,299 @@
+"""
+Output sinks that stream formatted exercises to stdout, a single file or one shard per video.
+"""
+
+import gzip
+import json
+import os
+import sys
+import threading
+from abc import ABC, abstractmethod
+from typing import IO, Any, Optional, Sequence
+from ..models.planning import GeneratedExercise
+
+FORMATS = ("markdown", "jsonl")
+
+# Between exercises of one video in markdown output
+SEPARATOR = "\n---\n"
+
+
+class OutputSink(ABC):
+    """Destination for each video's exercises, written one exercise at a time.
+
+    ``format`` selects what is written per exercise: its markdown (separated by ``---``) or
+    its GeneratedExercise as one JSON line. Sinks are safe to share between the pipeline's
+    write workers. Used as a context manager, a sink is closed on success and aborted on
+    error, so a failed run never leaves a truncated output file behind.
+    """
+    
+    def __init__(self, format: str = "markdown", headers: bool = False):
+        """
+        Args:
+            format: "markdown" or "jsonl"
+            headers: Start each video's markdown with a ``# <video file>`` heading
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Unknown output format '{format}'; expected one of {', '.join(FORMATS)}")
+        self.format = format
+        self.headers = headers and format == "markdown"
+        self.count = 0
+        self._lock = threading.Lock()
+    
+    def write_video(self, video_file: str, exercises: Sequence[str], items: Sequence[GeneratedExercise] = ()) -> Optional[str]:
+        """Write one video's exercises, appending each to the output as it is encoded.
+
+        Args:
+            video_file: Source video the exercises belong to
+            exercises: Formatted markdown exercises (used by the markdown format)
+            items: The same exercises as typed objects (used by the jsonl format)
+
+        Returns:
+            The file the video was written to, if it already has its final name
+        """
+        with self._lock:
+            self._start_video(video_file)
+            if self.headers:
+                self._write(f"# {video_file}\n\n")
+            if self.format == "jsonl":
+                for item in items:
+                    self._write(item.model_dump_json() + "\n")
+                written = len(items)
+            else:
+                for index, exercise in enumerate(exercises):
+                    self._write(SEPARATOR + exercise if index else exercise)
+                written = len(exercises)
+            if self.headers:
+                self._write("\n\n")
+            self.count += written
+            return self._end_video(video_file, written)
+    
+    @abstractmethod
+    def _start_video(self, video_file: str) -> None:
+        pass
+    
+    @abstractmethod
+    def _write(self, text: str) -> None:
+        pass
+    
+    @abstractmethod
+    def _end_video(self, video_file: str, exercises: int) -> Optional[str]:
+        pass
+    
+    def close(self) -> None:
+        """Finish the output: give files their final names and write the index."""
+        pass
+    
+    def abort(self) -> None:
+        """Discard anything not yet closed."""
+        self.close()
+    
+    def __enter__(self) -> "OutputSink":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class StreamSink(OutputSink):
+    """Writes to a text stream (stdout by default) as exercises arrive."""
+    
+    def __init__(self, stream: Optional[IO[str]] = None, format: str = "markdown", headers: bool = False):
+        super().__init__(format, headers)
+        self.stream = stream or sys.stdout
+    
+    def _start_video(self, video_file: str) -> None:
+        pass
+    
+    def _write(self, text: str) -> None:
+        self.stream.write(text)
+    
+    def _end_video(self, video_file: str, exercises: int) -> Optional[str]:
+        if self.format == "markdown" and not self.headers:
+            self.stream.write("\n")
+        self.stream.flush()
+        return None
+
+
+class _IndexedSink(OutputSink):
+    """Base for file sinks that record where each video's exercises are in the output.
+
+    The index is JSON next to the output: for each video, the file (relative to the index),
+    the byte offset and length of its exercises, and how many there are. With ``compress``,
+    each video is its own gzip member, so its range can be decompressed without reading the
+    rest of the file. read_indexed() reads one video back through an index.
+    """
+    
+    def __init__(self, index_path: str, format: str, headers: bool, compress: bool):
+        super().__init__(format, headers)
+        self.index_path = index_path
+        self.compress = compress
+        self._entries: list[dict[str, Any]] = []
+        self._file: Optional[IO[bytes]] = None
+        self._member: Optional[gzip.GzipFile] = None
+        self._offset = 0
+    
+    def _begin_range(self, file: IO[bytes]) -> None:
+        self._file = file
+        self._offset = file.tell()
+        if self.compress:
+            self._member = gzip.GzipFile(filename="", fileobj=file, mode='wb')
+    
+    def _write(self, text: str) -> None:
+        (self._member or self._file).write(text.encode('utf-8'))
+    
+    def _end_range(self, video_file: str, path: str, exercises: int) -> None:
+        if self._member is not None:
+            # Closing the member writes its trailer but leaves the underlying file open
+            self._member.close()
+            self._member = None
+        self._file.flush()
+        self._entries.append({
+            "video_file": video_file,
+            "path": os.path.relpath(path, os.path.dirname(os.path.abspath(self.index_path))),
+            "offset": self._offset,
+            "length": self._file.tell() - self._offset,
+            "exercises": exercises
+        })
+    
+    def _write_index(self) -> None:
+        data = {
+            "format": self.format,
+            "compression": "gzip" if self.compress else None,
+            "videos": self._entries
+        }
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, indent=2)
+        os.replace(temp_path, self.index_path)
+
+
+class FileSink(_IndexedSink):
+    """Writes every video to one file, appended as exercises arrive.
+
+    Output goes to ``<path>.tmp`` and is renamed to ``path`` on close, so readers only ever see
+    a complete file; the index is written to ``<path>.index.json`` at the same time.
+    """
+    
+    def __init__(self, path: str, format: str = "markdown", headers: bool = False, compress: bool = False):
+        """
+        Args:
+            path: Output file; ".gz" is added when compressing if it isn't there already
+            format: "markdown" or "jsonl"
+            headers: Start each video's markdown with a ``# <video file>`` heading
+            compress: Gzip the output, one gzip member per video
+        """
+        if compress and not path.endswith(".gz"):
+            path += ".gz"
+        super().__init__(f"{path}.index.json", format, headers, compress)
+        self.path = path
+        self.temp_path = f"{path}.tmp"
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._out = open(self.temp_path, 'wb')
+    
+    def _start_video(self, video_file: str) -> None:
+        self._begin_range(self._out)
+    
+    def _end_video(self, video_file: str, exercises: int) -> Optional[str]:
+        self._end_range(video_file, self.path, exercises)
+        return None
+    
+    def close(self) -> None:
+        with self._lock:
+            if self._out.closed:
+                return
+            self._out.close()
+            os.replace(self.temp_path, self.path)
+            self._write_index()
+    
+    def abort(self) -> None:
+        with self._lock:
+            if self._out.closed:
+                return
+            self._out.close()
+            os.remove(self.temp_path)
+
+
+class ShardedSink(_IndexedSink):
+    """Writes each video to its own file in ``directory``, named after the video.
+
+    Each shard is written to a temporary file and renamed when its video is complete, so it
+    appears as soon as that video is done. ``index.json`` in the directory lists every shard.
+    """
+    
+    def __init__(self, directory: str, format: str = "markdown", compress: bool = False):
+        """
+        Args:
+            directory: Output directory, created if missing
+            format: "markdown" or "jsonl"
+            compress: Gzip each shard
+        """
+        super().__init__(os.path.join(directory, "index.json"), format, False, compress)
+        self.directory = directory
+        self.extension = (".md" if format == "markdown" else ".jsonl") + (".gz" if compress else "")
+        os.makedirs(directory, exist_ok=True)
+        self._used_names: set[str] = set()
+        self._path: Optional[str] = None
+    
+    def _shard_path(self, video_file: str) -> str:
+        name = os.path.splitext(os.path.basename(video_file))[0]
+        unique = name
+        suffix = 1
+        while unique in self._used_names:
+            suffix += 1
+            unique = f"{name}_{suffix}"
+        self._used_names.add(unique)
+        return os.path.join(self.directory, unique + self.extension)
+    
+    def _start_video(self, video_file: str) -> None:
+        self._path = self._shard_path(video_file)
+        self._begin_range(open(f"{self._path}.tmp", 'wb'))
+    
+    def _end_video(self, video_file: str, exercises: int) -> Optional[str]:
+        self._end_range(video_file, self._path, exercises)
+        self._file.close()
+        os.replace(f"{self._path}.tmp", self._path)
+        return self._path
+    
+    def close(self) -> None:
+        with self._lock:
+            self._write_index()
+    
+    def abort(self) -> None:
+        # Finished shards are complete files, so they are indexed even when the run fails
+        self.close()
+
+
+def open_output_sink(path: Optional[str] = None, directory: Optional[str] = None, format: str = "markdown",
+                     compress: bool = False, headers: bool = False) -> OutputSink:
+    """Sink for a run's output: shards in ``directory``, else a single file at ``path``, else stdout ("-" or None)."""
+    if directory:
+        return ShardedSink(directory, format=format, compress=compress)
+    if path and path != "-":
+        return FileSink(path, format=format, headers=headers, compress=compress)
+    if compress:
+        raise ValueError("Compressed output needs an output file or directory")
+    return StreamSink(format=format, headers=headers)
+
+
+def read_indexed(index_path: str, video_file: str) -> str:
+    """Read one video's exercises from a FileSink or ShardedSink output using its index.
+
+    Only that video's byte range is read (and decompressed).
+    """
+    with open(index_path, encoding='utf-8') as file:
+        index = json.load(file)
+    entry = next((entry for entry in index["videos"] if entry["video_file"] == video_file), None)
+    if entry is None:
+        raise KeyError(f"Video '{video_file}' is not in {index_path}")
+    path = os.path.join(os.path.dirname(os.path.abspath(index_path)), entry["path"])
+    with open(path, 'rb') as file:
+        file.seek(entry["offset"])
+        data = file.read(entry["length"])
+    if index["compression"] == "gzip":
+        data = gzip.decompress(data)
+    return data.decode('utf-8')
@@ -0,0 +1,220 @@
+"""
+Compiled output templates with YAML-aware escaping, shared by the formatters.
+"""
+
+import json
+import re
+import time
+from io import StringIO
+from string import Formatter
+from typing import Any, Callable, Optional, TextIO
+
+# Characters YAML allows unescaped, minus the ones PyYAML (YAML 1.1) treats as line breaks
+_UNSAFE_CHAR = re.compile(r"[^\t\n\x20-\x7e\xa0-\u2027\u202a-\ud7ff\ue000-\ufefe\uff00-\ufffd\U00010000-\U0010ffff]")
+
+# Plain scalars YAML 1.1 would resolve to something other than a string: nulls, booleans,
+# numbers (loosely, including sexagesimal and signed hex/binary), merge and value keys, and
+# timestamps as PyYAML's resolver matches them (a date, optionally with a time and zone)
+_IMPLICIT = re.compile(r"""^(?:
+    ~|null|Null|NULL|
+    y|Y|yes|Yes|YES|n|N|no|No|NO|true|True|TRUE|false|False|FALSE|on|On|ON|off|Off|OFF|
+    [-+]?(?:\.\d|\d)[\d_.:,eE+-]*|[-+]?\.(?:inf|Inf|INF)|\.(?:nan|NaN|NAN)|
+    [-+]?0[box]?[\d_a-fA-F]+|<<|=|
+    [0-9]{4}-[0-9]{1,2}-[0-9]{1,2}
+    (?:(?:[Tt]|[ \t]+)[0-9]{1,2}:[0-9]{2}:[0-9]{2}(?:\.[0-9]*)?(?:[ \t]*(?:Z|[-+][0-9]{1,2}(?::[0-9]{2})?))?)?
+)$""", re.X)
+
+_LINE_BREAKS = re.compile(r"\n+")
+
+
+def _escape_char(match: re.Match) -> str:
+    code = ord(match.group())
+    return f"\\u{code:04x}" if code <= 0xFFFF else f"\\U{code:08x}"
+
+
+def _double_quoted(text: str) -> str:
+    """``text`` as a YAML double-quoted scalar.
+
+    JSON string syntax is valid YAML, but json.dumps' ASCII mode writes characters outside the
+    BMP as surrogate pairs, which PyYAML reads back as two characters. So only what YAML can't
+    hold raw is escaped, with YAML's own ``\\u``/``\\U`` escapes.
+    """
+    return _UNSAFE_CHAR.sub(_escape_char, json.dumps(text, ensure_ascii=False))
+
+
+def yaml_scalar(value: Any) -> str:
+    """``value`` as a single-line YAML scalar: plain when that reads back unchanged, double-quoted otherwise."""
+    text = str(value)
+    if (
+        not text
+        or text != text.strip()
+        or text[0] in "-?:,[]{}#&*!|>'\"%@`"
+        or ": " in text or " #" in text or text.endswith(":")
+        or "\n" in text or "\t" in text
+        or _UNSAFE_CHAR.search(text)
+        or _IMPLICIT.match(text)
+    ):
+        return _double_quoted(text)
+    return text
+
+
+def yaml_block(value: Any, indent: int) -> str:
+    """``value`` as a folded block scalar (``>-``) indented by ``indent`` spaces.
+
+    Folding turns a lone line break into a space and keeps one newline per blank line after it,
+    so each run of n newlines in the text is written with n blank lines. Text a folded block
+    can't hold exactly (edge whitespace, indented lines, control characters) is double-quoted.
+    """
+    text = str(value)
+    lines = text.split("\n")
+    if (
+        not text.strip()
+        or text != text.strip()
+        or _UNSAFE_CHAR.search(text)
+        or any(line != line.strip() for line in lines)
+    ):
+        return _double_quoted(text)
+    padding = " " * indent
+    if len(lines) == 1:
+        return ">-\n" + padding + text
+    return ">-\n" + _LINE_BREAKS.sub("\\g<0>\n", "\n".join(padding + line if line else "" for line in lines))
+
+
+def _raw(value: Any) -> str:
+    return str(value)
+
+
+class Template:
+    """A text template compiled once into literal chunks and value slots.
+
+    Slots use ``str.format`` field syntax with a filter name as the format spec:
+
+    - ``{title}`` or ``{title:raw}`` inserts the value as-is (markdown outside the YAML block)
+    - ``{answer:scalar}`` inserts a YAML scalar (see yaml_scalar)
+    - ``{context:block}`` inserts a folded block scalar, indented relative to the slot's line
+    - ``{items:each}`` renders the sub-template named ``items`` once per dict in the value
+
+    Rendering writes straight into a text stream, so a whole batch of exercises (and every
+    repeated item inside them) goes into one buffer without building intermediate strings.
+    """
+    
+    def __init__(self, source: str, **children: "Template"):
+        """
+        Args:
+            source: Template text
+            children: Sub-templates for ``each`` slots, by slot name
+        """
+        self.source = source
+        self.children = children
+        self._parts: list[tuple[str, Optional[str], Optional[Callable[[Any], str]], Optional["Template"]]] = []
+        line_start = ""
+        for literal, field, spec, conversion in Formatter().parse(source):
+            line_start = literal.rpartition("\n")[2] if "\n" in literal else line_start + literal
+            if field is None:
+                self._parts.append((literal, None, None, None))
+                continue
+            if conversion or not field.isidentifier():
+                raise ValueError(f"Unsupported template field '{{{field}}}'; use {{name}} or {{name:filter}}")
+            child = None
+            if spec == "each":
+                if field not in children:
+                    raise ValueError(f"Template slot '{field}:each' has no sub-template")
+                render = None
+                child = children[field]
+            elif spec == "block":
+                # Block content goes one level deeper than the key on the slot's line
+                indent = len(re.match(r"[ -]*", line_start).group()) + 2
+                render = lambda value, indent=indent: yaml_block(value, indent)
+            elif spec == "scalar":
+                render = yaml_scalar
+            elif spec in ("", "raw"):
+                render = _raw
+            else:
+                raise ValueError(f"Unknown template filter '{spec}' for field '{field}'")
+            self._parts.append((literal, field, render, child))
+            # A slot's output never contains the start of the next literal's line
+            line_start += "x"
+    
+    def render_into(self, out: TextIO, values: dict[str, Any]) -> None:
+        """Write the template filled with ``values`` to ``out``."""
+        write = out.write
+        for literal, field, render, child in self._parts:
+            if literal:
+                write(literal)
+            if field is None:
+                continue
+            if child is None:
+                write(render(values[field]))
+            else:
+                for item in values[field]:
+                    child.render_into(out, item)
+    
+    def render(self, values: dict[str, Any]) -> str:
+        out = StringIO()
+        self.render_into(out, values)
+        return out.getvalue()
+
+
+def benchmark(count: int = 1000, repeat: int = 5) -> str:
+    """Time rendering ``count`` exercises of each type, one at a time and as a batch into one buffer.
+
+    The exercises' text has colons, quotes, "#" and line breaks, so the escaping filters do
+    real work.
+
+    Returns:
+        One line per exercise type with both timings, in exercises per second and MB/s
+    """
+    from ..models.exercises import (
+        Answer, DraggableItem, DragDropClassifyExercise, DragDropOrderExercise, DropZone,
+        MultipleAnswerMCQExercise, OrderableItem, SingleAnswerMCQExercise
+    )
+    from .drag_drop_classify import DragDropClassifyFormatter
+    from .drag_drop_order import DragDropOrderFormatter
+    from .multiple_mcq import MultipleAnswerMCQFormatter
+    from .single_mcq import SingleAnswerMCQFormatter
+    
+    context = 'A retail team asks: "why did Q3 sales drop?" #analytics\n\nYou have the sales table in `df`.'
+    feedback = "Not quite: this ignores outliers.\nLook at the median instead."
+    samples = [
+        (SingleAnswerMCQFormatter(), SingleAnswerMCQExercise(
+            title="Robust summaries", context=context, question="Which statistic resists outliers?",
+            hints=["Think about sorting the values."], incorrect_answers={"Mean": feedback, "Range: max - min": feedback},
+            correct_answer="Median", correct_feedback="Right: it only depends on the middle values."
+        )),
+        (MultipleAnswerMCQFormatter(), MultipleAnswerMCQExercise(
+            title="Robust summaries", context=context, question="Which statistics resist outliers?",
+            hints=["Think about sorting the values."], success_message="Well done!\n\nOn to modelling.",
+            answers=[Answer(answer=text, correct=correct, feedback=feedback)
+                     for text, correct in (("Median", True), ("IQR: Q3 - Q1", True), ("Mean", False), ("- Range", False))]
+        )),
+        (DragDropClassifyFormatter(), DragDropClassifyExercise(
+            title="Robust or not", context=context, instructions="Drag each statistic to its group.",
+            hints=["Outliers move some of these a lot."], success_message="Well done!",
+            drop_zones=[DropZone(id=f"dropzone_{zone}", title=title, draggable_items=[
+                DraggableItem(id=f"item_{zone}{index}", content=f"{title}: #{index}", incorrect_message=feedback) for index in range(3)
+            ]) for zone, title in enumerate(("Robust", "Sensitive"))]
+        )),
+        (DragDropOrderFormatter(), DragDropOrderExercise(
+            title="Cleaning steps", context=context, instructions="Put the steps in order.",
+            hints=["Start with the raw data."], sequence_title="Steps: first to last", success_message="Well done!",
+            ordered_items=[OrderableItem(id=f"step_{index}", content=f"Step {index}: \"clean\" #{index}", incorrect_message=feedback) for index in range(4)]
+        )),
+    ]
+    
+    lines = [f"Rendering {count} exercises per type, best of {repeat}:"]
+    for formatter, exercise in samples:
+        exercises = [exercise] * count
+        single = batch = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            "\n---\n".join(formatter.format_to_markdown(item) for item in exercises)
+            single = min(single, time.perf_counter() - started)
+            started = time.perf_counter()
+            rendered = formatter.format_batch(exercises)
+            batch = min(batch, time.perf_counter() - started)
+        megabytes = len(rendered.encode("utf-8")) / 1e6
+        lines.append(
+            f"  {type(exercise).__name__}: one at a time {count / single:,.0f} exercises/s, "
+            f"batch {count / batch:,.0f} exercises/s ({megabytes / batch:.1f} MB/s)"
+        )
+    return "\n".join(lines)
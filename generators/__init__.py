@@ -4,12 +4,17 @@ DataCamp Exercise Generator - Generators Package
 This package contains exercise generators for different exercise types.
 """
 
-from .base import ExerciseGenerator
-from .single_mcq import SingleAnswerMCQGenerator
-from .multiple_mcq import MultipleAnswerMCQGenerator
-from .drag_drop_classify import DragDropClassifyGenerator
-from .drag_drop_order import DragDropOrderGenerator
-from .factory import get_exercise_generator
+from importlib import import_module
+
+# Public name -> defining submodule; generators are only imported when asked for
+_LAZY_IMPORTS = {
+    "ExerciseGenerator": ".base",
+    "SingleAnswerMCQGenerator": ".single_mcq",
+    "MultipleAnswerMCQGenerator": ".multiple_mcq",
+    "DragDropClassifyGenerator": ".drag_drop_classify",
+    "DragDropOrderGenerator": ".drag_drop_order",
+    "get_exercise_generator": ".factory"
+}
 
 __all__ = [
     "ExerciseGenerator",
@@ -19,3 +24,17 @@ __all__ = [
     "DragDropOrderGenerator",
     "get_exercise_generator"
 ]
+
+
+def __getattr__(name: str):
+    """Import public names on first access, so importing the package stays cheap."""
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
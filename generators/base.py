@@ -2,140 +2,94 @@
 Base exercise generator abstract class.
 """
 
-import os
+import asyncio
 import json
-import re
-import time
 from abc import ABC, abstractmethod
-from openai import OpenAI
-from ..models.exercises import Exercise
+from openai import APITimeoutError
+from pydantic import TypeAdapter
+from ..models.exercises import Exercise, ExerciseResponse
+from ..core.aio import run_sync
+from ..core.deadline import Deadline, DeadlineExceeded
+from ..core.exercise_bank import ExerciseBank, minhash_signature
+from ..core.json_response import decode_json_response, extract_json_text, response_adapter, validate_json_response
+from ..core.routing import ModelRouter, resolve_temperature
+from ..core.config import Config
+from ..core.tokens import PromptBudgetExceeded, PromptTokenReport, fit_content_to_budget, get_token_estimator
+from ..core.profiling import profiled
+from ..core.tracing import span, traced
+from .example_selector import get_example_selector
+from .factory import get_formatter_class
+from .quality import QualityIssue, check_exercise
+
+# Prompt components that go in the cacheable system message, in order
+STATIC_PROMPT_SECTIONS = ("instructions", "schema", "examples")
 
 
 class ExerciseGenerator(ABC):
-    def __init__(self, model: str = "gpt-4o", temperature: float = 0, max_retries: int = 3) -> None:
-        self.client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
-        self.model = model
+    """Base class for exercise generators.
+    
+    The I/O methods are async-native (``agenerate_exercises`` and friends); the methods without
+    the ``a`` prefix are blocking wrappers around them for synchronous callers.
+    """
+    
+    # Exercise type identifier (e.g. "single_mcq"), also used as the routing stage name
+    exercise_type_key: str = ""
+    # Model of the exercises in this type's {"exercises": [...]} responses
+    exercise_model: type[Exercise] | None = None
+    
+    def __init__(self, model: str = "gpt-4o", temperature: float = 0, max_retries: int = 3, router: ModelRouter | None = None,
+                 example_token_budget: int | None = Config.EXAMPLE_TOKEN_BUDGET, max_prompt_tokens: int | None = Config.MAX_PROMPT_TOKENS,
+                 candidates: int = Config.CANDIDATES, exercise_bank: ExerciseBank | None = None) -> None:
+        self.router = router or ModelRouter(default_model=model)
+        self.model = self.router.primary_model(self.exercise_type_key)
+        # Model that served the latest generation request, which differs from self.model after a fallback
+        self.last_model: str | None = None
         self.max_retries = max_retries
+        # None includes every example for the type, as a fixed prompt section
+        self.example_selector = get_example_selector(example_token_budget)
+        self.max_prompt_tokens = max_prompt_tokens
+        if candidates < 1:
+            raise ValueError(f"candidates must be at least 1, got {candidates}")
+        # Completions sampled per request; the best valid one is kept
+        self.candidates = candidates
+        # Previously generated exercises; near-duplicates of them are regenerated instead of returned
+        self.exercise_bank = exercise_bank
         
-        # GPT-5 models only support temperature=1
-        if model.startswith("gpt-5"):
-            self.temperature = 1.0
-            if temperature != 0:  # Only warn if user explicitly set a different temperature
-                print(f"Warning: {model} only supports temperature=1. Adjusting from {temperature} to 1.0")
-        else:
-            self.temperature = temperature
+        # Warn about unsupported temperatures up front; the router adapts each call per model
+        resolve_temperature(self.model, temperature, default=0)
+        self.temperature = temperature
     
     @abstractmethod
     def get_exercise_type(self) -> str:
         pass
     
-    @abstractmethod
-    def get_examples_section(self) -> str:
-        pass
+    def get_examples_section(self, query: str | None = None) -> str:
+        """Format the examples most relevant to ``query`` for inclusion in prompts."""
+        return self.example_selector.format_section(self.exercise_type_key, query)
     
     @abstractmethod
     def get_json_schema(self) -> str:
         pass
     
-    @abstractmethod
+    def response_adapter(self) -> TypeAdapter:
+        """Cached validator for a whole {"exercises": [...]} response of this type."""
+        return response_adapter(ExerciseResponse[self.exercise_model])
+    
     def parse_exercises(self, parsed_json: dict) -> list[Exercise]:
-        pass
+        """Validate a decoded response into ``exercise_model`` objects.
+
+        Override for types whose exercises need more than validation; otherwise responses are
+        validated straight from their JSON text (see parse_response_content).
+        """
+        return self.response_adapter().validate_python(parsed_json).exercises
     
     def clean_json_response(self, content: str) -> str:
-        """Enhanced JSON cleaning to handle various model quirks."""
-        content = content.strip()
-        
-        # Remove wrapping markdown code blocks more carefully
-        # Only remove if they wrap the entire content, not internal code blocks
-        
-        # Check for opening markdown block at start
-        opening_patterns = [
-            r"^```json\s*\n",
-            r"^```\s*\n", 
-            r"^```json\s*",
-            r"^```\s*"
-        ]
-        
-        for pattern in opening_patterns:
-            if re.match(pattern, content, re.MULTILINE):
-                content = re.sub(pattern, "", content, count=1, flags=re.MULTILINE)
-                break
-        
-        # Check for closing markdown block at end
-        if content.endswith('\n```'):
-            content = content[:-4]
-        elif content.endswith('```'):
-            content = content[:-3]
-        
-        content = content.strip()
-        
-        # Remove common prefixes models add (only at the very start)
-        prefixes = ["Here's the JSON:", "The JSON response is:", "Response:", "JSON:"]
-        for prefix in prefixes:
-            if content.startswith(prefix):
-                content = content[len(prefix):].strip()
-                break
-        
-        # More robust JSON boundary detection
-        json_content = self._extract_main_json_object(content)
-        return json_content.strip() if json_content else content.strip()
-    
-    def _extract_main_json_object(self, content: str) -> str:
-        """Extract the main JSON object using bracket counting for proper nesting."""
-        # Find the first opening brace
-        start_pos = content.find('{')
-        if start_pos == -1:
-            return content  # No JSON found, return as-is
-        
-        # Count braces to find the matching closing brace
-        brace_count = 0
-        in_string = False
-        escape_next = False
-        
-        for i, char in enumerate(content[start_pos:], start_pos):
-            if escape_next:
-                escape_next = False
-                continue
-                
-            if char == '\\':
-                escape_next = True
-                continue
-                
-            if char == '"' and not escape_next:
-                in_string = not in_string
-                continue
-                
-            if not in_string:
-                if char == '{':
-                    brace_count += 1
-                elif char == '}':
-                    brace_count -= 1
-                    if brace_count == 0:
-                        # Found the matching closing brace
-                        return content[start_pos:i + 1]
-        
-        # If we get here, braces weren't balanced - return from start to end
-        return content[start_pos:]
-    
-    def generate_single_attempt(self, video_content: str, learning_objectives: list[str] | None = None) -> list[Exercise]:
-        """Generate exercises in a single attempt (no retries)."""
-        # Format objectives section
-        if learning_objectives:
-            objectives_list = "\n".join(f"- {obj}" for obj in learning_objectives)
-            objectives_section = f"""Learning Objectives for this video:
-{objectives_list}
-
-IMPORTANT: Create exactly {len(learning_objectives)} exercise(s), with each exercise targeting one specific learning objective from the list above."""
-            count_instruction = f"Create exactly {len(learning_objectives)} exercise(s), one for each learning objective."
-        else:
-            objectives_section = ""
-            count_instruction = "Create 2-4 exercises covering different key concepts from the video."
-        
-        json_prompt = f"""You are an expert curriculum designer for DataCamp. Based on the provided video transcript, create {self.get_exercise_type()} exercises that test key concepts from the video.
-
-{objectives_section}
-
-{count_instruction}
+        """The JSON object in a response, without code fences or prose around it (see extract_json_text)."""
+        return extract_json_text(content)
+    
+    def get_instructions_section(self) -> str:
+        """Role and authoring guidelines; identical for every call of this exercise type."""
+        return f"""You are an expert curriculum designer for DataCamp. Based on the provided video transcript, create {self.get_exercise_type()} exercises that test key concepts from the video.
 
 Each exercise should:
 1. Have a clear, engaging title
@@ -148,55 +102,367 @@ Each exercise should:
 
 IMPORTANT: Do not reuse the same examples, company names, scenarios, or specific use cases from the video content. Create fresh, original examples that apply the same concepts in new contexts.
 
-{self.get_examples_section()}
-
-Video Content:
-{video_content}
+Create exercises with rich, engaging contexts similar to the examples below. Use NEW scenarios, different company names, alternative use cases, and fresh code examples where appropriate to make the exercises test conceptual understanding rather than recall."""
 
-Create exercises with rich, engaging contexts similar to the examples above. Use NEW scenarios, different company names, alternative use cases, and fresh code examples where appropriate to make the exercises test conceptual understanding rather than recall.
+    def get_objectives_section(self, learning_objectives: list[str] | None = None, avoid: list[Exercise] | None = None) -> str:
+        """Per-call objectives and exercise count instructions."""
+        if avoid:
+            existing = "\n".join(f"- {exercise.title}: {getattr(exercise, 'question', exercise.context)}" for exercise in avoid)
+            avoid_section = f"""These exercises already exist. Create exercises that are clearly different from them, with a different scenario, question and answers:
+{existing}"""
+            return f"{avoid_section}\n\n{self.get_objectives_section(learning_objectives)}"
+        
+        if learning_objectives:
+            objectives_list = "\n".join(f"- {obj}" for obj in learning_objectives)
+            objectives_section = f"""Learning Objectives for this video:
+{objectives_list}
 
-{self.get_json_schema()}"""
+IMPORTANT: Create exactly {len(learning_objectives)} exercise(s), with each exercise targeting one specific learning objective from the list above."""
+            count_instruction = f"Create exactly {len(learning_objectives)} exercise(s), one for each learning objective."
+            return f"{objectives_section}\n\n{count_instruction}\n\nRespond with ONLY valid JSON in the format described above."
+        
+        return "Create 2-4 exercises covering different key concepts from the video.\n\nRespond with ONLY valid JSON in the format described above."
+    
+    def build_prompt_sections(self, video_content: str, learning_objectives: list[str] | None = None, avoid: list[Exercise] | None = None) -> list[tuple[str, str]]:
+        """Build the generation prompt as ordered (component, text) pairs.
+        
+        The order puts the longest stable prefix first so provider-side prompt caching can
+        reuse it: the instructions and schema never change for a type, the examples are
+        selected from the video content and so are shared by every call for that video,
+        then the video itself, and only then the per-call objectives.
+        """
+        return [
+            ("instructions", self.get_instructions_section()),
+            ("schema", self.get_json_schema()),
+            ("examples", self.get_examples_section(video_content)),
+            ("video_content", f"Video Content:\n{video_content}"),
+            ("objectives", self.get_objectives_section(learning_objectives, avoid)),
+        ]
+    
+    def build_budgeted_prompt_sections(self, video_content: str, learning_objectives: list[str] | None = None, avoid: list[Exercise] | None = None) -> list[tuple[str, str]]:
+        """Build prompt sections, pruning video content if the prompt would exceed max_prompt_tokens.
         
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": json_prompt}],
-            temperature=self.temperature
+        The estimated size of each component is recorded on the router for reporting.
+        """
+        estimator = get_token_estimator(self.model)
+        sections, counts, pruned = fit_content_to_budget(
+            lambda content: self.build_prompt_sections(content, learning_objectives, avoid),
+            video_content, self.max_prompt_tokens, estimator
         )
+        if pruned:
+            print(f"Warning: video content pruned to fit the {self.max_prompt_tokens}-token prompt budget for {self.get_exercise_type()}")
+        self.router.record_prompt_report(PromptTokenReport(
+            stage=self.exercise_type_key, method=estimator.method, sections=counts, pruned=pruned
+        ))
+        return sections
+    
+    def build_messages(self, sections: list[tuple[str, str]]) -> list[dict[str, str]]:
+        """Split prompt sections into a static system message and a per-video user message."""
+        static = "\n\n".join(text for name, text in sections if name in STATIC_PROMPT_SECTIONS)
+        dynamic = "\n\n".join(text for name, text in sections if name not in STATIC_PROMPT_SECTIONS)
+        return [
+            {"role": "system", "content": static},
+            {"role": "user", "content": dynamic},
+        ]
+    
+    def parse_response_content(self, raw_content: str | None) -> list[Exercise]:
+        """Clean, decode and validate one completion's content.
+        
+        Raises:
+            ValueError: If the completion has no content (a refusal) or it isn't valid
+        """
+        if raw_content is None:
+            raise ValueError("The model returned no content (a refusal or a cut-off response)")
+        with span("parse_exercises", exercise_type=self.exercise_type_key, chars=len(raw_content)) as active:
+            if type(self).parse_exercises is ExerciseGenerator.parse_exercises:
+                # Decode and validate the whole response in one pydantic-core call
+                with profiled("validate"):
+                    exercises = validate_json_response(raw_content, self.response_adapter()).exercises
+            else:
+                # Locate and decode the JSON object, ignoring code fences and prose around it
+                with profiled("decode"):
+                    parsed = decode_json_response(raw_content)
+                
+                # Validate with Pydantic
+                with profiled("validate"):
+                    exercises = self.parse_exercises(parsed)
+            active.set(exercises=len(exercises))
+            return exercises
+    
+    @staticmethod
+    def length_balance(texts: list[str]) -> float:
+        """1.0 when all texts have equal length, lower as lengths diverge (1 - coefficient of variation)."""
+        lengths = [len(text) for text in texts]
+        if len(lengths) < 2:
+            return 1.0
+        mean = sum(lengths) / len(lengths)
+        if not mean:
+            return 1.0
+        variance = sum((length - mean) ** 2 for length in lengths) / len(lengths)
+        return 1.0 - variance ** 0.5 / mean
+    
+    def score_exercise(self, exercise: Exercise) -> float:
+        """Local quality score for one exercise; higher is better. Override per exercise type."""
+        return 0.0
+    
+    def score_candidate(self, exercises: list[Exercise], learning_objectives: list[str] | None = None) -> float:
+        """Score a whole candidate response, penalising a wrong number of exercises and failed quality rules."""
+        score = sum(self.score_exercise(exercise) - 5.0 * len(check_exercise(exercise)) for exercise in exercises) / max(len(exercises), 1)
+        if learning_objectives and len(exercises) != len(learning_objectives):
+            score -= 10.0 * abs(len(exercises) - len(learning_objectives))
+        return score
+    
+    def generate_single_attempt(self, video_content: str, learning_objectives: list[str] | None = None, deadline: Deadline | None = None,
+                                avoid: list[Exercise] | None = None) -> list[Exercise]:
+        """Blocking version of agenerate_single_attempt."""
+        return run_sync(self.agenerate_single_attempt(video_content, learning_objectives, deadline, avoid))
+    
+    async def agenerate_single_attempt(self, video_content: str, learning_objectives: list[str] | None = None, deadline: Deadline | None = None,
+                                       avoid: list[Exercise] | None = None) -> list[Exercise]:
+        """Generate exercises in a single attempt (no retries).
+        
+        With ``candidates > 1`` several completions are sampled in the same request; each is
+        validated locally and the best-scoring valid one is returned, so one bad sample no
+        longer costs a full retry round-trip.
+        """
+        sections = self.build_budgeted_prompt_sections(video_content, learning_objectives, avoid)
+        
+        request_kwargs = {}
+        temperature = self.temperature
+        if self.candidates > 1:
+            request_kwargs["n"] = self.candidates
+            # Identical samples are useless; make sure candidates actually differ
+            temperature = max(temperature, Config.CANDIDATE_TEMPERATURE)
+        
+        response = await self.router.acreate_completion(
+            self.exercise_type_key,
+            messages=self.build_messages(sections),
+            temperature=temperature,
+            deadline=deadline,
+            **request_kwargs
+        )
+        self.last_model = getattr(response, "model", None) or self.model
+        
+        if len(response.choices) == 1:
+            return self.parse_response_content(response.choices[0].message.content)
+        
+        best: list[Exercise] | None = None
+        best_score = float("-inf")
+        last_error: Exception | None = None
+        for choice in response.choices:
+            try:
+                exercises = self.parse_response_content(choice.message.content)
+            except (json.JSONDecodeError, KeyError, ValueError) as e:
+                last_error = e
+                continue
+            score = self.score_candidate(exercises, learning_objectives)
+            if score > best_score:
+                best, best_score = exercises, score
+        
+        if best is None:
+            raise last_error or ValueError("completion returned no choices")
+        return best
+    
+    def generate_exercises(self, video_content: str, learning_objectives: list[str] | None = None, deadline: Deadline | None = None) -> list[Exercise]:
+        """Blocking version of agenerate_exercises."""
+        return run_sync(self.agenerate_exercises(video_content, learning_objectives, deadline))
+    
+    async def agenerate_exercises(self, video_content: str, learning_objectives: list[str] | None = None, deadline: Deadline | None = None) -> list[Exercise]:
+        """Generate exercises that pass the quality gate and don't duplicate the exercise bank.
+        
+        Exercises breaking a quality rule are repaired first (see apply_quality_gate). Each one is
+        then checked against ``exercise_bank`` (if set). Only the near-duplicates are regenerated,
+        with their own objectives and the exercises to steer away from, for up to
+        Config.DUPLICATE_REGENERATIONS rounds; any still duplicated after that are dropped with a
+        warning rather than returned. Accepted exercises are added to the bank.
+        """
+        exercises = await self.agenerate_exercises_with_retries(video_content, learning_objectives, deadline)
+        exercises = await self.aapply_quality_gate(exercises, video_content, deadline)
+        if self.exercise_bank is None:
+            return exercises
+        
+        # Objectives line up with exercises only when the model produced one per objective
+        objectives = learning_objectives if learning_objectives and len(learning_objectives) == len(exercises) else None
+        slots: list[Exercise | None] = list(exercises)
+        unchecked = list(range(len(slots)))
         
-        # Enhanced JSON cleaning
-        content = self.clean_json_response(response.choices[0].message.content)
+        for round_number in range(Config.DUPLICATE_REGENERATIONS + 1):
+            duplicates: list[int] = []
+            matched: list[str] = []
+            for index in unchecked:
+                exercise = slots[index]
+                if exercise is None:
+                    continue
+                signature = minhash_signature(exercise.fingerprint_text())
+                match = self.exercise_bank.find_duplicate(exercise, self.exercise_type_key, signature)
+                if match is None:
+                    # Accepted; later exercises (including siblings in this response) are checked against it
+                    self.exercise_bank.add(exercise, self.exercise_type_key, signature)
+                else:
+                    duplicates.append(index)
+                    matched.append(f"'{exercise.title}' ~ '{match.title}' ({match.similarity:.0%})")
+            
+            if not duplicates:
+                break
+            if round_number == Config.DUPLICATE_REGENERATIONS:
+                print(f"Warning: dropping {len(duplicates)} {self.get_exercise_type()} exercise(s) that duplicate the exercise bank: {', '.join(matched)}")
+                for index in duplicates:
+                    slots[index] = None
+                break
+            
+            print(f"Regenerating {len(duplicates)} {self.get_exercise_type()} exercise(s) that duplicate the exercise bank: {', '.join(matched)}")
+            avoid = [slots[index] for index in duplicates]
+            retry_objectives = [objectives[index] for index in duplicates] if objectives else None
+            try:
+                replacements = await self.agenerate_exercises_with_retries(video_content, retry_objectives, deadline, avoid=avoid)
+                replacements = await self.aapply_quality_gate(replacements, video_content, deadline)
+            except DeadlineExceeded as e:
+                print(f"Warning: {e}; dropping the duplicated exercise(s)")
+                for index in duplicates:
+                    slots[index] = None
+                break
+            for index, replacement in zip(duplicates, replacements):
+                slots[index] = replacement
+            # Fewer replacements than requested: the unreplaced duplicates are dropped
+            for index in duplicates[len(replacements):]:
+                slots[index] = None
+            unchecked = duplicates
+        
+        return [exercise for exercise in slots if exercise is not None]
+    
+    def apply_quality_gate(self, exercises: list[Exercise], video_content: str, deadline: Deadline | None = None) -> list[Exercise]:
+        """Blocking version of aapply_quality_gate."""
+        return run_sync(self.aapply_quality_gate(exercises, video_content, deadline))
+    
+    async def aapply_quality_gate(self, exercises: list[Exercise], video_content: str, deadline: Deadline | None = None) -> list[Exercise]:
+        """Check every exercise against the quality rules and repair the ones that fail.
+        
+        Each failing exercise gets one targeted repair call listing its problems; the repairs run
+        concurrently. If a repair fails or still breaks a rule, the better of the two versions is
+        kept and a warning names the remaining problems so they are not discovered only after the run.
+        """
+        async def check(exercise: Exercise) -> Exercise:
+            issues = check_exercise(exercise)
+            if issues:
+                exercise, issues = await self.arepair_exercise(exercise, issues, video_content, deadline)
+            if issues:
+                problems = "; ".join(issue.message for issue in issues)
+                print(f"Warning: {self.get_exercise_type()} exercise '{exercise.title}' still fails quality checks: {problems}")
+            return exercise
+        
+        return list(await asyncio.gather(*(check(exercise) for exercise in exercises)))
+    
+    def repair_exercise(self, exercise: Exercise, issues: list[QualityIssue], video_content: str,
+                        deadline: Deadline | None = None) -> tuple[Exercise, list[QualityIssue]]:
+        """Blocking version of arepair_exercise."""
+        return run_sync(self.arepair_exercise(exercise, issues, video_content, deadline))
+    
+    @traced("repair")
+    async def arepair_exercise(self, exercise: Exercise, issues: list[QualityIssue], video_content: str,
+                               deadline: Deadline | None = None) -> tuple[Exercise, list[QualityIssue]]:
+        """Ask the model to fix the listed problems in one exercise; return the result and its remaining issues."""
+        deadline = deadline or Deadline()
+        problems = "\n".join(f"- {issue.message}" for issue in issues)
+        print(f"Repairing {self.get_exercise_type()} exercise '{exercise.title}': {'; '.join(issue.message for issue in issues)}")
+        request = f"""This exercise breaks the rules above:
+{problems}
+
+Fix only these problems and keep everything else the same. Return it as the only exercise in the "exercises" list.
+
+Exercise:
+{exercise.model_dump_json(indent=2)}
+
+Respond with ONLY valid JSON in the format described above."""
+        # Same static system message as generation, so the repair call reuses its cached prefix
+        sections = [(name, text) for name, text in self.build_prompt_sections(video_content) if name in STATIC_PROMPT_SECTIONS]
+        try:
+            response = await self.router.acreate_completion(
+                self.exercise_type_key,
+                messages=self.build_messages(sections + [("repair", request)]),
+                temperature=self.temperature,
+                deadline=deadline
+            )
+            repaired = self.parse_response_content(response.choices[0].message.content)
+        except (json.JSONDecodeError, KeyError, ValueError, APITimeoutError, DeadlineExceeded) as e:
+            print(f"Warning: repair of '{exercise.title}' failed: {e}")
+            return exercise, issues
         
-        # Parse JSON and validate with Pydantic
-        parsed = json.loads(content)
-        return self.parse_exercises(parsed)
+        if not repaired:
+            return exercise, issues
+        repaired_issues = check_exercise(repaired[0])
+        if len(repaired_issues) > len(issues):
+            return exercise, issues
+        return repaired[0], repaired_issues
+    
+    def generate_exercises_with_retries(self, video_content: str, learning_objectives: list[str] | None = None, deadline: Deadline | None = None,
+                                        avoid: list[Exercise] | None = None) -> list[Exercise]:
+        """Blocking version of agenerate_exercises_with_retries."""
+        return run_sync(self.agenerate_exercises_with_retries(video_content, learning_objectives, deadline, avoid))
     
-    def generate_exercises(self, video_content: str, learning_objectives: list[str] | None = None) -> list[Exercise]:
-        """Generate exercises with automatic retry on JSON parsing failures."""
+    async def agenerate_exercises_with_retries(self, video_content: str, learning_objectives: list[str] | None = None, deadline: Deadline | None = None,
+                                               avoid: list[Exercise] | None = None) -> list[Exercise]:
+        """Generate exercises with automatic retry on JSON parsing failures.
+        
+        When a deadline is given, every attempt but the last is capped at half of the
+        remaining time so a hung request still leaves room to retry, and backoff sleeps
+        are skipped if they would run past it. DeadlineExceeded is raised once the
+        budget is spent.
+        """
+        deadline = deadline or Deadline()
         last_exception: Exception | None = None
         
         for attempt in range(self.max_retries):
+            deadline.check(f"{self.get_exercise_type()} generation attempt {attempt + 1}")
+            attempt_deadline = deadline.share(2) if attempt < self.max_retries - 1 else deadline
             try:
-                return self.generate_single_attempt(video_content, learning_objectives)
-                
-            except (json.JSONDecodeError, KeyError, ValueError) as e:
+                with span("attempt", exercise_type=self.exercise_type_key, attempt=attempt + 1, regeneration=bool(avoid)):
+                    return await self.agenerate_single_attempt(video_content, learning_objectives, deadline=attempt_deadline, avoid=avoid)
+            
+            except PromptBudgetExceeded as e:
+                # The prompt comes out the same on every attempt, so retrying can't help
+                raise Exception(f"Failed to generate {self.get_exercise_type()} exercises: {e}") from e
+            except (json.JSONDecodeError, KeyError, ValueError, APITimeoutError) as e:
+                if isinstance(e, APITimeoutError) and not deadline.is_bounded:
+                    # Without a run deadline a timeout is the client's own limit; don't mask it
+                    raise
                 last_exception = e
                 if attempt < self.max_retries - 1:
+                    backoff = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
+                    if not deadline.allows(backoff):
+                        raise DeadlineExceeded(
+                            f"Run deadline leaves no time to retry {self.get_exercise_type()} generation. "
+                            f"Last error: {e}"
+                        ) from e
                     # Log the failure and retry
                     print(f"Generation failed on attempt {attempt + 1}/{self.max_retries} for {self.get_exercise_type()}: {str(e)}")
                     print("Retrying with exponential backoff...")
-                    time.sleep(2 ** attempt)  # Exponential backoff: 1s, 2s, 4s
+                    await asyncio.sleep(backoff)
                     continue
                 else:
                     # Final attempt failed, raise detailed error
                     break
         
+        if isinstance(last_exception, APITimeoutError):
+            raise DeadlineExceeded(
+                f"Run deadline exceeded while generating {self.get_exercise_type()} exercises"
+            ) from last_exception
+        
         # All attempts failed
         raise Exception(
             f"Failed to generate valid {self.get_exercise_type()} exercises after {self.max_retries} attempts. "
             f"Last error: {last_exception}"
         ) from last_exception
     
-    @abstractmethod
-    def generate_markdown_exercises(self, video_content: str, learning_objectives: list[str] | None = None) -> list[str]:
-        """Generate exercises and format them as markdown strings."""
-        pass
+    def generate_markdown_exercises(self, video_content: str, learning_objectives: list[str] | None = None, deadline: Deadline | None = None) -> list[str]:
+        """Blocking version of agenerate_markdown_exercises."""
+        return run_sync(self.agenerate_markdown_exercises(video_content, learning_objectives, deadline))
+    
+    async def agenerate_markdown_exercises(self, video_content: str, learning_objectives: list[str] | None = None, deadline: Deadline | None = None) -> list[str]:
+        """Generate exercises and format them as markdown strings with the type's registered formatter."""
+        exercises = await self.agenerate_exercises(video_content, learning_objectives, deadline=deadline)
+        formatter = get_formatter_class(self.exercise_type_key)()
+        formatted = []
+        for exercise in exercises:
+            with span("format_to_markdown", exercise_type=self.exercise_type_key), profiled("format"):
+                formatted.append(formatter.format_to_markdown(exercise))
+        return formatted
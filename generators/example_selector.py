@@ -0,0 +1,121 @@
+"""
+Token-budgeted selection of few-shot examples for generation prompts.
+"""
+
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Optional
+from ..models.examples import EXERCISE_EXAMPLES
+from ..core.tokens import estimate_tokens
+
+
+# Heading and quoting for each example component, in the order they appear in prompts
+EXAMPLE_COMPONENTS: dict[str, tuple[str, bool]] = {
+    "titles": ("Example Titles:", True),
+    "contexts": ("Example Contexts (create rich, scenario-based contexts like these):", False),
+    "questions": ("Example Questions:", True),
+    "instructions": ("Example Instructions:", True),
+    "hints": ("Example Hints:", True),
+}
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do for from has have how i in is it its of on or that the their "
+    "this to was what when which who why will with you your".split()
+)
+
+
+def _term_counts(text: str) -> Counter:
+    return Counter(w for w in _WORD_PATTERN.findall(text.lower()) if w not in _STOPWORDS and len(w) > 1)
+
+
+def _cosine(a: Counter, b: Counter) -> float:
+    if not a or not b:
+        return 0.0
+    if len(a) > len(b):
+        a, b = b, a
+    dot = sum(count * b[term] for term, count in a.items() if term in b)
+    if not dot:
+        return 0.0
+    norm_a = math.sqrt(sum(c * c for c in a.values()))
+    norm_b = math.sqrt(sum(c * c for c in b.values()))
+    return dot / (norm_a * norm_b)
+
+
+class ExampleSelector:
+    """Picks the examples most relevant to a query that fit within a token budget.
+
+    Each example component (titles, contexts, questions/instructions, hints) keeps at least
+    its most relevant item so the model still sees every kind of guidance; remaining budget
+    goes to the next most relevant items across all components. Formatted sections are cached
+    per selection, so repeated calls that pick the same examples reuse the same string.
+    """
+    
+    def __init__(self, token_budget: Optional[int] = None, examples: dict = EXERCISE_EXAMPLES):
+        self.token_budget = token_budget
+        self.examples = examples
+        self._section_cache: dict[tuple, str] = {}
+        self._item_cache: dict[str, list[tuple[str, int, str, int, Counter]]] = {}
+    
+    def _items(self, exercise_type: str) -> list[tuple[str, int, str, int, Counter]]:
+        """(component, index, formatted line, tokens, term counts) for every example of a type."""
+        if exercise_type not in self._item_cache:
+            items = []
+            # Plugin exercise types may come without curated examples
+            for component, values in self.examples.get(exercise_type, {}).items():
+                _, quoted = EXAMPLE_COMPONENTS[component]
+                for index, value in enumerate(values):
+                    line = f'- "{value}"' if quoted else f"- {value}"
+                    items.append((component, index, line, estimate_tokens(line), _term_counts(value)))
+            self._item_cache[exercise_type] = items
+        return self._item_cache[exercise_type]
+    
+    def select(self, exercise_type: str, query: Optional[str] = None) -> tuple[tuple[str, tuple[int, ...]], ...]:
+        """Choose examples for a type, returning the selected indices per component."""
+        items = self._items(exercise_type)
+        if self.token_budget is None:
+            chosen = {(component, index) for component, index, *_ in items}
+        else:
+            query_terms = _term_counts(query or "")
+            # Most relevant first; ties prefer shorter examples, then the curated order
+            ranked = sorted(items, key=lambda item: (-_cosine(query_terms, item[4]), item[3]))
+            chosen: set[tuple[str, int]] = set()
+            used = 0
+            seen_components: set[str] = set()
+            # The best item of every component first, then fill the budget with the rest
+            for item in ranked:
+                if item[0] not in seen_components:
+                    seen_components.add(item[0])
+                    chosen.add((item[0], item[1]))
+                    used += item[3]
+            for component, index, _, tokens, _ in ranked:
+                if (component, index) not in chosen and used + tokens <= self.token_budget:
+                    chosen.add((component, index))
+                    used += tokens
+        
+        return tuple(
+            (component, tuple(i for i in range(len(values)) if (component, i) in chosen))
+            for component, values in self.examples.get(exercise_type, {}).items()
+        )
+    
+    def format_section(self, exercise_type: str, query: Optional[str] = None) -> str:
+        """Format the selected examples for inclusion in a prompt."""
+        selection = self.select(exercise_type, query)
+        cache_key = (exercise_type, selection)
+        if cache_key not in self._section_cache:
+            lines = {(component, index): line for component, index, line, *_ in self._items(exercise_type)}
+            blocks = []
+            for component, indices in selection:
+                if indices:
+                    heading, _ = EXAMPLE_COMPONENTS[component]
+                    blocks.append(heading + "\n" + "\n".join(lines[(component, i)] for i in indices))
+            self._section_cache[cache_key] = "EXAMPLES OF GOOD EXERCISE COMPONENTS:\n\n" + "\n\n".join(blocks) if blocks else ""
+        return self._section_cache[cache_key]
+
+
+@lru_cache(maxsize=None)
+def get_example_selector(token_budget: Optional[int] = None) -> ExampleSelector:
+    """Shared selector per budget, so the term and section caches are reused across generators."""
+    return ExampleSelector(token_budget=token_budget)
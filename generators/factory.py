@@ -1,25 +1,25 @@
 """
-Factory function for creating exercise generators.
+Factory functions for creating exercise generators and formatters.
 """
 
-from typing import Any
-from .base import ExerciseGenerator
-from .single_mcq import SingleAnswerMCQGenerator
-from .multiple_mcq import MultipleAnswerMCQGenerator
-from .drag_drop_classify import DragDropClassifyGenerator
-from .drag_drop_order import DragDropOrderGenerator
+from typing import TYPE_CHECKING, Any
+from ..core.exercise_types import get_exercise_type_spec, load_class
 
+if TYPE_CHECKING:
+    from ..formatters.base import ExerciseFormatter
+    from .base import ExerciseGenerator
 
-def get_exercise_generator(exercise_type: str = "single_mcq", **kwargs: Any) -> ExerciseGenerator:
+
+def get_generator_class(exercise_type: str) -> "type[ExerciseGenerator]":
+    """Resolve the generator class for a registered exercise type, importing its module on first use."""
+    return load_class(get_exercise_type_spec(exercise_type).generator)
+
+
+def get_formatter_class(exercise_type: str) -> "type[ExerciseFormatter]":
+    """Resolve the formatter class paired with a registered exercise type."""
+    return load_class(get_exercise_type_spec(exercise_type).formatter)
+
+
+def get_exercise_generator(exercise_type: str = "single_mcq", **kwargs: Any) -> "ExerciseGenerator":
     """Factory function to get the appropriate exercise generator."""
-    generators: dict[str, type[ExerciseGenerator]] = {
-        "single_mcq": SingleAnswerMCQGenerator,
-        "multiple_mcq": MultipleAnswerMCQGenerator,
-        "drag_drop_classify": DragDropClassifyGenerator,
-        "drag_drop_order": DragDropOrderGenerator,
-    }
-    
-    if exercise_type not in generators:
-        raise ValueError(f"Unknown exercise type: {exercise_type}. Available types: {list(generators.keys())}")
-    
-    return generators[exercise_type](**kwargs)
+    return get_generator_class(exercise_type)(**kwargs)
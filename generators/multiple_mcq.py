@@ -4,31 +4,15 @@ Generator for multiple-answer multiple choice exercises.
 
 from .base import ExerciseGenerator
 from ..models.exercises import MultipleAnswerMCQExercise
-from ..models.examples import EXERCISE_EXAMPLES
-from ..formatters.multiple_mcq import MultipleAnswerMCQFormatter
 
 
 class MultipleAnswerMCQGenerator(ExerciseGenerator):
+    exercise_type_key = "multiple_mcq"
+    exercise_model = MultipleAnswerMCQExercise
+    
     def get_exercise_type(self) -> str:
         return "multiple-answer multiple choice"
     
-    def get_examples_section(self) -> str:
-        """Format multiple-answer MCQ examples for inclusion in prompts."""
-        examples = EXERCISE_EXAMPLES["multiple_mcq"]
-        return f"""EXAMPLES OF GOOD EXERCISE COMPONENTS:
-
-Example Titles:
-{chr(10).join(f'- "{title}"' for title in examples["titles"])}
-
-Example Contexts (create rich, scenario-based contexts like these):
-{chr(10).join(f'- {context}' for context in examples["contexts"])}
-
-Example Questions:
-{chr(10).join(f'- "{question}"' for question in examples["questions"])}
-
-Example Hints:
-{chr(10).join(f'- "{hint}"' for hint in examples["hints"])}"""
-    
     def get_json_schema(self) -> str:
         return """Respond with ONLY valid JSON in this exact format (no markdown, no extra text).
 IMPORTANT: Include 3-5 answer options total. At least 2 should be correct, and at least 1 should be incorrect:
@@ -61,16 +45,16 @@ IMPORTANT: Include 3-5 answer options total. At least 2 should be correct, and a
     }
   ]
 }"""
-    
-    def parse_exercises(self, parsed_json: dict) -> list[MultipleAnswerMCQExercise]:
-        """Parse JSON response into MultipleAnswerMCQExercise objects."""
-        exercises = []
-        for exercise_data in parsed_json["exercises"]:
-            exercises.append(MultipleAnswerMCQExercise(**exercise_data))
-        return exercises
-    
-    def generate_markdown_exercises(self, video_content: str, learning_objectives: list[str] = None) -> list[str]:
-        """Generate exercises and format them as markdown strings."""
-        exercises = self.generate_exercises(video_content, learning_objectives)
-        formatter = MultipleAnswerMCQFormatter()
-        return [formatter.format_to_markdown(exercise) for exercise in exercises]
+
+    def score_exercise(self, exercise: MultipleAnswerMCQExercise) -> float:
+        """Prefer 3-5 balanced-length options with at least 2 correct and 1 incorrect."""
+        answers = [answer.answer for answer in exercise.answers]
+        correct = [answer.correct for answer in exercise.answers]
+        score = self.length_balance(answers)
+        if not 3 <= len(answers) <= 5:
+            score -= 1.0
+        if sum(correct) < 2:
+            score -= 2.0
+        if all(correct):
+            score -= 2.0
+        return score
@@ -0,0 +1,147 @@
+"""
+Local quality gate: structural rules checked on every generated exercise before it is output.
+"""
+
+from functools import lru_cache
+from typing import Callable, Optional
+from pydantic import BaseModel, Field
+from ..models.exercises import (
+    Exercise, SingleAnswerMCQExercise, MultipleAnswerMCQExercise,
+    DragDropClassifyExercise, DragDropOrderExercise
+)
+
+# A rule returns a description of the problem, or None if the exercise passes
+QualityCheck = Callable[[Exercise], Optional[str]]
+
+# Rules registered per exercise model; rules for a base class also apply to its subclasses
+QUALITY_RULES: dict[type[Exercise], list[tuple[str, QualityCheck]]] = {}
+
+
+class QualityIssue(BaseModel):
+    """A structural problem found in a generated exercise."""
+    rule: str = Field(description="Name of the rule that failed")
+    message: str = Field(description="What is wrong, phrased so the model can fix it")
+
+
+def quality_rule(exercise_class: type[Exercise], name: str) -> Callable[[QualityCheck], QualityCheck]:
+    """Register a quality rule for ``exercise_class`` (and its subclasses).
+
+    Example:
+        @quality_rule(SingleAnswerMCQExercise, "question_mark")
+        def _question_mark(exercise):
+            return None if exercise.question.rstrip().endswith("?") else "question should end with '?'"
+    """
+    def register(check: QualityCheck) -> QualityCheck:
+        QUALITY_RULES.setdefault(exercise_class, []).append((name, check))
+        _rules_for.cache_clear()
+        return check
+    return register
+
+
+@lru_cache(maxsize=None)
+def _rules_for(exercise_class: type) -> tuple[tuple[str, QualityCheck], ...]:
+    """All rules that apply to ``exercise_class``, resolved once per class."""
+    return tuple(rule for cls in reversed(exercise_class.__mro__) for rule in QUALITY_RULES.get(cls, ()))
+
+
+def check_exercise(exercise: Exercise) -> list[QualityIssue]:
+    """Run every applicable rule on ``exercise``; an empty list means it passed."""
+    issues = []
+    for name, check in _rules_for(type(exercise)):
+        message = check(exercise)
+        if message:
+            issues.append(QualityIssue(rule=name, message=message))
+    return issues
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split()).lower()
+
+
+def _duplicates(values: list[str]) -> list[str]:
+    seen, repeated = set(), []
+    for value in values:
+        if value in seen and value not in repeated:
+            repeated.append(value)
+        seen.add(value)
+    return repeated
+
+
+@quality_rule(Exercise, "non_empty_text")
+def _non_empty_text(exercise: Exercise) -> Optional[str]:
+    if not exercise.title.strip() or not exercise.context.strip():
+        return "title and context must not be empty"
+    return None
+
+
+@quality_rule(SingleAnswerMCQExercise, "correct_not_in_incorrect")
+def _correct_not_in_incorrect(exercise: SingleAnswerMCQExercise) -> Optional[str]:
+    correct = _normalize(exercise.correct_answer)
+    if any(_normalize(answer) == correct for answer in exercise.incorrect_answers):
+        return f"correct_answer '{exercise.correct_answer}' also appears in incorrect_answers"
+    return None
+
+
+@quality_rule(SingleAnswerMCQExercise, "enough_distractors")
+def _enough_distractors(exercise: SingleAnswerMCQExercise) -> Optional[str]:
+    if len(exercise.incorrect_answers) < 2:
+        return f"needs 2-3 incorrect_answers, has {len(exercise.incorrect_answers)}"
+    return None
+
+
+@quality_rule(MultipleAnswerMCQExercise, "has_correct_and_incorrect")
+def _has_correct_and_incorrect(exercise: MultipleAnswerMCQExercise) -> Optional[str]:
+    correct = sum(1 for answer in exercise.answers if answer.correct)
+    if correct == 0:
+        return "no answer is marked \"correct\": true"
+    if correct == len(exercise.answers):
+        return "every answer is marked correct; include at least one incorrect answer"
+    return None
+
+
+@quality_rule(MultipleAnswerMCQExercise, "unique_answers")
+def _unique_answers(exercise: MultipleAnswerMCQExercise) -> Optional[str]:
+    texts = [_normalize(answer.answer) for answer in exercise.answers]
+    if "" in texts:
+        return "every answer needs non-empty \"answer\" text"
+    repeated = _duplicates(texts)
+    if repeated:
+        return f"answers repeated: {repeated}"
+    return None
+
+
+@quality_rule(DragDropClassifyExercise, "zones_and_items")
+def _zones_and_items(exercise: DragDropClassifyExercise) -> Optional[str]:
+    items = sum(len(zone.draggable_items) for zone in exercise.drop_zones)
+    if len(exercise.drop_zones) < 2:
+        return f"needs 2-3 drop_zones, has {len(exercise.drop_zones)}"
+    if items < 4:
+        return f"needs 4-6 draggable items in total, has {items}"
+    empty = [zone.title for zone in exercise.drop_zones if not zone.draggable_items]
+    if empty:
+        return f"drop zones without items: {empty}"
+    return None
+
+
+@quality_rule(DragDropClassifyExercise, "unique_ids")
+def _classify_unique_ids(exercise: DragDropClassifyExercise) -> Optional[str]:
+    ids = [zone.id for zone in exercise.drop_zones] + [item.id for zone in exercise.drop_zones for item in zone.draggable_items]
+    repeated = _duplicates(ids)
+    if repeated:
+        return f"duplicate ids: {repeated}"
+    return None
+
+
+@quality_rule(DragDropOrderExercise, "enough_items")
+def _enough_items(exercise: DragDropOrderExercise) -> Optional[str]:
+    if len(exercise.ordered_items) < 3:
+        return f"needs at least 3 ordered_items, has {len(exercise.ordered_items)}"
+    return None
+
+
+@quality_rule(DragDropOrderExercise, "unique_ids")
+def _order_unique_ids(exercise: DragDropOrderExercise) -> Optional[str]:
+    repeated = _duplicates([item.id for item in exercise.ordered_items])
+    if repeated:
+        return f"duplicate ids: {repeated}"
+    return None
@@ -4,31 +4,15 @@ Generator for single-answer multiple choice exercises.
 
 from .base import ExerciseGenerator
 from ..models.exercises import SingleAnswerMCQExercise
-from ..models.examples import EXERCISE_EXAMPLES
-from ..formatters.single_mcq import SingleAnswerMCQFormatter
 
 
 class SingleAnswerMCQGenerator(ExerciseGenerator):
+    exercise_type_key = "single_mcq"
+    exercise_model = SingleAnswerMCQExercise
+    
     def get_exercise_type(self) -> str:
         return "single-answer multiple choice"
     
-    def get_examples_section(self) -> str:
-        """Format single-answer MCQ examples for inclusion in prompts."""
-        examples = EXERCISE_EXAMPLES["single_mcq"]
-        return f"""EXAMPLES OF GOOD EXERCISE COMPONENTS:
-
-Example Titles:
-{chr(10).join(f'- "{title}"' for title in examples["titles"])}
-
-Example Contexts (create rich, scenario-based contexts like these):
-{chr(10).join(f'- {context}' for context in examples["contexts"])}
-
-Example Questions:
-{chr(10).join(f'- "{question}"' for question in examples["questions"])}
-
-Example Hints:
-{chr(10).join(f'- "{hint}"' for hint in examples["hints"])}"""
-    
     def get_json_schema(self) -> str:
         return """Respond with ONLY valid JSON in this exact format (no markdown, no extra text). 
 IMPORTANT: Vary the number of incorrect answers - some exercises should have 2 incorrect answers (3 total options), others should have 3 incorrect answers (4 total options):
@@ -50,16 +34,16 @@ IMPORTANT: Vary the number of incorrect answers - some exercises should have 2 i
     }
   ]
 }"""
-    
-    def parse_exercises(self, parsed_json: dict) -> list[SingleAnswerMCQExercise]:
-        """Parse JSON response into SingleAnswerMCQExercise objects."""
-        exercises = []
-        for exercise_data in parsed_json["exercises"]:
-            exercises.append(SingleAnswerMCQExercise(**exercise_data))
-        return exercises
-    
-    def generate_markdown_exercises(self, video_content: str, learning_objectives: list[str] = None) -> list[str]:
-        """Generate exercises and format them as markdown strings."""
-        exercises = self.generate_exercises(video_content, learning_objectives)
-        formatter = SingleAnswerMCQFormatter()
-        return [formatter.format_to_markdown(exercise) for exercise in exercises]
+
+    def score_exercise(self, exercise: SingleAnswerMCQExercise) -> float:
+        """Prefer 2-3 distractors of similar length to the correct answer, never including it."""
+        options = list(exercise.incorrect_answers) + [exercise.correct_answer]
+        score = self.length_balance(options)
+        if exercise.correct_answer in exercise.incorrect_answers:
+            score -= 5.0
+        if len(exercise.incorrect_answers) not in (2, 3):
+            score -= 1.0
+        # A correct answer much longer than every distractor gives itself away
+        if exercise.incorrect_answers and len(exercise.correct_answer) > 1.5 * max(len(a) for a in exercise.incorrect_answers):
+            score -= 0.5
+        return score
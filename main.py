@@ -4,11 +4,33 @@ DataCamp Exercise Generator - CLI and Examples
 This provides both a CLI and example functions for easy notebook usage.
 """
 
+from __future__ import annotations
+
 import argparse
-from .core import LearningDesigner, load_video_content
+import os
+import sys
+import time
+from typing import TYPE_CHECKING
+from .core.config import Config
+from .core.deadline import Deadline
+from .core.exercise_types import exercise_type_keys
+
+# openai and pydantic take most of the startup time, so everything that imports them is imported
+# inside the functions below; the CLI parses (and rejects) arguments before loading any of it
+if TYPE_CHECKING:
+    from .core.cassette import Cassette
+    from .core.profiling import StageProfiler
+    from .core.tracing import Tracer
+    from .core.designer import LearningDesigner
+    from .core.pipeline import VideoResult
 
 
-def generate_exercises_intelligent(video_file: str, objectives: list[str] = None, exercise_types: list[str] = None, model: str = "gpt-4o") -> list[str]:
+def generate_exercises_intelligent(video_file: str, objectives: list[str] = None, exercise_types: list[str] = None, model: str = "gpt-4o", timeout: float = Config.RUN_TIMEOUT, routes: dict[str, list[str]] = None, show_usage: bool = False, candidates: int = Config.CANDIDATES,
+                                   execution_strategy: str = Config.EXECUTION_STRATEGY, concurrency: int = Config.MAX_CONCURRENCY,
+                                   exercise_bank: str = Config.EXERCISE_BANK_PATH, jsonl: str = None,
+                                   output: str = None, output_format: str = "markdown", compress: bool = False,
+                                   exercise_index: str = Config.EXERCISE_INDEX_PATH,
+                                   record: str = None, replay: str = None, replay_latency: float = 0.0) -> list[str]:
     """
     Generate exercises using intelligent design.
     
@@ -19,16 +41,220 @@ def generate_exercises_intelligent(video_file: str, objectives: list[str] = None
         objectives: Optional learning objectives  
         exercise_types: Optional list of exercise types to use (e.g., ["single_mcq", "drag_drop_classify"])
                        If provided, exercises will be distributed across these types instead of auto-selected
-        model: OpenAI model to use
+        model: OpenAI model to use for any stage without a route
+        timeout: Optional time budget in seconds for the whole run. Exercises finished before it
+                 runs out are returned; the rest are reported as missing.
+        routes: Optional model fallback chains per stage, keyed by "planning" or an exercise type,
+                e.g. {"planning": ["gpt-4o-mini"], "drag_drop_classify": ["gpt-4o", "gpt-4o-mini"]}
+        show_usage: If True, prints API token usage per stage (including cached prompt tokens) when done
+        candidates: Completions sampled per generation request; the best valid one is kept
+        execution_strategy: "grouped" (one call per exercise type), "per_exercise" (one call per planned
+                            exercise) or "auto" (whichever is estimated to finish sooner)
+        concurrency: Maximum generation calls in flight at once
+        exercise_bank: Optional path of an exercise bank file. New exercises that nearly duplicate a
+                       banked one are regenerated; accepted exercises are added to the bank.
+        jsonl: Optional path to also write the exercises to as JSON Lines, one typed exercise with its
+               plan metadata per line ("-" for stdout)
+        output: Optional file to write the exercises to ("-" for stdout), replaced atomically when done
+        output_format: "markdown" or "jsonl" (one typed exercise per line) for ``output``
+        compress: Gzip ``output``
+        exercise_index: Optional SQLite search index the exercises are added to (see ExerciseIndex)
+        record: Optional cassette file to record every LLM request and response to (see Cassette)
+        replay: Optional cassette file to serve LLM responses from instead of calling the API
+        replay_latency: Fraction of the recorded response times to wait when replaying (0 = none, 1 = original)
         
     Returns:
         List of formatted exercise strings
     """
+    from .core.utils import load_video_content
+    
+    deadline = Deadline.from_timeout(timeout)
     video_content = load_video_content(video_file)
-    designer = LearningDesigner(model=model)
+    cassette = _open_cassette(record, replay, replay_latency)
+    designer = _build_designer(model, routes, candidates, execution_strategy, concurrency, exercise_bank, cassette)
+    router = designer.router
+    
+    try:
+        learning_plan = designer.create_learning_plan(video_content, objectives, exercise_types, deadline=deadline)
+        result = designer.execute_plan(video_content, learning_plan, deadline=deadline)
+    finally:
+        _close_cassette(cassette)
+    designer.missing_plans = result.missing_plans
+    exercises = result.exercises
+    if designer.exercise_bank is not None:
+        designer.exercise_bank.save()
+    
+    items = [item.model_copy(update={"source_video": video_file}) for item in result.items]
+    if jsonl:
+        from .formatters.jsonl import JsonlWriter
+        with JsonlWriter(jsonl) as writer:
+            writer.write_all(items)
+        if writer.path:
+            print(f"Structured exercises written to {writer.path}")
+    if output:
+        from .formatters.sinks import open_output_sink
+        with open_output_sink(output, format=output_format, compress=compress) as sink:
+            sink.write_video(video_file, exercises, items)
+        if getattr(sink, "path", None):
+            print(f"Exercises written to {sink.path}")
+    if exercise_index:
+        from .core.exercise_index import ExerciseIndex
+        with ExerciseIndex(exercise_index) as index:
+            added = index.add_all(items)
+        print(f"{added} new exercise(s) added to the index {exercise_index}")
+    
+    if show_usage:
+        print(router.usage_summary())
+    return exercises
+
+
+def generate_exercises_batch(video_files: list[str], objectives: list[str] = None, exercise_types: list[str] = None, model: str = "gpt-4o", timeout: float = Config.RUN_TIMEOUT,
+                             routes: dict[str, list[str]] = None, show_usage: bool = False, candidates: int = Config.CANDIDATES,
+                             execution_strategy: str = Config.EXECUTION_STRATEGY, concurrency: int = Config.MAX_CONCURRENCY,
+                             output_dir: str = None, video_concurrency: int = None, dedup: bool = Config.BATCH_DEDUP,
+                             exercise_bank: str = Config.EXERCISE_BANK_PATH, jsonl: str = None,
+                             output: str = None, output_format: str = "markdown", compress: bool = False,
+                             exercise_index: str = Config.EXERCISE_INDEX_PATH,
+                             record: str = None, replay: str = None, replay_latency: float = 0.0) -> list[VideoResult]:
+    """
+    Generate exercises for several videos with a pipeline that overlaps their stages.
+    
+    While one video's exercises are being generated the next video is planned and the one after
+    that extracted. Arguments match generate_exercises_intelligent, plus:
+    
+    Args:
+        video_files: Paths to video transcripts
+        output_dir: If given, each video's exercises are written to ``<output_dir>/<video name>.md``
+                    as soon as they are ready, with an ``index.json`` listing the files
+        output: Otherwise, a single file that every video's exercises are appended to as they are
+                ready; it is renamed into place when the run ends, next to a ``<output>.index.json``
+                giving each video's byte range. Without either, exercises are printed.
+        video_concurrency: Videos planned and generated at the same time (default: Config.PIPELINE_WORKERS)
+        dedup: If True, videos with identical content are processed once and slides repeated across
+               videos are left out of planning prompts; the savings are printed at the end
+        jsonl: Optional JSON Lines file that every video's typed exercises are appended to as soon as
+               the video is done
+        output_format: "markdown" or "jsonl" (one typed exercise per line) for the printed or written output
+        compress: Gzip the output files
+        exercise_index: Optional SQLite search index each video's exercises are added to when the
+                        video is done
+        record: Optional cassette file to record every LLM request and response to (see Cassette)
+        replay: Optional cassette file to serve LLM responses from instead of calling the API
+        replay_latency: Fraction of the recorded response times to wait when replaying (0 = none, 1 = original)
+        
+    Returns:
+        One VideoResult per video, in input order
+    """
+    from .core.dedup import BatchDeduplicator
+    from .core.pipeline import VideoPipeline
+    from .core.tokens import get_token_estimator
+    from .formatters.jsonl import JsonlWriter
+    from .formatters.sinks import open_output_sink
+    
+    cassette = _open_cassette(record, replay, replay_latency)
+    designer = _build_designer(model, routes, candidates, execution_strategy, concurrency, exercise_bank, cassette)
+    sink = open_output_sink(output, output_dir, format=output_format, compress=compress, headers=True)
+    writer = JsonlWriter(jsonl) if jsonl else None
+    index = None
+    if exercise_index:
+        from .core.exercise_index import ExerciseIndex
+        index = ExerciseIndex(exercise_index)
+    indexed = 0
     
-    learning_plan = designer.create_learning_plan(video_content, objectives, exercise_types)
-    return designer.execute_learning_plan(video_content, learning_plan)
+    def write(result: VideoResult) -> None:
+        if result.error:
+            print(f"Error processing '{result.video_file}': {result.error}")
+            return
+        nonlocal indexed
+        if writer is not None:
+            writer.write_all(result.items)
+        if index is not None:
+            indexed += index.add_all(result.items)
+        path = sink.write_video(result.video_file, result.exercises, result.items)
+        if path:
+            print(f"Exercises for '{result.video_file}' written to {path}")
+    
+    workers = {"plan": video_concurrency, "generate": video_concurrency} if video_concurrency else None
+    deduplicator = BatchDeduplicator(video_files, get_token_estimator(designer.model)) if dedup else None
+    pipeline = VideoPipeline(designer, write, objectives, exercise_types, workers=workers, deadline=Deadline.from_timeout(timeout), dedup=deduplicator)
+    try:
+        with sink:
+            results = pipeline.run(video_files)
+    finally:
+        if writer is not None:
+            writer.close()
+        if index is not None:
+            index.close()
+        _close_cassette(cassette)
+    if index is not None:
+        print(f"{indexed} new exercise(s) added to the index {exercise_index}")
+    if getattr(sink, "path", None):
+        print(f"Exercises written to {sink.path}")
+    if writer is not None and writer.path:
+        print(f"{writer.count} structured exercise(s) written to {writer.path}")
+    if designer.exercise_bank is not None:
+        designer.exercise_bank.save()
+    
+    if deduplicator is not None:
+        # One planning call plus the generation calls each processed video made
+        calls_per_video = {
+            result.index: 1 + len(designer.plan_generation_calls(result.learning_plan))
+            for result in results if result.learning_plan is not None and result.duplicate_of is None
+        }
+        print(deduplicator.report(calls_per_video).summary())
+    
+    if show_usage:
+        print(designer.router.usage_summary())
+    return results
+
+
+def _build_designer(model: str, routes: dict[str, list[str]], candidates: int, execution_strategy: str, concurrency: int, exercise_bank: str = None,
+                    cassette: Cassette = None) -> LearningDesigner:
+    from .core.designer import LearningDesigner
+    from .core.exercise_bank import ExerciseBank
+    from .core.routing import ModelRouter
+    
+    router = ModelRouter(default_model=model, routes=routes if routes is not None else Config.MODEL_ROUTES, cassette=cassette)
+    bank = ExerciseBank(exercise_bank) if exercise_bank else None
+    return LearningDesigner(router=router, candidates=candidates, execution_strategy=execution_strategy, max_concurrency=concurrency, exercise_bank=bank)
+
+
+def _open_cassette(record: str = None, replay: str = None, replay_latency: float = 0.0) -> Cassette | None:
+    if record and replay:
+        raise ValueError("Record to a cassette or replay one, not both")
+    if not (record or replay):
+        return None
+    from .core.cassette import Cassette
+    return Cassette.record(record) if record else Cassette.replay(replay, latency=replay_latency)
+
+
+def _close_cassette(cassette: Cassette | None) -> None:
+    if cassette is not None:
+        cassette.close()
+        print(cassette.summary())
+
+
+def _finish_trace(tracer: Tracer | None, path: str = None) -> None:
+    """Write the run's spans as Chrome trace JSON and print a per-stage summary."""
+    if tracer is None:
+        return
+    if path:
+        tracer.write_chrome_trace(path)
+        print(f"Trace written to {path}")
+    print(tracer.summary())
+
+
+def _finish_profile(profiler: StageProfiler | None, directory: str) -> None:
+    """Save the run's stage profiles and rewrite the hot-spot reports from every run saved in ``directory``."""
+    if profiler is None:
+        return
+    from .core.profiling import write_reports
+    
+    profiler.dump(directory)
+    reports = write_reports(directory)
+    print(profiler.summary())
+    if reports:
+        print(f"Hot-spot reports written to {', '.join(reports)}")
 
 
 def print_exercises(exercises: list[str]):
@@ -40,48 +266,292 @@ def print_exercises(exercises: list[str]):
 
 
 # CLI functionality
-def main():
+def extract_main(argv: list[str]):
+    """CLI for bulk content extraction (no LLM calls)."""
+    parser = argparse.ArgumentParser(
+        prog="datacamp_exercise_generator extract",
+        description="Extract meaningful content from a directory of video transcripts using a process pool"
+    )
+    parser.add_argument("in_dir", help="Directory of raw video transcript files")
+    parser.add_argument("out_dir", help="Directory to write extracted content to (same relative paths)")
+    parser.add_argument("--jobs", "-j", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--pattern", default="**/*.md", help="Glob selecting input files, relative to in_dir (default: **/*.md)")
+    parser.add_argument("--chunksize", type=int, help="Files handed to a worker at a time (optional)")
+    
+    args = parser.parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        parser.error(f"--jobs must be at least 1, got {args.jobs}")
+    if args.chunksize is not None and args.chunksize < 1:
+        parser.error(f"--chunksize must be at least 1, got {args.chunksize}")
+    
+    from .core.bulk_extract import extract_directory
+    
+    try:
+        stats = extract_directory(args.in_dir, args.out_dir, jobs=args.jobs, pattern=args.pattern, chunksize=args.chunksize)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        return
+    
+    for path, error in stats.errors.items():
+        print(f"Error extracting '{path}': {error}")
+    print(stats.summary())
+
+
+def search_main(argv: list[str]):
+    """CLI for searching an exercise index (no LLM calls)."""
+    parser = argparse.ArgumentParser(
+        prog="datacamp_exercise_generator search",
+        description="Search the exercises added to an exercise index by earlier runs"
+    )
+    parser.add_argument("index", help="Exercise index database (as passed to --exercise-index)")
+    parser.add_argument("query", nargs="+", help="Words the exercise must contain; end a word with * to match it as a prefix")
+    parser.add_argument("--type", choices=exercise_type_keys(), help="Only show exercises of this type (optional)")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum results (default: 20)")
+    parser.add_argument("--raw", action="store_true", help="Treat the query as FTS5 syntax (phrases, OR, NOT, column:term)")
+    parser.add_argument("--json", action="store_true", help="Print each match as a JSON line")
+    
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.index):
+        print(f"Error: Exercise index '{args.index}' not found.")
+        return
+    
+    from .core.exercise_index import ExerciseIndex
+    
+    with ExerciseIndex(args.index) as index:
+        start = time.perf_counter()
+        try:
+            hits = index.search(" ".join(args.query), exercise_type=args.type, limit=args.limit, raw=args.raw)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        elapsed = time.perf_counter() - start
+    
+    if args.json:
+        for hit in hits:
+            print(hit.model_dump_json())
+        return
+    for hit in hits:
+        print(f"[{hit.exercise_type}] {hit.title}  (#{hit.id}, score {hit.score:.1f})")
+        details = [part for part in (hit.learning_objective, hit.source_video, hit.model) if part]
+        if details:
+            print(f"    {' | '.join(details)}")
+        print(f"    {hit.snippet}")
+    print(f"{len(hits)} match(es) in {elapsed * 1000:.1f} ms")
+
+
+def benchmark_json_main(argv: list[str]):
+    """CLI for the JSON response decoding micro-benchmark (no LLM calls)."""
+    parser = argparse.ArgumentParser(
+        prog="datacamp_exercise_generator benchmark-json",
+        description="Time locating and decoding the JSON in model responses of several sizes"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 25, 50], metavar="KB",
+                       help="Response sizes in kilobytes (default: 10 25 50)")
+    parser.add_argument("--repeat", type=int, default=50, help="Runs per size (default: 50)")
+    
+    args = parser.parse_args(argv)
+    
+    from .core.json_response import benchmark
+    
+    print(benchmark(tuple(args.sizes), args.repeat))
+
+
+def benchmark_format_main(argv: list[str]):
+    """CLI for the exercise rendering throughput benchmark (no LLM calls)."""
+    parser = argparse.ArgumentParser(
+        prog="datacamp_exercise_generator benchmark-format",
+        description="Time rendering exercises of each type to markdown/YAML"
+    )
+    parser.add_argument("--count", type=int, default=1000, help="Exercises rendered per type and run (default: 1000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per type; the fastest is reported (default: 5)")
+    
+    args = parser.parse_args(argv)
+    if args.count < 1 or args.repeat < 1:
+        parser.error("--count and --repeat must be at least 1")
+    
+    from .formatters.templates import benchmark
+    
+    print(benchmark(args.count, args.repeat))
+
+
+def main(argv: list[str] = None):
     """Main CLI function."""
-    parser = argparse.ArgumentParser(description="Generate DataCamp exercises from video content")
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "extract":
+        return extract_main(argv[1:])
+    if argv and argv[0] == "search":
+        return search_main(argv[1:])
+    if argv and argv[0] == "benchmark-json":
+        return benchmark_json_main(argv[1:])
+    if argv and argv[0] == "benchmark-format":
+        return benchmark_format_main(argv[1:])
     
-    parser.add_argument("video_file", help="Path to the video transcript markdown file")
+    parser = argparse.ArgumentParser(
+        prog="datacamp_exercise_generator",
+        description="Generate DataCamp exercises from video content",
+        epilog="Use 'extract IN_DIR OUT_DIR' to bulk-extract transcript content without calling the LLM, "
+               "'search INDEX QUERY' to search an exercise index, 'benchmark-json' to time response decoding "
+               "and 'benchmark-format' to time exercise rendering."
+    )
+    
+    parser.add_argument("video_file", nargs="+",
+                       help="Path to the video transcript markdown file (several files are processed as a pipelined batch)")
     parser.add_argument("--objectives", nargs="+", help="Learning objectives (optional)")
     parser.add_argument("--exercise-types", nargs="+", 
-                       choices=["single_mcq", "multiple_mcq", "drag_drop_classify", "drag_drop_order"],
+                       choices=exercise_type_keys(),
                        help="Specific exercise types to use (optional)")
     parser.add_argument("--model", default="gpt-4o", help="OpenAI model to use")
-    parser.add_argument("--output", help="Output file (optional, prints to stdout if not provided)")
+    parser.add_argument("--route", action="append", default=[], metavar="STAGE=MODEL[,FALLBACK...]",
+                       help="Model fallback chain for a stage ('planning' or an exercise type); repeatable (optional)")
+    parser.add_argument("--output", help="Output file, written atomically with a byte-offset index per video (optional, prints to stdout if not provided)")
+    parser.add_argument("--output-dir", help="Directory for one output file per video, plus index.json (batch mode, optional)")
+    parser.add_argument("--output-format", choices=["markdown", "jsonl"], default="markdown",
+                       help="Write exercises as markdown or as JSON Lines with plan metadata (default: markdown)")
+    parser.add_argument("--gzip", action="store_true",
+                       help="Gzip the output file(s), one gzip member per video (needs --output or --output-dir)")
+    parser.add_argument("--jsonl", metavar="PATH",
+                       help="Also write typed exercises with plan metadata as JSON Lines, one per line ('-' for stdout, optional)")
+    parser.add_argument("--video-concurrency", type=int,
+                       help="Videos planned and generated at the same time in batch mode (default: 2)")
+    parser.add_argument("--no-dedup", action="store_true",
+                       help="In batch mode, process every video even if its content repeats an earlier one")
+    parser.add_argument("--exercise-bank", default=Config.EXERCISE_BANK_PATH, metavar="PATH",
+                       help="Exercise bank file: near-duplicates of banked exercises are regenerated, new exercises are added (optional)")
+    parser.add_argument("--exercise-index", default=Config.EXERCISE_INDEX_PATH, metavar="PATH",
+                       help="SQLite search index to add the generated exercises to; query it with 'search' (optional)")
+    parser.add_argument("--candidates", type=int, default=Config.CANDIDATES,
+                       help="Completions to sample per generation request, keeping the best valid one (default: 1)")
+    parser.add_argument("--execution-strategy", choices=["auto", "grouped", "per_exercise"], default=Config.EXECUTION_STRATEGY,
+                       help="One generation call per exercise type (grouped), per planned exercise, or auto (default: auto)")
+    parser.add_argument("--concurrency", type=int, default=Config.MAX_CONCURRENCY,
+                       help="Maximum generation calls in flight at once (default: 4)")
+    parser.add_argument("--show-usage", action="store_true",
+                       help="Print API token usage per stage, including prompt-cache hits")
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument("--record", metavar="CASSETTE",
+                       help="Record every LLM request and response, with timings, to a cassette file (.gz to compress, optional)")
+    cassette_group.add_argument("--replay", metavar="CASSETTE",
+                       help="Serve LLM responses from a recorded cassette instead of calling the API (optional)")
+    parser.add_argument("--replay-latency", choices=["none", "original"], default="none",
+                       help="Return replayed responses immediately or after their recorded response time (default: none)")
+    parser.add_argument("--trace", metavar="PATH",
+                       help="Write tracing spans for every stage as Chrome trace JSON, for chrome://tracing or Perfetto (optional)")
+    parser.add_argument("--trace-otel", action="store_true",
+                       help="Also send tracing spans to the configured OpenTelemetry provider (needs opentelemetry installed)")
+    parser.add_argument("--profile", metavar="DIR",
+                       help="Profile the CPU-bound stages (extract, decode, validate, format) and write per-stage hot-spot reports, "
+                            "merged with earlier runs profiled into DIR (optional)")
+    parser.add_argument("--timeout", type=float, default=Config.RUN_TIMEOUT,
+                       help="Time budget in seconds for the whole run (optional, unbounded if not provided)")
+    
+    args = parser.parse_args(argv)
     
-    args = parser.parse_args()
+    batch = len(args.video_file) > 1 or args.output_dir is not None
+    if args.output and args.output_dir:
+        parser.error("use either --output or --output-dir, not both")
+    if args.gzip and not (args.output or args.output_dir):
+        parser.error("--gzip needs --output or --output-dir")
+    if args.timeout is not None and args.timeout <= 0:
+        parser.error(f"--timeout must be positive, got {args.timeout:g}")
+    if args.candidates < 1:
+        parser.error(f"--candidates must be at least 1, got {args.candidates}")
+    if args.concurrency < 1:
+        parser.error(f"--concurrency must be at least 1, got {args.concurrency}")
+    if args.video_concurrency is not None and args.video_concurrency < 1:
+        parser.error(f"--video-concurrency must be at least 1, got {args.video_concurrency}")
     
-    # Warn about GPT-5 temperature restrictions upfront
-    if args.model.startswith("gpt-5"):
-        print(f"Note: {args.model} automatically uses temperature=1.0 (required by OpenAI)")
+    from .core.routing import get_model_capabilities, parse_routes
     
     try:
-        # Generate exercises using intelligent design
-        exercises = generate_exercises_intelligent(
-            args.video_file, 
+        routes = {**Config.MODEL_ROUTES, **parse_routes(args.route)}
+    except ValueError as e:
+        parser.error(str(e))
+    
+    # Warn about temperature restrictions upfront
+    routed_models = {args.model} | {model for chain in routes.values() for model in chain}
+    for model in sorted(routed_models):
+        fixed_temperature = get_model_capabilities(model).fixed_temperature
+        if fixed_temperature is not None:
+            print(f"Note: {model} automatically uses temperature={fixed_temperature:g} (required by OpenAI)")
+    
+    replay_latency = 1.0 if args.replay_latency == "original" else 0.0
+    
+    tracer = None
+    if args.trace or args.trace_otel:
+        from .core.tracing import enable_tracing
+        try:
+            tracer = enable_tracing(opentelemetry=args.trace_otel)
+        except ImportError as e:
+            parser.error(str(e))
+    
+    profiler = None
+    if args.profile:
+        from .core.profiling import enable_profiling
+        profiler = enable_profiling()
+    
+    if batch:
+        try:
+            generate_exercises_batch(
+                args.video_file,
+                args.objectives,
+                args.exercise_types,
+                model=args.model,
+                timeout=args.timeout,
+                routes=routes,
+                show_usage=args.show_usage,
+                candidates=args.candidates,
+                execution_strategy=args.execution_strategy,
+                concurrency=args.concurrency,
+                output_dir=args.output_dir,
+                video_concurrency=args.video_concurrency,
+                dedup=Config.BATCH_DEDUP and not args.no_dedup,
+                exercise_bank=args.exercise_bank,
+                jsonl=args.jsonl,
+                output=args.output,
+                output_format=args.output_format,
+                compress=args.gzip,
+                exercise_index=args.exercise_index,
+                record=args.record,
+                replay=args.replay,
+                replay_latency=replay_latency
+            )
+        except Exception as e:
+            print(f"Error generating exercises: {e}")
+        _finish_trace(tracer, args.trace)
+        _finish_profile(profiler, args.profile)
+        return
+    
+    video_file = args.video_file[0]
+    try:
+        # Generate exercises using intelligent design, streaming them to the output
+        generate_exercises_intelligent(
+            video_file, 
             args.objectives, 
             getattr(args, 'exercise_types', None),  # Handle hyphenated argument
-            args.model
+            args.model,
+            args.timeout,
+            routes,
+            args.show_usage,
+            args.candidates,
+            args.execution_strategy,
+            args.concurrency,
+            args.exercise_bank,
+            args.jsonl,
+            output=args.output or "-",
+            output_format=args.output_format,
+            compress=args.gzip,
+            exercise_index=args.exercise_index,
+            record=args.record,
+            replay=args.replay,
+            replay_latency=replay_latency
         )
-        
-        # Format output
-        output = "\n---\n".join(exercises)
-        
-        # Write to file or print
-        if args.output:
-            with open(args.output, 'w') as f:
-                f.write(output)
-            print(f"Exercises written to {args.output}")
-        else:
-            print(output)
-            
+    
     except FileNotFoundError:
-        print(f"Error: Video file '{args.video_file}' not found.")
+        print(f"Error: Video file '{video_file}' not found.")
     except Exception as e:
         print(f"Error generating exercises: {e}")
+    _finish_trace(tracer, args.trace)
+    _finish_profile(profiler, args.profile)
 
 
 if __name__ == "__main__":
@@ -4,25 +4,57 @@ DataCamp Exercise Generator - Models Package
 This package contains all Pydantic models and data structures used throughout the system.
 """
 
-from .exercises import (
-    Exercise, SingleAnswerMCQExercise, MultipleAnswerMCQExercise,
-    DragDropClassifyExercise, DragDropOrderExercise,
-    DraggableItem, DropZone, OrderableItem
-)
-from .planning import ExerciseType, ExercisePlan, LearningPlan
-from .examples import EXERCISE_EXAMPLES
+from importlib import import_module
+
+# Public name -> defining submodule; EXERCISE_EXAMPLES in particular is only loaded when prompts need it
+_LAZY_IMPORTS = {
+    "Exercise": ".exercises",
+    "SingleAnswerMCQExercise": ".exercises",
+    "MultipleAnswerMCQExercise": ".exercises",
+    "Answer": ".exercises",
+    "DragDropClassifyExercise": ".exercises",
+    "DragDropOrderExercise": ".exercises",
+    "DraggableItem": ".exercises",
+    "DropZone": ".exercises",
+    "OrderableItem": ".exercises",
+    "ExerciseResponse": ".exercises",
+    "ExerciseType": ".planning",
+    "ExercisePlan": ".planning",
+    "LearningPlan": ".planning",
+    "ExecutionResult": ".planning",
+    "GeneratedExercise": ".planning",
+    "EXERCISE_EXAMPLES": ".examples"
+}
 
 __all__ = [
     "Exercise",
     "SingleAnswerMCQExercise", 
     "MultipleAnswerMCQExercise",
+    "Answer",
     "DragDropClassifyExercise",
     "DragDropOrderExercise",
     "DraggableItem",
     "DropZone", 
     "OrderableItem",
+    "ExerciseResponse",
     "ExerciseType",
     "ExercisePlan",
     "LearningPlan",
+    "ExecutionResult",
+    "GeneratedExercise",
     "EXERCISE_EXAMPLES"
 ]
+
+
+def __getattr__(name: str):
+    """Import public names on first access, so importing the package stays cheap."""
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -2,14 +2,42 @@
 Exercise Pydantic models for different exercise types.
 """
 
+import hashlib
 from abc import ABC
-from pydantic import BaseModel, Field
+from typing import Annotated, Any, Generic, TypeVar
+from pydantic import BaseModel, BeforeValidator, Field, model_validator
+
+
+def _derived_id(prefix: str, *parts: str) -> str:
+    """A ``<prefix>_<8 hex digits>`` id derived from ``parts`` (content and position).
+
+    Validating the same response always gives the same ids, so prompts that embed an exercise
+    (repairs) are identical from run to run and replay from a cassette.
+    """
+    digest = hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+    return f"{prefix}_{digest[:8]}"
+
+
+# Ids the model may leave out or leave empty; the exercise fills them in (see _derived_id)
+ItemId = DropZoneId = StepId = Annotated[str, BeforeValidator(lambda value: value or ""), Field(default="")]
 
 
 # Base exercise class for extensibility
 class Exercise(BaseModel, ABC):
     title: str = Field(description="The title of the exercise.")
     context: str = Field(description="Additional exercise context to introduce and motivate the exercise.")
+    
+    def fingerprint_text(self) -> str:
+        """Title, context, question and answers: the text that makes two exercises the same exercise."""
+        return "\n".join([self.title, self.context])
+    
+    def question_text(self) -> str:
+        """What the learner is asked, or told, to do."""
+        return ""
+    
+    def answer_texts(self) -> list[str]:
+        """Every answer or item the learner chooses from."""
+        return []
 
 
 # Multiple Choice Question Exercise - Single Answer
@@ -19,14 +47,38 @@ class SingleAnswerMCQExercise(Exercise):
     incorrect_answers: dict[str, str] = Field(description="Dictionary mapping incorrect answers to their feedback messages. These messages should nudge learners in the correct direction while not providing the answer clearly.")
     correct_answer: str = Field(description="The correct answer to the question.")
     correct_feedback: str = Field(description="Success message shown when the learner selects the correct answer.")
+    
+    def fingerprint_text(self) -> str:
+        return "\n".join([super().fingerprint_text(), self.question, self.correct_answer, *self.incorrect_answers])
+    
+    def question_text(self) -> str:
+        return self.question
+    
+    def answer_texts(self) -> list[str]:
+        return [self.correct_answer, *self.incorrect_answers]
 
 
 # Multiple Choice Question Exercise - Multiple Answers
+class Answer(BaseModel):
+    answer: str = Field(description="The answer option text")
+    correct: bool = Field(description="Whether this option is one of the correct answers")
+    feedback: str = Field(description="Feedback shown when the learner selects this option")
+
+
 class MultipleAnswerMCQExercise(Exercise):
     question: str = Field(description="A question that requires selecting multiple correct answers.")
     hints: list[str] = Field(description="A list of 1-2 single-sentence statements to help learners reach the solution.")
-    answers: list[dict] = Field(description="List of answer objects with 'answer', 'correct' (boolean), and 'feedback' fields.")
+    answers: list[Answer] = Field(description="List of answer objects with 'answer', 'correct' (boolean), and 'feedback' fields.")
     success_message: str = Field(description="Success message shown when all correct answers are selected.")
+    
+    def fingerprint_text(self) -> str:
+        return "\n".join([super().fingerprint_text(), self.question, *self.answer_texts()])
+    
+    def question_text(self) -> str:
+        return self.question
+    
+    def answer_texts(self) -> list[str]:
+        return [answer.answer for answer in self.answers]
 
     class Config:
         schema_extra = {
@@ -55,12 +107,12 @@ class MultipleAnswerMCQExercise(Exercise):
 # Drag and Drop Classification Exercise Components
 class DraggableItem(BaseModel):
     content: str = Field(description="The text content of the draggable item")
-    id: str = Field(description="Unique identifier for the draggable item")
+    id: ItemId = Field(description="Unique identifier for the draggable item")
     incorrect_message: str = Field(description="Feedback message when item is placed in wrong category")
 
 
 class DropZone(BaseModel):
-    id: str = Field(description="Unique identifier for the drop zone")
+    id: DropZoneId = Field(description="Unique identifier for the drop zone")
     title: str = Field(description="Display title for the drop zone category")
     draggable_items: list[DraggableItem] = Field(description="Items that belong in this drop zone")
 
@@ -71,12 +123,33 @@ class DragDropClassifyExercise(Exercise):
     hints: list[str] = Field(description="A list of 1-2 single-sentence statements to help learners")
     drop_zones: list[DropZone] = Field(description="Categories/zones where items can be dropped")
     success_message: str = Field(description="Success message when exercise is completed correctly")
+    
+    @model_validator(mode="after")
+    def _fill_ids(self) -> "DragDropClassifyExercise":
+        for zone_index, zone in enumerate(self.drop_zones):
+            zone.id = zone.id or _derived_id("dropzone", self.title, str(zone_index), zone.title)
+            for item_index, item in enumerate(zone.draggable_items):
+                item.id = item.id or _derived_id("item", self.title, f"{zone_index}.{item_index}", item.content)
+        return self
+    
+    def fingerprint_text(self) -> str:
+        parts = [super().fingerprint_text(), self.instructions]
+        for zone in self.drop_zones:
+            parts.append(zone.title)
+            parts.extend(item.content for item in zone.draggable_items)
+        return "\n".join(parts)
+    
+    def question_text(self) -> str:
+        return self.instructions
+    
+    def answer_texts(self) -> list[str]:
+        return [text for zone in self.drop_zones for text in (zone.title, *(item.content for item in zone.draggable_items))]
 
 
 # Drag and Drop Order Exercise Components
 class OrderableItem(BaseModel):
     content: str = Field(description="The text content of the orderable item")
-    id: str = Field(description="Unique identifier for the orderable item")
+    id: StepId = Field(description="Unique identifier for the orderable item")
     incorrect_message: str = Field(description="Feedback message when item is placed in wrong position")
 
 
@@ -88,3 +161,26 @@ class DragDropOrderExercise(Exercise):
     sequence_title: str = Field(description="Title for the sequence/process being ordered")
     success_message: str = Field(description="Success message when all items are correctly ordered")
     failure_message: str = Field(description="Message shown when ordering is incorrect", default="Try again!")
+    
+    @model_validator(mode="after")
+    def _fill_ids(self) -> "DragDropOrderExercise":
+        for index, item in enumerate(self.ordered_items):
+            item.id = item.id or _derived_id("step", self.title, str(index), item.content)
+        return self
+    
+    def fingerprint_text(self) -> str:
+        return "\n".join([super().fingerprint_text(), self.instructions, self.sequence_title, *(item.content for item in self.ordered_items)])
+    
+    def question_text(self) -> str:
+        return self.instructions
+    
+    def answer_texts(self) -> list[str]:
+        return [self.sequence_title, *(item.content for item in self.ordered_items)]
+
+
+E = TypeVar("E", bound=Exercise)
+
+
+# What a generation call responds with
+class ExerciseResponse(BaseModel, Generic[E]):
+    exercises: list[E] = Field(description="The generated exercises")
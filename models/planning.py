@@ -3,7 +3,9 @@ Learning design and planning models.
 """
 
 from enum import Enum
-from pydantic import BaseModel, Field
+from typing import Optional
+from pydantic import BaseModel, Field, SerializeAsAny
+from .exercises import Exercise
 
 
 # Exercise type enumeration for type safety
@@ -12,6 +14,18 @@ class ExerciseType(str, Enum):
     MULTIPLE_MCQ = "multiple_mcq"
     DRAG_DROP_CLASSIFY = "drag_drop_classify"
     DRAG_DROP_ORDER = "drag_drop_order"
+    
+    @classmethod
+    def _missing_(cls, value):
+        """Accept exercise types registered by plugins, as members created on first use."""
+        from ..core.exercise_types import get_exercise_types
+        if not isinstance(value, str) or value not in get_exercise_types():
+            return None
+        member = str.__new__(cls, value)
+        member._name_ = value.upper()
+        member._value_ = value
+        cls._value2member_map_[value] = member
+        return member
 
 
 class ExercisePlan(BaseModel):
@@ -25,3 +39,21 @@ class LearningPlan(BaseModel):
     video_title: str = Field(description="A descriptive title for the video content")
     video_summary: str = Field(description="A brief summary of what the video covers")
     exercise_plans: list[ExercisePlan] = Field(description="List of exercises planned for this video, in the order they should appear")
+
+
+class GeneratedExercise(BaseModel):
+    """A validated exercise together with the plan and video it was generated from."""
+    exercise_type: ExerciseType = Field(description="The type of the exercise")
+    exercise: SerializeAsAny[Exercise] = Field(description="The exercise itself, as its type's model")
+    learning_objective: Optional[str] = Field(default=None, description="Planned objective the exercise was generated for")
+    difficulty_level: Optional[str] = Field(default=None, description="Planned difficulty level")
+    video_title: Optional[str] = Field(default=None, description="Title the learning plan gave the video")
+    source_video: Optional[str] = Field(default=None, description="Path of the source video transcript, when known")
+    source_hash: Optional[str] = Field(default=None, description="Hash of the video content the exercise was generated from")
+    model: Optional[str] = Field(default=None, description="Model that generated the exercise")
+
+
+class ExecutionResult(BaseModel):
+    exercises: list[str] = Field(default_factory=list, description="Formatted exercises, in plan order")
+    items: list[GeneratedExercise] = Field(default_factory=list, description="The same exercises as typed objects with plan metadata")
+    missing_plans: list[ExercisePlan] = Field(default_factory=list, description="Planned exercises not generated before the deadline")
@@ -0,0 +1,81 @@
+"""
+Makes the repository importable as ``datacamp_exercise_generator`` (the name it is installed under),
+and provides a fake OpenAI client for tests that go through the model router.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from types import SimpleNamespace
+
+PACKAGE_NAME = "datacamp_exercise_generator"
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The repository root is the package itself, so link it under its installed name
+PACKAGE_PARENT = tempfile.mkdtemp(prefix="exercise-generator-tests-")
+os.symlink(REPOSITORY, os.path.join(PACKAGE_PARENT, PACKAGE_NAME))
+sys.path.insert(0, PACKAGE_PARENT)
+
+
+def chat_completion(*contents, model: str = "gpt-4o"):
+    """A ChatCompletion with one choice per content string (None for a refusal)."""
+    from openai.types.chat import ChatCompletion
+    return ChatCompletion.model_validate({
+        "id": "chatcmpl-test", "object": "chat.completion", "created": 0, "model": model,
+        "choices": [
+            {"index": index, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}
+            for index, content in enumerate(contents)
+        ],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+    })
+
+
+def timeout_error():
+    import httpx
+    from openai import APITimeoutError
+    return APITimeoutError(request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+
+
+def rate_limit_error():
+    import httpx
+    from openai import RateLimitError
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    return RateLimitError("Rate limit reached", response=httpx.Response(429, request=request), body=None)
+
+
+class FakeClient:
+    """Stands in for a blocking OpenAI client, keeping every request it is sent.
+
+    ``reply`` is a list of replies served in order, or a function of the request returning one.
+    A reply is a completion's content (or a list of them, one per choice), or an exception to raise.
+    """
+    
+    api_key = "test-key"
+    
+    def __init__(self, reply):
+        self.reply = reply
+        self.requests = []
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+    
+    def with_options(self, **options):
+        return self
+    
+    def _create(self, **request):
+        with self._lock:
+            self.requests.append(request)
+            reply = self.reply(request) if callable(self.reply) else self.reply.pop(0)
+        if isinstance(reply, BaseException):
+            raise reply
+        contents = reply if isinstance(reply, list) else [reply]
+        return chat_completion(*contents, model=request["model"])
+
+
+class WordEstimator:
+    """Token estimator counting one token per whitespace-separated word, so budgets are easy to reason about."""
+    
+    method = "words"
+    
+    def count(self, text: str) -> int:
+        return len(text.split())
@@ -0,0 +1,84 @@
+"""
+Recording a run's LLM traffic to a cassette and replaying it offline, errors and failovers included.
+"""
+
+import time
+
+import pytest
+
+pytest.importorskip("openai")
+pytest.importorskip("pydantic")
+
+from openai import APITimeoutError, RateLimitError
+
+from conftest import FakeClient, rate_limit_error, timeout_error
+
+from datacamp_exercise_generator.core.cassette import Cassette, CassetteError
+from datacamp_exercise_generator.core.routing import ModelRouter
+
+ROUTES = {"planning": ["gpt-4o", "gpt-4o-mini"], "single_mcq": ["gpt-4o-mini"]}
+
+# (stage, prompt) per call, and the fake API's replies in the order they are requested
+CALLS = [
+    ("planning", "Plan the video"),         # times out on gpt-4o, fails over to gpt-4o-mini
+    ("single_mcq", "Write an MCQ"),         # rate limited once, then answered after the backoff
+    ("single_mcq", "Write another MCQ"),    # times out on the chain's only model
+    ("single_mcq", "Write a third MCQ"),    # rate limited until the retries run out
+]
+REPLIES = [
+    timeout_error(), "the plan",
+    rate_limit_error(), "an MCQ",
+    timeout_error(),
+    *[rate_limit_error() for _ in range(ModelRouter.RATE_LIMIT_RETRIES + 1)],
+]
+
+
+def _run(router: ModelRouter) -> list:
+    """Each call's response, or the type of the error it raised."""
+    outcomes = []
+    for stage, prompt in CALLS:
+        try:
+            response = router.create_completion(stage, [{"role": "user", "content": prompt}], temperature=0.3)
+        except (APITimeoutError, RateLimitError) as e:
+            outcomes.append(type(e))
+        else:
+            outcomes.append(response.model_dump())
+    return outcomes
+
+
+@pytest.mark.parametrize("name", ["run.cassette.jsonl", "run.cassette.jsonl.gz"])
+def test_replay_reproduces_recorded_run(tmp_path, monkeypatch, name):
+    path = str(tmp_path / name)
+    monkeypatch.setattr(ModelRouter, "RATE_LIMIT_BACKOFF", 0.01)
+    client = FakeClient(list(REPLIES))
+    with Cassette.record(path) as cassette:
+        recorded = _run(ModelRouter(routes=ROUTES, client=client, cassette=cassette))
+    assert cassette.interactions == len(REPLIES)
+    assert [outcome if isinstance(outcome, type) else outcome["choices"][0]["message"]["content"] for outcome in recorded] == [
+        "the plan", "an MCQ", APITimeoutError, RateLimitError
+    ]
+
+    # No client and no key: every response must come from the cassette, without waiting out backoffs
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setattr(ModelRouter, "RATE_LIMIT_BACKOFF", 30.0)
+    cassette = Cassette.replay(path, latency=0)
+    started = time.perf_counter()
+    replayed = _run(ModelRouter(routes=ROUTES, cassette=cassette))
+    assert time.perf_counter() - started < 5
+    assert replayed == recorded
+    assert cassette.interactions == len(REPLIES) and cassette.unused() == 0
+
+
+def test_unrecorded_request_is_an_error(tmp_path):
+    path = str(tmp_path / "run.cassette.jsonl")
+    with Cassette.record(path) as cassette:
+        ModelRouter(client=FakeClient(["the plan"]), cassette=cassette).create_completion(
+            "planning", [{"role": "user", "content": "Plan the video"}], temperature=0.3
+        )
+    router = ModelRouter(cassette=Cassette.replay(path, latency=0))
+    with pytest.raises(CassetteError, match="differ from the recorded run"):
+        router.create_completion("planning", [{"role": "user", "content": "Plan another video"}], temperature=0.3)
+    # The recorded response is served once
+    router.create_completion("planning", [{"role": "user", "content": "Plan the video"}], temperature=0.3)
+    with pytest.raises(CassetteError):
+        router.create_completion("planning", [{"role": "user", "content": "Plan the video"}], temperature=0.3)
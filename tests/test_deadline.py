@@ -0,0 +1,61 @@
+"""
+A run deadline cuts off slow generation calls: finished exercises are kept and the rest reported missing.
+"""
+
+import json
+import time
+
+import pytest
+
+pytest.importorskip("openai")
+pytest.importorskip("pydantic")
+
+from conftest import FakeClient, timeout_error
+
+from datacamp_exercise_generator.core.deadline import Deadline
+from datacamp_exercise_generator.core.designer import LearningDesigner
+from datacamp_exercise_generator.core.routing import ModelRouter
+from datacamp_exercise_generator.models.planning import LearningPlan
+
+TIMEOUT = 1.0
+
+# Generation calls for this objective hang until their request timeout
+SLOW_OBJECTIVE = "Explain why the mean is sensitive to outliers"
+
+PLAN = LearningPlan.model_validate({
+    "video_title": "Summary statistics", "video_summary": "Means and medians.",
+    "exercise_plans": [
+        {"exercise_type": "single_mcq", "learning_objective": "Pick the median for skewed data",
+         "rationale": "Recall.", "difficulty_level": "Beginner"},
+        {"exercise_type": "single_mcq", "learning_objective": SLOW_OBJECTIVE,
+         "rationale": "Understanding.", "difficulty_level": "Intermediate"},
+    ],
+})
+
+MCQ_RESPONSE = json.dumps({"exercises": [{
+    "title": "Skewed data", "context": "Incomes are right-skewed.", "question": "Which statistic describes a typical income?",
+    "hints": ["Think about outliers."], "correct_answer": "Median", "correct_feedback": "Right!",
+    "incorrect_answers": {"Mean": "Pulled by outliers.", "Range": "Not a typical value."},
+}]})
+
+
+def test_slow_call_is_reported_missing():
+    deadline = Deadline(timeout=TIMEOUT)
+    sent = []
+
+    def reply(request):
+        sent.append((request["timeout"], deadline.remaining()))
+        if SLOW_OBJECTIVE in request["messages"][-1]["content"]:
+            time.sleep(request["timeout"])
+            return timeout_error()
+        return MCQ_RESPONSE
+
+    designer = LearningDesigner(router=ModelRouter(client=FakeClient(reply)), execution_strategy="per_exercise", max_concurrency=2)
+    started = time.monotonic()
+    result = designer.execute_plan("Video about means and medians.", PLAN, deadline=deadline)
+
+    assert time.monotonic() - started < TIMEOUT + 0.5
+    assert [item.learning_objective for item in result.items] == ["Pick the median for skewed data"]
+    assert len(result.exercises) == 1
+    assert result.missing_plans == [PLAN.exercise_plans[1]]
+    assert len(sent) >= 2 and all(timeout <= remaining + 0.01 for timeout, remaining in sent)
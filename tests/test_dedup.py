@@ -0,0 +1,55 @@
+"""
+Batch deduplication: identical videos are processed once and repeated slides are left out of planning.
+"""
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from conftest import WordEstimator
+
+from datacamp_exercise_generator.core.dedup import BatchDeduplicator, content_hash
+
+
+INTRO = "Welcome to the course on statistics."
+OUTRO = "Thanks for watching, see you next time."
+VIDEOS = ["a.md", "b.md", "c.md", "d.md"]
+
+
+def _dedup() -> BatchDeduplicator:
+    return BatchDeduplicator(VIDEOS, estimator=WordEstimator())
+
+
+def test_content_hash_ignores_case_and_whitespace():
+    assert content_hash("The  mean\nis fragile") == content_hash("the mean is   FRAGILE ")
+    assert content_hash("the mean") != content_hash("the median")
+
+
+def test_identical_video_reuses_the_first():
+    dedup = _dedup()
+    assert dedup.add(0, [INTRO, "Means."]) == f"{INTRO}\n\nMeans."
+    assert dedup.add(1, [INTRO.upper(), "means."]) is None
+    assert dedup.is_duplicate(1) and not dedup.is_duplicate(0)
+    assert dedup.canonical == {1: 0}
+
+    report = dedup.report({0: 3})
+    assert report.duplicate_videos == {"b.md": "a.md"}
+    assert report.calls_saved == 3
+    assert report.tokens_saved == 3 * 7
+
+
+def test_repeated_sections_are_stripped_from_later_videos():
+    dedup = _dedup()
+    dedup.add(0, [INTRO, "Means.", OUTRO])
+    assert dedup.add(1, [INTRO, "Medians and quartiles.", OUTRO]) == "Medians and quartiles."
+    report = dedup.report({0: 2, 1: 2})
+    assert report.stripped_sections == 2
+    assert report.tokens_saved == 6 + 7
+    assert report.calls_saved == 0
+
+
+def test_video_is_never_stripped_to_nothing():
+    dedup = _dedup()
+    dedup.add(0, [INTRO, "Means.", OUTRO])
+    assert dedup.add(1, [OUTRO, INTRO]) == f"{OUTRO}\n\n{INTRO}"
+    assert dedup.report({}).stripped_sections == 0
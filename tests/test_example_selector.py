@@ -0,0 +1,21 @@
+"""
+Few-shot example selection, including exercise types without curated examples.
+"""
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from datacamp_exercise_generator.generators.example_selector import ExampleSelector
+
+
+@pytest.mark.parametrize("token_budget", [None, 350])
+def test_type_without_examples_gets_no_section(token_budget):
+    selector = ExampleSelector(token_budget)
+    assert selector.select("fill_blanks", "x") == ()
+    assert selector.format_section("fill_blanks", "x") == ""
+
+
+def test_budget_keeps_one_example_per_component():
+    selection = dict(ExampleSelector(0).select("single_mcq", "outliers"))
+    assert selection and all(len(indices) == 1 for indices in selection.values())
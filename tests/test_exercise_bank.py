@@ -0,0 +1,80 @@
+"""
+The exercise bank flags near-duplicates of earlier exercises, across runs via its JSON file.
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from datacamp_exercise_generator.core.exercise_bank import ExerciseBank
+from datacamp_exercise_generator.models.exercises import SingleAnswerMCQExercise
+
+
+def _mcq(title: str, question: str, correct: str = "The median", context: str = "Household incomes are right-skewed.") -> SingleAnswerMCQExercise:
+    return SingleAnswerMCQExercise(
+        title=title, context=context, question=question, hints=["Think about outliers."],
+        incorrect_answers={"The mean": "Pulled by outliers.", "The range": "Not a typical value."},
+        correct_answer=correct, correct_feedback="Right!",
+    )
+
+
+BANKED = _mcq("Typical income", "Which statistic best describes the typical household income in a right-skewed distribution?")
+REWORDED = _mcq("Typical income", "Which statistic best describes the typical household income in a right skewed distribution of incomes?")
+DIFFERENT = _mcq(
+    "Sorting steps", "What does a merge sort do after splitting the list in halves?",
+    correct="It merges the sorted halves", context="Sorting algorithms divide and conquer.",
+)
+
+
+def test_near_duplicate_is_found():
+    bank = ExerciseBank()
+    bank.add(BANKED, "single_mcq")
+    match = bank.find_duplicate(REWORDED, "single_mcq")
+    assert match is not None and match.title == "Typical income"
+    assert bank.threshold <= match.similarity < 1
+    assert bank.find_duplicate(BANKED, "single_mcq").similarity == 1
+
+
+def test_different_exercise_or_type_is_not_a_duplicate():
+    bank = ExerciseBank()
+    bank.add(BANKED, "single_mcq")
+    assert bank.find_duplicate(DIFFERENT, "single_mcq") is None
+    assert bank.find_duplicate(BANKED, "multiple_mcq") is None
+
+
+def test_bank_persists_across_runs(tmp_path):
+    path = str(tmp_path / "bank" / "exercises.json")
+    bank = ExerciseBank(path)
+    bank.add(BANKED, "single_mcq")
+    bank.save()
+
+    reloaded = ExerciseBank(path)
+    assert len(reloaded) == 1
+    assert reloaded.find_duplicate(REWORDED, "single_mcq").title == "Typical income"
+    assert not (tmp_path / "bank" / "exercises.json.tmp").exists()
+
+
+def test_bank_with_other_minhash_parameters_is_rejected(tmp_path):
+    path = tmp_path / "exercises.json"
+    path.write_text(json.dumps({"num_perm": 128, "shingle_size": 3, "entries": []}))
+    with pytest.raises(ValueError, match="different MinHash parameters"):
+        ExerciseBank(str(path))
+
+
+def test_generator_regenerates_banked_duplicates():
+    pytest.importorskip("openai")
+    from conftest import FakeClient
+    from datacamp_exercise_generator.core.routing import ModelRouter
+    from datacamp_exercise_generator.generators.factory import get_exercise_generator
+
+    bank = ExerciseBank()
+    bank.add(BANKED, "single_mcq")
+    client = FakeClient([json.dumps({"exercises": [exercise.model_dump()]}) for exercise in (REWORDED, DIFFERENT)])
+    generator = get_exercise_generator("single_mcq", router=ModelRouter(client=client), exercise_bank=bank)
+
+    exercises = generator.generate_exercises("Video about incomes and sorting.")
+    assert [exercise.title for exercise in exercises] == ["Sorting steps"]
+    assert len(client.requests) == 2 and "Typical income" in client.requests[1]["messages"][-1]["content"]
+    assert len(bank) == 2
@@ -0,0 +1,59 @@
+"""
+Ids the model leaves out are derived from the exercise, so the same response always validates the same.
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from datacamp_exercise_generator.core.json_response import response_adapter, validate_json_response
+from datacamp_exercise_generator.models.exercises import DragDropClassifyExercise, DragDropOrderExercise, ExerciseResponse
+
+CLASSIFY_RESPONSE = json.dumps({"exercises": [{
+    "title": "Robust or not", "context": "Outliers.", "instructions": "Drag each statistic.", "hints": [],
+    "success_message": "Well done!",
+    "drop_zones": [
+        {"title": "Robust", "draggable_items": [{"content": "Median", "incorrect_message": "No."}, {"content": "IQR", "id": "", "incorrect_message": "No."}]},
+        {"id": "dropzone_given", "title": "Sensitive", "draggable_items": [{"content": "Mean", "id": "item_given", "incorrect_message": "No."}]},
+    ],
+}]})
+
+ORDER_RESPONSE = json.dumps({"exercises": [{
+    "title": "Steps", "context": "Cleaning.", "instructions": "Order them.", "hints": [],
+    "sequence_title": "Steps", "success_message": "Well done!",
+    "ordered_items": [{"content": "Load", "incorrect_message": "No."}, {"content": "Load", "incorrect_message": "No."}],
+}]})
+
+
+@pytest.mark.parametrize("exercise_type, content", [
+    (DragDropClassifyExercise, CLASSIFY_RESPONSE),
+    (DragDropOrderExercise, ORDER_RESPONSE),
+])
+def test_missing_ids_are_deterministic(exercise_type, content):
+    adapter = response_adapter(ExerciseResponse[exercise_type])
+    first, second = (validate_json_response(content, adapter).exercises[0] for _ in range(2))
+    assert first.model_dump_json() == second.model_dump_json()
+
+
+def test_missing_ids_are_filled_and_unique():
+    exercise = validate_json_response(CLASSIFY_RESPONSE, response_adapter(ExerciseResponse[DragDropClassifyExercise])).exercises[0]
+    zones = exercise.drop_zones
+    items = [item for zone in zones for item in zone.draggable_items]
+    assert zones[0].id.startswith("dropzone_") and zones[1].id == "dropzone_given"
+    assert all(item.id.startswith("item_") for item in items) and items[2].id == "item_given"
+    assert len({item.id for item in items}) == len(items)
+
+    order = validate_json_response(ORDER_RESPONSE, response_adapter(ExerciseResponse[DragDropOrderExercise])).exercises[0]
+    ids = [item.id for item in order.ordered_items]
+    assert all(id.startswith("step_") for id in ids) and len(set(ids)) == len(ids)
+
+
+def test_formatted_order_exercise_is_reproducible():
+    from datacamp_exercise_generator.formatters.drag_drop_order import DragDropOrderFormatter
+
+    adapter = response_adapter(ExerciseResponse[DragDropOrderExercise])
+    first, second = (DragDropOrderFormatter().format_to_markdown(validate_json_response(ORDER_RESPONSE, adapter).exercises[0]) for _ in range(2))
+    assert first == second
+    assert "id: solution_" in first
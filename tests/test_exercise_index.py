@@ -0,0 +1,81 @@
+"""
+The FTS5 exercise index: idempotent inserts, stemmed search and reading exercises back.
+"""
+
+import sqlite3
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from datacamp_exercise_generator.core.exercise_index import ExerciseIndex, match_expression
+from datacamp_exercise_generator.models.exercises import SingleAnswerMCQExercise
+from datacamp_exercise_generator.models.planning import GeneratedExercise
+
+
+def _fts5_available() -> bool:
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE probe USING fts5(text)")
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+pytestmark = pytest.mark.skipif(not _fts5_available(), reason="SQLite was built without FTS5")
+
+
+def _item(title: str, question: str, correct: str, objective: str, source_hash: str = "abc") -> GeneratedExercise:
+    exercise = SingleAnswerMCQExercise(
+        title=title, context="A lesson on statistics.", question=question, hints=[],
+        incorrect_answers={"None of these": "No.", "All of these": "No."}, correct_answer=correct, correct_feedback="Right!",
+    )
+    return GeneratedExercise(
+        exercise_type="single_mcq", exercise=exercise, learning_objective=objective,
+        source_video="videos/stats.md", source_hash=source_hash, model="gpt-4o",
+    )
+
+
+MEDIAN = _item("Typical income", "Which statistic describes a skewed distribution best?", "The median", "Choose robust statistics")
+CLASSIFIER = _item("Spam filters", "What kind of model sorts emails into spam?", "A classifier", "Recognise classification tasks")
+
+
+def test_adding_is_idempotent():
+    with ExerciseIndex() as index:
+        assert index.add_all([MEDIAN, CLASSIFIER]) == 2
+        assert index.add_all([MEDIAN, CLASSIFIER.model_copy(update={"model": "gpt-4o-mini"})]) == 0
+        assert index.add_all([]) == 0
+        assert len(index) == 2
+
+
+def test_search_is_stemmed_and_ranked():
+    with ExerciseIndex() as index:
+        index.add_all([MEDIAN, CLASSIFIER])
+        hits = index.search("classify")
+        assert [hit.title for hit in hits] == ["Spam filters"]
+        assert hits[0].learning_objective == "Recognise classification tasks" and hits[0].source_video == "videos/stats.md"
+        assert "[" in hits[0].snippet and hits[0].score > 0
+        assert [hit.title for hit in index.search("skew*")] == ["Typical income"]
+        assert index.search("median spam") == []
+        assert index.search("statistics", exercise_type="drag_drop_order") == []
+        assert len(index.search("statistics")) == 2
+
+
+def test_free_text_is_not_fts5_syntax():
+    assert match_expression("what's a p-value?") == '"what" "s" "a" "p" "value"'
+    with ExerciseIndex() as index:
+        index.add_all([MEDIAN])
+        assert [hit.title for hit in index.search('(median "robust')] == ["Typical income"]
+        with pytest.raises(ValueError, match="Invalid search query"):
+            index.search("(median OR", raw=True)
+
+
+def test_exercises_read_back_and_persist(tmp_path):
+    path = str(tmp_path / "exercises.db")
+    with ExerciseIndex(path) as index:
+        index.add_all([MEDIAN])
+    with ExerciseIndex(path) as index:
+        hit = index.search("median")[0]
+        assert index.get(hit.id)["exercise"]["correct_answer"] == "The median"
+        assert index.has_source("abc") and not index.has_source("def")
+        with pytest.raises(KeyError):
+            index.get(hit.id + 1)
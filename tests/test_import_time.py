@@ -0,0 +1,69 @@
+"""
+Import-time regression test: the package and the CLI's --help must not load openai or pydantic.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Without them installed the checks below would pass trivially
+pytest.importorskip("openai")
+pytest.importorskip("pydantic")
+
+from conftest import PACKAGE_NAME, PACKAGE_PARENT
+
+# Seconds, measured inside a fresh interpreter (startup excluded), best of RUNS; loading openai
+# alone takes several times longer than either budget
+IMPORT_BUDGET = 0.15
+HELP_BUDGET = 0.3
+RUNS = 3
+
+HEAVY_MODULES = ("openai", "pydantic")
+
+_IMPORT_SCRIPT = f"""
+import json, sys, time
+started = time.perf_counter()
+import {PACKAGE_NAME}
+seconds = time.perf_counter() - started
+print(json.dumps({{"seconds": seconds, "modules": sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)}}))
+"""
+
+_HELP_SCRIPT = f"""
+import contextlib, io, json, sys, time
+started = time.perf_counter()
+from {PACKAGE_NAME}.main import main
+with contextlib.redirect_stdout(io.StringIO()) as output:
+    try:
+        main(["--help"])
+    except SystemExit:
+        pass
+seconds = time.perf_counter() - started
+print(json.dumps({{"seconds": seconds, "modules": sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules), "help": output.getvalue()}}))
+"""
+
+
+def _run(script: str) -> dict:
+    """Run ``script`` in a fresh interpreter that can import the package; return its JSON output."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [PACKAGE_PARENT, os.environ.get("PYTHONPATH")])))
+    completed = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def test_package_import_is_lazy():
+    runs = [_run(_IMPORT_SCRIPT) for _ in range(RUNS)]
+    assert "openai" not in runs[0]["modules"]
+    assert runs[0]["modules"] == []
+    fastest = min(run["seconds"] for run in runs)
+    assert fastest < IMPORT_BUDGET, f"import {PACKAGE_NAME} took {fastest * 1000:.0f} ms"
+
+
+def test_cli_help_is_lazy():
+    runs = [_run(_HELP_SCRIPT) for _ in range(RUNS)]
+    assert "usage: datacamp_exercise_generator" in runs[0]["help"]
+    assert "openai" not in runs[0]["modules"]
+    assert runs[0]["modules"] == []
+    fastest = min(run["seconds"] for run in runs)
+    assert fastest < HELP_BUDGET, f"main --help took {fastest * 1000:.0f} ms"
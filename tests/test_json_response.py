@@ -0,0 +1,66 @@
+"""
+Decoding the JSON object in a model response, whatever prose or code fences surround it.
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from datacamp_exercise_generator.core import json_response
+from datacamp_exercise_generator.core.json_response import (
+    decode_json_response, extract_json_text, locate_json_object, response_adapter, validate_json_response
+)
+
+OBJECT = {"exercises": [{"title": "Braces {in} strings", "path": "C:\\data\\x.csv", "quote": "say \"hi\""}]}
+TEXT = json.dumps(OBJECT, indent=2)
+
+WRAPPED = {
+    "bare": TEXT,
+    "fenced": f"```json\n{TEXT}\n```",
+    "fenced without language": f"```\n{TEXT}\n```",
+    "introduced": f"Here's the JSON: {TEXT}",
+    "trailing prose": f"{TEXT}\n\nLet me know if you need more!",
+    "trailing prose with braces": f"```json\n{TEXT}\n```\nUse {{placeholders}} to adapt it.",
+    "leading prose with braces": f"Sure! I filled in the {{title}} field.\n{TEXT}",
+    "prose on both sides": f"Note {{this}}: {TEXT} and {{that}}.",
+}
+
+
+@pytest.fixture(params=["json", "orjson"])
+def decoder(request, monkeypatch):
+    """Run each test with and without the optional orjson fast path."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(json_response, "orjson", None)
+    return request.param
+
+
+@pytest.mark.parametrize("name", WRAPPED)
+def test_object_is_found(name, decoder):
+    content = WRAPPED[name]
+    assert decode_json_response(content) == OBJECT
+    assert validate_json_response(content, response_adapter(dict)) == OBJECT
+    assert json.loads(extract_json_text(content)) == OBJECT
+
+
+def test_offsets_span_the_object():
+    content = WRAPPED["prose on both sides"]
+    value, start, end = locate_json_object(content)
+    assert value == OBJECT and content[start:end] == TEXT
+
+
+@pytest.mark.parametrize("content", ["No JSON here.", f"```json\n{TEXT[:-20]}", f"The {{title}} is {TEXT[:-5]}"])
+def test_missing_or_truncated_object_raises(content, decoder):
+    with pytest.raises(json.JSONDecodeError):
+        decode_json_response(content)
+    with pytest.raises(json.JSONDecodeError):
+        validate_json_response(content, response_adapter(dict))
+
+
+def test_schema_errors_are_not_decoding_errors():
+    from pydantic import ValidationError
+    with pytest.raises(ValidationError):
+        validate_json_response(WRAPPED["fenced"], response_adapter(list))
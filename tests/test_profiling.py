@@ -0,0 +1,46 @@
+"""
+Stage profiling from several threads at once, as the pipeline's stages run.
+"""
+
+import cProfile
+import threading
+
+from datacamp_exercise_generator.core.profiling import StageProfiler
+
+
+def _work(profiler: StageProfiler, stage: str, errors: list) -> None:
+    try:
+        for _ in range(20):
+            with profiler.profile(stage):
+                sum(i * i for i in range(5000))
+                with profiler.profile("decode"):
+                    pass
+    except Exception as e:
+        errors.append(e)
+
+
+def test_stages_in_concurrent_threads():
+    profiler = StageProfiler()
+    errors = []
+    threads = [threading.Thread(target=_work, args=(profiler, stage, errors)) for stage in ("extract", "validate", "extract", "format")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert profiler.stats("extract") is not None and profiler.stats("validate") is not None
+    # Nested blocks count towards the outer stage
+    assert profiler.stats("decode") is None
+
+
+def test_block_runs_under_another_profiler():
+    profiler = StageProfiler()
+    outer = cProfile.Profile()
+    outer.enable()
+    try:
+        with profiler.profile("extract"):
+            ran = True
+    finally:
+        outer.disable()
+    assert ran
+    assert "extract: 1 x" in profiler.summary()
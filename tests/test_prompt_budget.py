@@ -0,0 +1,55 @@
+"""
+Video content is pruned at paragraph boundaries to keep prompts within the token budget.
+"""
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from conftest import WordEstimator
+
+from datacamp_exercise_generator.core.tokens import PromptBudgetExceeded, TRUNCATION_MARKER, fit_content_to_budget
+
+
+ESTIMATOR = WordEstimator()
+INSTRUCTIONS = " ".join(["rule"] * 20)
+PARAGRAPHS = [" ".join([f"p{index}"] * 10) for index in range(50)]
+CONTENT = "\n\n".join(PARAGRAPHS)
+
+
+def _sections(instructions: str):
+    return lambda content: [("instructions", instructions), ("video_content", content)]
+
+
+def test_prompt_within_budget_is_unchanged():
+    sections, counts, pruned = fit_content_to_budget(_sections(INSTRUCTIONS), CONTENT, 1000, ESTIMATOR)
+    assert not pruned
+    assert sections == [("instructions", INSTRUCTIONS), ("video_content", CONTENT)]
+    assert counts == {"instructions": 20, "video_content": 500}
+
+
+def test_no_budget_never_prunes():
+    assert fit_content_to_budget(_sections(INSTRUCTIONS), CONTENT, None, ESTIMATOR)[2] is False
+
+
+def test_content_is_pruned_to_leading_paragraphs():
+    sections, counts, pruned = fit_content_to_budget(_sections(INSTRUCTIONS), CONTENT, 150, ESTIMATOR)
+    content = dict(sections)["video_content"]
+    kept = content.split("\n\n")
+    assert pruned
+    assert sum(counts.values()) <= 150
+    assert kept[-1] == TRUNCATION_MARKER
+    assert kept[:-1] == PARAGRAPHS[:len(kept) - 1] and len(kept) > 2
+
+
+def test_long_first_paragraph_is_cut_by_characters():
+    content = " ".join(f"w{index}" for index in range(400))
+    sections, counts, pruned = fit_content_to_budget(_sections(INSTRUCTIONS), content, 100, ESTIMATOR)
+    kept = dict(sections)["video_content"]
+    assert pruned and sum(counts.values()) <= 100
+    assert kept.startswith("w0 w1 w2") and kept.endswith(TRUNCATION_MARKER)
+
+
+def test_unmeetable_budget_raises():
+    with pytest.raises(PromptBudgetExceeded, match="~200 tokens"):
+        fit_content_to_budget(_sections(" ".join(["rule"] * 200)), CONTENT, 100, ESTIMATOR)
@@ -0,0 +1,66 @@
+"""
+The quality gate: structural rules, and one targeted repair call per failing exercise.
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from datacamp_exercise_generator.generators.quality import check_exercise
+from datacamp_exercise_generator.models.exercises import DragDropOrderExercise, OrderableItem, SingleAnswerMCQExercise
+
+
+def _mcq(incorrect_answers: dict[str, str], correct: str = "The median") -> SingleAnswerMCQExercise:
+    return SingleAnswerMCQExercise(
+        title="Typical income", context="Household incomes are right-skewed.",
+        question="Which statistic best describes a typical income?", hints=["Think about outliers."],
+        incorrect_answers=incorrect_answers, correct_answer=correct, correct_feedback="Right!",
+    )
+
+
+GOOD = _mcq({"The mean": "Pulled by outliers.", "The range": "Not a typical value."})
+ONE_DISTRACTOR = _mcq({"The mean": "Pulled by outliers."})
+
+
+def _rules(exercise) -> list[str]:
+    return [issue.rule for issue in check_exercise(exercise)]
+
+
+def test_rules():
+    assert _rules(GOOD) == []
+    assert _rules(ONE_DISTRACTOR) == ["enough_distractors"]
+    assert _rules(_mcq({"the  Median": "Hmm.", "The mean": "No."})) == ["correct_not_in_incorrect"]
+    order = DragDropOrderExercise(
+        title="Steps", context="Cleaning.", instructions="Order them.", hints=[], sequence_title="Steps",
+        success_message="Well done!", failure_message="Not quite.",
+        ordered_items=[OrderableItem(id="step_1", content="Load", incorrect_message="No."),
+                       OrderableItem(id="step_1", content="Clean", incorrect_message="No.")],
+    )
+    assert _rules(order) == ["enough_items", "unique_ids"]
+
+
+def _generator(replies: list):
+    pytest.importorskip("openai")
+    from conftest import FakeClient
+    from datacamp_exercise_generator.core.routing import ModelRouter
+    from datacamp_exercise_generator.generators.factory import get_exercise_generator
+
+    client = FakeClient([json.dumps({"exercises": [exercise.model_dump()]}) for exercise in replies])
+    return get_exercise_generator("single_mcq", router=ModelRouter(client=client)), client
+
+
+def test_failing_exercise_is_repaired():
+    generator, client = _generator([ONE_DISTRACTOR, GOOD])
+    assert generator.generate_exercises("Video about incomes.") == [GOOD]
+    repair_prompt = client.requests[1]["messages"][-1]["content"]
+    assert "needs 2-3 incorrect_answers, has 1" in repair_prompt
+    assert client.requests[0]["messages"][0] == client.requests[1]["messages"][0]
+
+
+def test_worse_repair_keeps_the_original(capsys):
+    worse = _mcq({"The median": "Hmm."})
+    generator, client = _generator([ONE_DISTRACTOR, worse])
+    assert generator.generate_exercises("Video about incomes.") == [ONE_DISTRACTOR]
+    assert "still fails quality checks" in capsys.readouterr().out
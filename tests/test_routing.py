@@ -0,0 +1,67 @@
+"""
+Model routing: failover along a stage's chain, and rate-limit retries on its last model.
+"""
+
+import pytest
+
+pytest.importorskip("openai")
+pytest.importorskip("pydantic")
+
+from openai import APITimeoutError, RateLimitError
+
+from conftest import FakeClient, rate_limit_error, timeout_error
+
+from datacamp_exercise_generator.core.routing import ModelRouter
+
+MESSAGES = [{"role": "user", "content": "Hello"}]
+ROUTES = {"planning": ["gpt-4o", "gpt-4o-mini"]}
+
+
+def _models(client: FakeClient) -> list[str]:
+    return [request["model"] for request in client.requests]
+
+
+@pytest.mark.parametrize("error", [timeout_error, rate_limit_error])
+def test_fails_over_to_next_model(error):
+    client = FakeClient([error(), "planned"])
+    router = ModelRouter(routes=ROUTES, client=client)
+    response = router.create_completion("planning", MESSAGES, temperature=0.3)
+    assert _models(client) == ["gpt-4o", "gpt-4o-mini"]
+    assert response.model == "gpt-4o-mini" and response.choices[0].message.content == "planned"
+    assert router.usage["planning"].calls == 1
+
+
+def test_unrouted_stage_uses_default_model():
+    client = FakeClient(["ok"])
+    ModelRouter(default_model="gpt-4.1", routes=ROUTES, client=client).create_completion("single_mcq", MESSAGES, temperature=0)
+    assert _models(client) == ["gpt-4.1"]
+
+
+def test_last_model_retries_rate_limits(monkeypatch):
+    monkeypatch.setattr(ModelRouter, "RATE_LIMIT_BACKOFF", 0.01)
+    client = FakeClient([timeout_error(), rate_limit_error(), rate_limit_error(), "planned"])
+    response = ModelRouter(routes=ROUTES, client=client).create_completion("planning", MESSAGES, temperature=0.3)
+    assert _models(client) == ["gpt-4o", "gpt-4o-mini", "gpt-4o-mini", "gpt-4o-mini"]
+    assert response.choices[0].message.content == "planned"
+
+
+def test_last_model_gives_up_after_retries(monkeypatch):
+    monkeypatch.setattr(ModelRouter, "RATE_LIMIT_BACKOFF", 0.01)
+    client = FakeClient([rate_limit_error() for _ in range(ModelRouter.RATE_LIMIT_RETRIES + 1)])
+    with pytest.raises(RateLimitError):
+        ModelRouter(client=client).create_completion("planning", MESSAGES, temperature=0.3)
+    assert len(client.requests) == ModelRouter.RATE_LIMIT_RETRIES + 1
+
+
+def test_last_model_timeout_is_raised():
+    client = FakeClient([timeout_error(), timeout_error()])
+    with pytest.raises(APITimeoutError):
+        ModelRouter(routes=ROUTES, client=client).create_completion("planning", MESSAGES, temperature=0.3)
+    assert _models(client) == ["gpt-4o", "gpt-4o-mini"]
+
+
+def test_other_errors_do_not_fail_over():
+    client = FakeClient([RuntimeError("bad request"), "unused"])
+    with pytest.raises(RuntimeError):
+        ModelRouter(routes=ROUTES, client=client).create_completion("planning", MESSAGES, temperature=0.3)
+    assert _models(client) == ["gpt-4o"]
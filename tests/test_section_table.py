@@ -0,0 +1,51 @@
+"""
+SectionTable: many documents' sections in one UTF-8 buffer, read back exactly as added.
+"""
+
+from datacamp_exercise_generator.core.section_table import SectionTable
+
+DOCUMENTS = {
+    "intro.md": ["Welcome to the course.", "Means and medians."],
+    "empty.md": [],
+    "unicode.md": ["Café, naïve, 数据科学", "", "Emoji 😀 and Ω", "ascii again"],
+    "last.md": ["Thanks for watching."],
+}
+
+
+def _table() -> SectionTable:
+    table = SectionTable()
+    for name, sections in DOCUMENTS.items():
+        assert table.add(name, sections) == list(DOCUMENTS).index(name)
+    return table
+
+
+def test_sections_read_back_in_order():
+    table = _table()
+    everything = [section for sections in DOCUMENTS.values() for section in sections]
+    assert len(table) == len(everything) and table.document_count == len(DOCUMENTS)
+    assert list(table) == everything
+    assert [table[index] for index in range(len(table))] == everything
+    assert table[-1] == "Thanks for watching."
+    assert table.names == list(DOCUMENTS)
+
+
+def test_documents_map_to_their_sections():
+    table = _table()
+    for document, sections in enumerate(DOCUMENTS.values()):
+        assert [table.section(index) for index in table.document_sections(document)] == sections
+        assert table.document_text(document) == "\n\n".join(sections)
+    assert table.document_sections(1) == range(2, 2)
+
+
+def test_section_bytes_are_utf8_views():
+    table = _table()
+    index = table.document_sections(2)[0]
+    with table.section_bytes(index) as view:
+        assert bytes(view) == "Café, naïve, 数据科学".encode("utf-8")
+    with table.section_bytes(index + 1) as view:
+        assert len(view) == 0
+    # Views are released, so the buffer can grow again
+    table.add("more.md", ["é"])
+    assert table[-1] == "é"
+    assert table.nbytes >= sum(len(section.encode("utf-8")) for section in table)
+
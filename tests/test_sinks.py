@@ -0,0 +1,100 @@
+"""
+Output sinks: files appear only when complete, gzip members per video, and byte-range indexes.
+"""
+
+import gzip
+import io
+import json
+import os
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from datacamp_exercise_generator.formatters.sinks import FileSink, ShardedSink, StreamSink, open_output_sink, read_indexed
+
+VIDEOS = {
+    "videos/means.md": ["## Mean\n\nExercise one", "## Median\n\nExercise two"],
+    "other/means.md": ["## Été\n\nExercise three"],
+}
+
+
+def _write(sink) -> None:
+    for video_file, exercises in VIDEOS.items():
+        sink.write_video(video_file, exercises)
+
+
+def test_file_appears_only_on_close(tmp_path):
+    path = tmp_path / "out" / "exercises.md"
+    sink = FileSink(str(path))
+    _write(sink)
+    assert not path.exists() and (tmp_path / "out" / "exercises.md.tmp").exists()
+    sink.close()
+    assert path.read_text(encoding="utf-8") == "## Mean\n\nExercise one\n---\n## Median\n\nExercise two## Été\n\nExercise three"
+    assert not (tmp_path / "out" / "exercises.md.tmp").exists()
+    assert sink.count == 3
+
+
+def test_failed_run_leaves_no_file(tmp_path):
+    path = tmp_path / "exercises.md"
+    with pytest.raises(RuntimeError):
+        with FileSink(str(path)) as sink:
+            _write(sink)
+            raise RuntimeError("generation failed")
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_index_reads_back_each_video(tmp_path, compress):
+    with FileSink(str(tmp_path / "exercises.md"), headers=True, compress=compress) as sink:
+        _write(sink)
+    index_path = tmp_path / ("exercises.md.gz.index.json" if compress else "exercises.md.index.json")
+    index = json.loads(index_path.read_text())
+    assert index["compression"] == ("gzip" if compress else None)
+    assert [entry["exercises"] for entry in index["videos"]] == [2, 1]
+    assert [entry["path"] for entry in index["videos"]] == [os.path.basename(sink.path)] * 2
+
+    means = read_indexed(str(index_path), "videos/means.md")
+    assert means == "# videos/means.md\n\n## Mean\n\nExercise one\n---\n## Median\n\nExercise two\n\n"
+    assert read_indexed(str(index_path), "other/means.md").startswith("# other/means.md\n\n## Été")
+    if compress:
+        # One gzip member per video; the whole file still decompresses in one go
+        with gzip.open(sink.path, "rt", encoding="utf-8") as file:
+            assert file.read().startswith(means)
+    with pytest.raises(KeyError):
+        read_indexed(str(index_path), "missing.md")
+
+
+def test_shards_are_named_after_videos(tmp_path):
+    with ShardedSink(str(tmp_path), compress=True) as sink:
+        _write(sink)
+    index = json.loads((tmp_path / "index.json").read_text())
+    assert [entry["path"] for entry in index["videos"]] == ["means.md.gz", "means_2.md.gz"]
+    assert gzip.decompress((tmp_path / "means_2.md.gz").read_bytes()).decode("utf-8") == "## Été\n\nExercise three"
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_stream_sink():
+    stream = io.StringIO()
+    _write(StreamSink(stream))
+    assert stream.getvalue() == "## Mean\n\nExercise one\n---\n## Median\n\nExercise two\n## Été\n\nExercise three\n"
+    with pytest.raises(ValueError):
+        open_output_sink("-", compress=True)
+
+
+def test_jsonl_format_writes_items(tmp_path):
+    from datacamp_exercise_generator.models.exercises import SingleAnswerMCQExercise
+    from datacamp_exercise_generator.models.planning import GeneratedExercise
+
+    exercise = SingleAnswerMCQExercise(
+        title="Typical income", context="Incomes are skewed.", question="Which statistic?", hints=[],
+        incorrect_answers={"Mean": "No.", "Range": "No."}, correct_answer="Median", correct_feedback="Right!",
+    )
+    item = GeneratedExercise(exercise_type="single_mcq", exercise=exercise, learning_objective="Pick the median")
+    with open_output_sink(str(tmp_path / "out.jsonl"), format="jsonl") as sink:
+        sink.write_video("means.md", ["ignored markdown"], [item, item])
+    lines = (tmp_path / "out.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["exercise"]["correct_answer"] for line in lines] == ["Median", "Median"]
+    assert json.loads(lines[0])["learning_objective"] == "Pick the median"
+    with pytest.raises(ValueError):
+        open_output_sink(format="yaml")
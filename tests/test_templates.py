@@ -0,0 +1,121 @@
+"""
+Round-trip tests for the YAML escaping in formatters/templates.py, over fuzzed LLM-like text.
+"""
+
+import random
+
+import pytest
+
+yaml = pytest.importorskip("yaml")
+
+from datacamp_exercise_generator.formatters.templates import Template, yaml_block, yaml_scalar
+
+SEED = 20261019
+CASES = 3000
+
+# Fragments that are special somewhere in YAML, mixed with ordinary words
+_FRAGMENTS = [
+    "word", "Two words", "x", " ", "  ", "\t", "\n", "\n\n", "\n\n\n", "\r\n",
+    ": ", ":", " #", "#", "- ", "-", "? ", ",", "[", "]", "{", "}", "&a", "*a", "!tag", "|", ">",
+    "'", '"', "\\", "%", "@", "`", "<<", "=", "~",
+    "null", "Null", "yes", "No", "on", "OFF", "y", "n", "true", "FALSE",
+    "0", "12", "-3", "+4", "0.5", ".5", "1e3", "1_000", "0x1F", "+0x1F", "0o17", "-0b101", "012", "1:30",
+    ".inf", "-.Inf", ".nan", "2001-12-14", "2001-12-14 21:59:43", "2001-12-14t21:59:43.10-05:00",
+    "2001-12-14T21:59:43Z", "2002-1-2 3:04:05 +5",
+    "café", " ", "\u0085", " ", " ", "﻿", "\x07", "\U0001f600", "été",
+]
+
+
+def _fuzzed_text(rng: random.Random) -> str:
+    return "".join(rng.choice(_FRAGMENTS) for _ in range(rng.randint(1, 6)))
+
+
+def _cases():
+    rng = random.Random(SEED)
+    return [_fuzzed_text(rng) for _ in range(CASES)]
+
+
+def test_scalar_round_trips():
+    for text in _cases():
+        document = f"key: {yaml_scalar(text)}\nlist:\n  - {yaml_scalar(text)}\n"
+        assert yaml.safe_load(document) == {"key": text, "list": [text]}, repr(text)
+
+
+def test_block_round_trips():
+    for text in _cases():
+        document = f"key: {yaml_block(text, 2)}\nnested:\n  inner: {yaml_block(text, 4)}\n"
+        assert yaml.safe_load(document) == {"key": text, "nested": {"inner": text}}, repr(text)
+
+
+@pytest.mark.parametrize("value", ["2001-12-14 21:59:43", "2001-12-14", "+0x1F", "yes", "1:30", "- item", "a: b"])
+def test_scalar_quotes_values_yaml_would_retype(value):
+    assert yaml.safe_load(f"key: {yaml_scalar(value)}") == {"key": value}
+
+
+def test_template_each_renders_nested_items():
+    template = Template(
+        "items:{items:each}\n",
+        items=Template("\n  - name: {name:scalar}\n    note: {note:block}"),
+    )
+    rng = random.Random(SEED)
+    items = [{"name": _fuzzed_text(rng), "note": _fuzzed_text(rng)} for _ in range(50)]
+    assert yaml.safe_load(template.render({"items": items})) == {"items": items}
+
+
+def _yaml_section(markdown: str) -> dict:
+    """The ```yaml block of a formatted exercise, parsed."""
+    start = markdown.index("```yaml\n") + len("```yaml\n")
+    return yaml.safe_load(markdown[start:markdown.index("\n```", start)])
+
+
+def test_formatted_exercises_round_trip():
+    pytest.importorskip("pydantic")
+    from datacamp_exercise_generator.formatters.drag_drop_classify import DragDropClassifyFormatter
+    from datacamp_exercise_generator.formatters.drag_drop_order import DragDropOrderFormatter
+    from datacamp_exercise_generator.formatters.multiple_mcq import MultipleAnswerMCQFormatter
+    from datacamp_exercise_generator.models.exercises import (
+        Answer, DraggableItem, DragDropClassifyExercise, DragDropOrderExercise, DropZone,
+        MultipleAnswerMCQExercise, OrderableItem
+    )
+
+    rng = random.Random(SEED)
+    text = lambda: _fuzzed_text(rng)
+    for _ in range(200):
+        mcq = MultipleAnswerMCQExercise(
+            title="Title", context=text(), question=text(), hints=[text()], success_message=text(),
+            answers=[Answer(answer=text(), correct=rng.random() < 0.5, feedback=text()) for _ in range(3)]
+        )
+        data = _yaml_section(MultipleAnswerMCQFormatter().format_to_markdown(mcq))["data"]
+        assert data["assignment"] == f"{mcq.context}\n\n**{mcq.question}**"
+        assert data["question"]["successMessage"] == mcq.success_message
+        assert data["question"]["solutionItems"] == [
+            {"answer": answer.answer, "correct": answer.correct, "feedback": answer.feedback} for answer in mcq.answers
+        ]
+
+        order = DragDropOrderExercise(
+            title="Title", context=text(), instructions=text(), hints=[text()], sequence_title=text(),
+            success_message=text(), failure_message=text(),
+            ordered_items=[OrderableItem(content=text(), incorrect_message=text()) for _ in range(3)]
+        )
+        data = _yaml_section(DragDropOrderFormatter().format_to_markdown(order))["data"]
+        question = data["question"]
+        assert data["assignment"] == order.context
+        assert question["correctnessConditions"]["failureMessage"] == order.failure_message
+        assert question["solution"][0]["title"] == order.sequence_title
+        assert question["solution"][0]["draggableItems"] == [
+            {"content": item.content, "id": item.id, "incorrectMessage": item.incorrect_message} for item in order.ordered_items
+        ]
+
+        classify = DragDropClassifyExercise(
+            title="Title", context=text(), instructions=text(), hints=[text()], success_message=text(),
+            drop_zones=[
+                DropZone(title=text(), draggable_items=[DraggableItem(content=text(), incorrect_message=text()) for _ in range(2)])
+                for _ in range(2)
+            ]
+        )
+        data = _yaml_section(DragDropClassifyFormatter().format_to_markdown(classify))["data"]
+        zones = data["question"]["solution"][1:]
+        assert [zone["title"] for zone in zones] == [zone.title for zone in classify.drop_zones]
+        assert [item["content"] for zone in zones for item in zone["draggableItems"]] == [
+            item.content for zone in classify.drop_zones for item in zone.draggable_items
+        ]